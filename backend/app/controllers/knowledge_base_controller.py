@@ -3,23 +3,44 @@ from fastapi.responses import JSONResponse
 import tempfile
 import os
 from typing import Optional
+from pydantic import ValidationError
+from app.schemas.knowledge_base_schema import ChunkingOptions, SimilarBatchRequest
 from app.services.knowledge_base_service import (
     create_knowledge_base_collection_if_not_exists,
     get_knowledge_base_files,
     upload_pdf_file,
     upload_text_file,
     get_similar_chunks,
+    get_similar_chunks_batch,
     delete_knowledge_base_file,
     get_file_chunks,
 )
 
 
+def _chunking_options(
+    chunker: Optional[str],
+    max_tokens: Optional[int],
+    overlap_tokens: Optional[int],
+) -> ChunkingOptions:
+    """
+    Build per-upload chunking options from form fields, as a 400 if invalid.
+    """
+    try:
+        return ChunkingOptions(
+            strategy=chunker, max_tokens=max_tokens, overlap_tokens=overlap_tokens
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid chunking options: {e.errors()}"
+        )
+
+
 async def create_collection_controller():
     """
     Create the knowledge base collection if it doesn't exist.
     """
     try:
-        result = create_knowledge_base_collection_if_not_exists()
+        result = await create_knowledge_base_collection_if_not_exists()
         if result["status"] == "success":
             return JSONResponse(content=result, status_code=200)
         else:
@@ -35,7 +56,7 @@ async def get_files_controller():
     Get all files in the knowledge base.
     """
     try:
-        result = get_knowledge_base_files()
+        result = await get_knowledge_base_files()
         if result["status"] == "success":
             return JSONResponse(content=result, status_code=200)
         else:
@@ -45,7 +66,11 @@ async def get_files_controller():
 
 
 async def upload_pdf_controller(
-    file: UploadFile = File(...), source_url: Optional[str] = None
+    file: UploadFile = File(...),
+    source_url: Optional[str] = None,
+    chunker: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    overlap_tokens: Optional[int] = None,
 ):
     """
     Upload a PDF file to the knowledge base.
@@ -56,6 +81,8 @@ async def upload_pdf_controller(
         if not file.filename.lower().endswith(".pdf"):
             raise HTTPException(status_code=400, detail="File must be a PDF")
 
+        chunking = _chunking_options(chunker, max_tokens, overlap_tokens)
+
         # Create temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
             content = await file.read()
@@ -65,7 +92,7 @@ async def upload_pdf_controller(
         file_name = file.filename
 
         # Upload to knowledge base
-        result = upload_pdf_file(temp_file_path, file_name, source_url)
+        result = await upload_pdf_file(temp_file_path, file_name, source_url, chunking)
 
         if result["status"] == "success":
             return JSONResponse(content=result, status_code=200)
@@ -86,7 +113,11 @@ async def upload_pdf_controller(
 
 
 async def upload_text_controller(
-    file: UploadFile = File(...), source_url: Optional[str] = None
+    file: UploadFile = File(...),
+    source_url: Optional[str] = None,
+    chunker: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    overlap_tokens: Optional[int] = None,
 ):
     """
     Upload a text file to the knowledge base.
@@ -97,6 +128,8 @@ async def upload_text_controller(
         if not file.filename.lower().endswith(".txt"):
             raise HTTPException(status_code=400, detail="File must be a text file")
 
+        chunking = _chunking_options(chunker, max_tokens, overlap_tokens)
+
         # Create temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as temp_file:
             content = await file.read()
@@ -106,7 +139,7 @@ async def upload_text_controller(
         file_name = file.filename
 
         # Upload to knowledge base
-        result = upload_text_file(temp_file_path, file_name, source_url)
+        result = await upload_text_file(temp_file_path, file_name, source_url, chunking)
 
         if result["status"] == "success":
             return JSONResponse(content=result, status_code=200)
@@ -136,7 +169,7 @@ async def delete_file_controller(file_name: str):
         if not file_name:
             raise HTTPException(status_code=400, detail="File name is required")
 
-        result = delete_knowledge_base_file(file_name)
+        result = await delete_knowledge_base_file(file_name)
         if result["status"] == "success":
             return JSONResponse(content=result, status_code=200)
         else:
@@ -147,7 +180,9 @@ async def delete_file_controller(file_name: str):
         raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
 
 
-async def get_similar_controller(query: str, limit: int = 10):
+async def get_similar_controller(
+    query: str, limit: int = 10, rerank: Optional[bool] = None
+):
     """
     Get similar chunks from the knowledge base.
     """
@@ -160,7 +195,7 @@ async def get_similar_controller(query: str, limit: int = 10):
                 status_code=400, detail="Limit must be between 1 and 100"
             )
 
-        result = get_similar_chunks(query=query, limit=limit)
+        result = await get_similar_chunks(query=query, limit=limit, rerank=rerank)
         if result["status"] == "success":
             return JSONResponse(content=result, status_code=200)
         else:
@@ -173,15 +208,48 @@ async def get_similar_controller(query: str, limit: int = 10):
         )
 
 
-async def get_file_chunks_controller(file_name: str):
+async def get_similar_batch_controller(request: SimilarBatchRequest):
     """
-    Get all chunks for a specific file.
+    Get similar chunks from the knowledge base for many queries at once.
+    """
+    try:
+        if any(not query for query in request.queries):
+            raise HTTPException(status_code=400, detail="Queries must not be empty")
+
+        result = await get_similar_chunks_batch(
+            queries=request.queries, limit=request.limit, rerank=request.rerank
+        )
+        if result["status"] == "success":
+            return JSONResponse(content=result, status_code=200)
+        else:
+            return JSONResponse(content=result, status_code=500)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error getting similar chunks: {str(e)}"
+        )
+
+
+async def get_file_chunks_controller(
+    file_name: str, offset: int = 0, limit: Optional[int] = None
+):
+    """
+    Get the chunks for a specific file, optionally one page at a time.
     """
     try:
         if not file_name:
             raise HTTPException(status_code=400, detail="File name is required")
 
-        result = get_file_chunks(file_name)
+        if offset < 0:
+            raise HTTPException(status_code=400, detail="Offset must be 0 or more")
+
+        if limit is not None and (limit <= 0 or limit > 1000):
+            raise HTTPException(
+                status_code=400, detail="Limit must be between 1 and 1000"
+            )
+
+        result = await get_file_chunks(file_name, offset=offset, limit=limit)
         if result["status"] == "success":
             return JSONResponse(content=result, status_code=200)
         else:
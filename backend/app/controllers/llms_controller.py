@@ -1,7 +1,5 @@
 from fastapi import HTTPException
-from supabase import Client
 
-from app.core.singleton import get_supabase_client
 from app.services.litellm_service import get_or_create_virtual_key
 from app.services.llms_service import (
     get_response_with_tools,
@@ -12,7 +10,7 @@ from app.services.llms_service import (
 )
 
 
-async def _get_virtual_key(payload: dict, supabase: Client) -> str:
+async def _get_virtual_key(payload: dict) -> str:
     auth0_sub = payload.get("sub")
     if not auth0_sub:
         raise HTTPException(status_code=401, detail="Missing Auth0 subject claim")
@@ -20,7 +18,6 @@ async def _get_virtual_key(payload: dict, supabase: Client) -> str:
     return await get_or_create_virtual_key(
         auth0_sub=auth0_sub,
         email=payload.get("email") or "",
-        supabase=supabase,
     )
 
 
@@ -43,8 +40,7 @@ async def get_llm_response(
         tuple[str, list, str]: The final response, bmkeys list, and model actually used.
     """
     try:
-        supabase = get_supabase_client()
-        virtual_key = await _get_virtual_key(payload, supabase)
+        virtual_key = await _get_virtual_key(payload)
         result, bmkeys, model_used = await get_response_with_tools(
             conversation_history, virtual_key, model, access_token
         )
@@ -70,8 +66,7 @@ async def get_faq_llm_response(
         tuple[str, list, str]: The final response, bmkeys list, and model actually used.
     """
     try:
-        supabase = get_supabase_client()
-        virtual_key = await _get_virtual_key(payload, supabase)
+        virtual_key = await _get_virtual_key(payload)
         result, bmkeys, model_used = await get_faq_response(faq_id, virtual_key, model)
         return result, bmkeys, model_used
     except ValueError as e:
@@ -93,8 +88,7 @@ async def analyse_vcml_controller(biomodel_id: str, model: str, payload: dict) -
         str: The VCML analysis response.
     """
     try:
-        supabase = get_supabase_client()
-        virtual_key = await _get_virtual_key(payload, supabase)
+        virtual_key = await _get_virtual_key(payload)
         result = await analyse_vcml(biomodel_id, virtual_key, model)
         return result
     except Exception as e:
@@ -121,8 +115,7 @@ async def analyse_diagram_controller(
         str: The diagram analysis response.
     """
     try:
-        supabase = get_supabase_client()
-        virtual_key = await _get_virtual_key(payload, supabase)
+        virtual_key = await _get_virtual_key(payload)
         result = await analyse_diagram(biomodel_id, virtual_key, model, access_token)
         return result
     except Exception as e:
@@ -148,8 +141,7 @@ async def analyse_biomodel_controller(
         str: The analysis result from the LLM service.
     """
     try:
-        supabase = get_supabase_client()
-        virtual_key = await _get_virtual_key(payload, supabase)
+        virtual_key = await _get_virtual_key(payload)
         result = await analyse_biomodel(biomodel_id, user_prompt, virtual_key, model)
         return result
     except Exception as e:
@@ -4,12 +4,14 @@ from app.schemas.qdrant_schema import (
     CreateCollectionRequest,
     InsertPointRequest,
     SearchPointsRequest,
+    BatchSearchPointsRequest,
     DeleteDocumentRequest,
 )
 from app.services.qdrant_service import (
     create_qdrant_collection,
     insert_qdrant_points,
     search_qdrant_points,
+    search_qdrant_points_batch,
     delete_qdrant_documents,
 )
 
@@ -30,10 +32,14 @@ async def create_collection_controller(
         HTTPException: If the collection creation fails.
     """
     try:
-        result = create_qdrant_collection(
+        result = await create_qdrant_collection(
             collection_name=request.collection_name,
             vector_size=request.vector_size,
             distance=request.distance,
+            quantization=request.quantization,
+            on_disk=request.on_disk,
+            hnsw_m=request.hnsw_m,
+            hnsw_ef_construct=request.hnsw_ef_construct,
         )
         return result
     except Exception as e:
@@ -56,7 +62,7 @@ async def insert_point_controller(request: InsertPointRequest) -> Dict[str, Any]
         HTTPException: If the point insertion fails.
     """
     try:
-        result = insert_qdrant_points(
+        result = await insert_qdrant_points(
             collection_name=request.collection_name,
             point_id=request.point_id,
             vector=request.vector,
@@ -81,10 +87,43 @@ async def search_points_controller(request: SearchPointsRequest) -> Dict[str, An
         HTTPException: If the search operation fails.
     """
     try:
-        result = search_qdrant_points(
+        result = await search_qdrant_points(
             collection_name=request.collection_name,
             vector=request.vector,
             limit=request.limit,
+            hnsw_ef=request.hnsw_ef,
+            score_threshold=request.score_threshold,
+            oversampling=request.oversampling,
+        )
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching points: {str(e)}")
+
+
+async def batch_search_points_controller(
+    request: BatchSearchPointsRequest,
+) -> Dict[str, Any]:
+    """
+    Controller function to search a Qdrant collection for many vectors in
+    one round trip.
+
+    Args:
+        request: BatchSearchPointsRequest containing the vectors and search parameters
+
+    Returns:
+        Dict containing status and one list of results per vector
+
+    Raises:
+        HTTPException: If the search operation fails.
+    """
+    try:
+        result = await search_qdrant_points_batch(
+            collection_name=request.collection_name,
+            vectors=request.vectors,
+            limit=request.limit,
+            hnsw_ef=request.hnsw_ef,
+            score_threshold=request.score_threshold,
+            oversampling=request.oversampling,
         )
         return result
     except Exception as e:
@@ -105,7 +144,7 @@ async def delete_document_controller(request: DeleteDocumentRequest) -> Dict[str
         HTTPException: If the document deletion fails.
     """
     try:
-        result = delete_qdrant_documents(
+        result = await delete_qdrant_documents(
             collection_name=request.collection_name, file_name=request.file_name
         )
         return result
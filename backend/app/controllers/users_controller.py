@@ -51,4 +51,4 @@ async def get_current_user_role_controller(payload: dict) -> dict:
             detail="Missing Auth0 subject claim",
         )
 
-    return {"role": get_user_role(auth0_sub)}
+    return {"role": await get_user_role(auth0_sub)}
@@ -1,18 +1,31 @@
 import httpx
 from typing import List, Optional
 from fastapi import HTTPException, Response
-from app.schemas.vcelldb_schema import BiomodelRequestParams, SimulationRequestParams
+from fastapi.responses import StreamingResponse
+from app.schemas.vcelldb_schema import (
+    BiomodelRequestParams,
+    SimulationRequestParams,
+    SimulationBatchRequest,
+    BulkExportRequest,
+)
 from app.services.vcelldb_service import (
     fetch_biomodels,
     fetch_simulation_details,
+    fetch_simulation_details_batch,
     get_vcml_file,
     get_bngl_file,
     get_sbml_file,
     get_diagram_url,
-    get_diagram_image,
     fetch_biomodel_applications_files,
-    fetch_publications,
 )
+from app.services.publications_service import search_publications
+from app.services.diagram_service import get_diagram_image_variant
+from app.services.export_service import (
+    resolve_export_biomodel_ids,
+    stream_biomodels_zip,
+)
+from app.core.config import settings
+from app.utils.images import etag_matches
 
 
 async def get_biomodels_controller(
@@ -60,6 +73,52 @@ async def get_simulation_details_controller(params: SimulationRequestParams) ->
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def get_simulation_details_batch_controller(
+    biomodel_id: str, request: SimulationBatchRequest
+) -> dict:
+    """
+    Controller function to fetch the details of many simulations of a biomodel.
+    Simulations that fail upstream are reported per entry rather than failing
+    the whole batch.
+    Raises:
+        HTTPException: If the batch cannot be processed.
+    """
+    try:
+        return await fetch_simulation_details_batch(biomodel_id, request.simIds)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def export_biomodels_controller(request: BulkExportRequest) -> StreamingResponse:
+    """
+    Controller function to export the files of many biomodels as a ZIP archive,
+    streamed while the files are being downloaded.
+    Raises:
+        HTTPException: If the biomodel search fails, or selects no biomodels
+            or more than BULK_EXPORT_MAX_MODELS.
+    """
+    try:
+        biomodel_ids = await resolve_export_biomodel_ids(request.bmIds, request.query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code, detail="Error fetching biomodels."
+        )
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=500, detail="Error communicating with VCell API."
+        )
+    if not biomodel_ids:
+        raise HTTPException(status_code=400, detail="No biomodels to export.")
+
+    return StreamingResponse(
+        stream_biomodels_zip(biomodel_ids, list(dict.fromkeys(request.formats))),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="vcell_biomodels.zip"'},
+    )
+
+
 async def get_vcml_controller(biomodel_id: str, truncate: bool = False) -> str:
     """
     Controller function to fetch the contents of the VCML file for a biomodel.
@@ -113,16 +172,33 @@ async def get_diagram_url_controller(biomodel_id: str) -> str:
 
 
 async def get_diagram_image_controller(
-    biomodel_id: str, auth0_token: Optional[str] = None
+    biomodel_id: str,
+    auth0_token: Optional[str] = None,
+    variant: str = "original",
+    if_none_match: Optional[str] = None,
 ) -> Response:
     """
-    Controller function to fetch the diagram image for a biomodel and return it as a PNG response.
+    Controller function to fetch a cached diagram image variant for a biomodel.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
     Raises:
         HTTPException: If the image cannot be fetched.
     """
     try:
-        image_bytes = await get_diagram_image(biomodel_id, auth0_token)
-        return Response(content=image_bytes, media_type="image/png")
+        image = await get_diagram_image_variant(biomodel_id, variant, auth0_token)
+        headers = {
+            "ETag": image["etag"],
+            # Diagrams fetched with a token may be private
+            "Cache-Control": (
+                f"{'private' if auth0_token else 'public'}, "
+                f"max-age={settings.DIAGRAM_CACHE_TTL}"
+            ),
+            "Vary": "Authorization",
+        }
+        if if_none_match and etag_matches(if_none_match, image["etag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=image["content"], media_type=image["media_type"], headers=headers
+        )
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(status_code=404, detail="Biomodel not found.")
@@ -133,14 +209,17 @@ async def get_diagram_image_controller(
         raise HTTPException(status_code=500, detail="Error fetching diagram image.")
 
 
-async def get_biomodel_applications_files_controller(biomodel_id: str) -> dict:
+async def get_biomodel_applications_files_controller(
+    biomodel_id: str, check_files: bool = False
+) -> dict:
     """
     Controller function to fetch applications data along with SBML and BNGL file URLs for a biomodel.
+    With check_files, each application also reports whether its exports exist.
     Raises:
         HTTPException: If the VCell API request fails.
     """
     try:
-        return await fetch_biomodel_applications_files(biomodel_id)
+        return await fetch_biomodel_applications_files(biomodel_id, check_files)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(status_code=404, detail="Biomodel not found.")
@@ -156,15 +235,30 @@ async def get_biomodel_applications_files_controller(biomodel_id: str) -> dict:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def get_publications_controller() -> List[dict]:
+async def get_publications_controller(
+    query: str = "",
+    author: str = "",
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    biomodel_key: str = "",
+    limit: Optional[int] = None,
+) -> List[dict]:
     """
-    Controller function to fetch publications from the VCell API.
+    Controller function to search the cached VCell publications catalog.
+    Without filters, all publications are returned.
     Raises:
-        HTTPException: If the VCell API request fails.
+        HTTPException: If the catalog cannot be loaded from the VCell API.
     """
     try:
-        publications = await fetch_publications()
-        return publications
+        result = await search_publications(
+            query=query,
+            author=author,
+            year_from=year_from,
+            year_to=year_to,
+            biomodel_key=biomodel_key,
+            limit=limit,
+        )
+        return result["publications"]
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code, detail="Error fetching publications."
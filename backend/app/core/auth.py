@@ -1,19 +1,33 @@
+import hashlib
+import time
 from typing import Any
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jwt import PyJWKClient
 from jwt.exceptions import PyJWKClientError
 
 from app.core.config import settings
+from app.core.jwks import JWKSManager
+from app.core.logger import get_logger
+from app.core.timing import timed
 from app.services.users_service import get_user_role
+from app.utils.cache import AsyncLRUCache
+
+logger = get_logger("auth")
 
 bearer_scheme = HTTPBearer(auto_error=False)
-_jwks_client: PyJWKClient | None = None
+_jwks_manager: JWKSManager | None = None
+
+# SHA-256 of the access token -> verified claims, each entry expiring at the
+# token's exp. Shared by every auth dependency of a request and across
+# requests, but deliberately kept per process: claims read back from a
+# shared backend would be trusted without checking the signature, so anyone
+# able to write to that backend could mint tokens.
+_verified_tokens = AsyncLRUCache(settings.AUTH_TOKEN_CACHE_SIZE, name="auth_token")
 
 
-def _get_auth0_config() -> tuple[str, str, PyJWKClient]:
+def _get_auth0_config() -> tuple[str, str, JWKSManager]:
     if not settings.AUTH0_DOMAIN or not settings.AUTH0_AUDIENCE:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -23,13 +37,34 @@ def _get_auth0_config() -> tuple[str, str, PyJWKClient]:
     issuer = f"https://{settings.AUTH0_DOMAIN}/"
     jwks_url = f"{issuer}.well-known/jwks.json"
 
-    global _jwks_client
-    if _jwks_client is None:
-        # PyJWKClient downloads and caches Auth0 signing keys lazily,
+    global _jwks_manager
+    if _jwks_manager is None:
+        # Keys are loaded asynchronously (prefetched by start_jwks_refresh),
         # so missing network access does not block app startup.
-        _jwks_client = PyJWKClient(jwks_url)
+        _jwks_manager = JWKSManager(
+            jwks_url,
+            refresh_seconds=settings.AUTH0_JWKS_REFRESH_SECONDS,
+            min_refetch_seconds=settings.AUTH0_JWKS_MIN_REFETCH_SECONDS,
+            timeout=settings.AUTH0_JWKS_TIMEOUT,
+        )
+
+    return issuer, settings.AUTH0_AUDIENCE, _jwks_manager
+
+
+def start_jwks_refresh():
+    """
+    Download the Auth0 signing keys now and then periodically in the
+    background, so requests find them cached. No-op without Auth0 settings.
+    """
+    if not settings.AUTH0_DOMAIN or not settings.AUTH0_AUDIENCE:
+        return
+    _, _, jwks_manager = _get_auth0_config()
+    jwks_manager.start()
 
-    return issuer, settings.AUTH0_AUDIENCE, _jwks_client
+
+def stop_jwks_refresh():
+    if _jwks_manager is not None:
+        _jwks_manager.stop()
 
 
 async def get_bearer_token(
@@ -48,14 +83,20 @@ async def get_bearer_token(
     return credentials.credentials
 
 
-def _decode_and_verify(access_token: str) -> dict[str, Any]:
+async def _decode_and_verify(access_token: str) -> dict[str, Any]:
+    cache_key = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+    payload = await _verified_tokens.aget(cache_key)
+    if payload is not None:
+        _verified_tokens.hits += 1
+        return dict(payload)
+    _verified_tokens.misses += 1
+
     try:
-        issuer, audience, jwks_client = _get_auth0_config()
-        signing_key = jwks_client.get_signing_key_from_jwt(
-            access_token
-        ).key
+        issuer, audience, jwks_manager = _get_auth0_config()
+        kid = jwt.get_unverified_header(access_token).get("kid")
+        signing_key = await jwks_manager.get_signing_key(kid)
 
-        return jwt.decode(
+        payload = jwt.decode(
             access_token,
             signing_key,
             algorithms=["RS256"],
@@ -75,6 +116,11 @@ def _decode_and_verify(access_token: str) -> dict[str, Any]:
             detail="Invalid authentication token",
         )
 
+    expires_in = payload.get("exp", 0) - time.time()
+    if expires_in > 0:
+        await _verified_tokens.aset(cache_key, payload, ttl_seconds=expires_in)
+    return dict(payload)
+
 
 async def verify_auth0_token(
     access_token: str = Depends(get_bearer_token),
@@ -82,7 +128,8 @@ async def verify_auth0_token(
     """
     Verify Auth0 JWT access token and return decoded payload.
     """
-    return _decode_and_verify(access_token)
+    with timed("auth"):
+        return await _decode_and_verify(access_token)
 
 
 async def require_admin(
@@ -91,7 +138,8 @@ async def require_admin(
     """
     Require the authenticated user to have the "admin" role in Supabase.
     """
-    if get_user_role(payload["sub"]) != "admin":
+    role = await get_user_role(payload["sub"])
+    if role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required",
@@ -115,5 +163,6 @@ async def get_optional_auth0_token(
     if credentials is None:
         return None
 
-    _decode_and_verify(credentials.credentials)
+    with timed("auth"):
+        await _decode_and_verify(credentials.credentials)
     return credentials.credentials
@@ -1,7 +1,10 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 from decimal import Decimal
 
+from app.utils.chunker import check_chunk_budget
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -23,22 +26,188 @@ class Settings(BaseSettings):
     AZURE_DEPLOYMENT_NAME: str
     AZURE_EMBEDDING_DEPLOYMENT_NAME: str
 
+    # Embeddings Config
+    # "azure" uses AZURE_EMBEDDING_DEPLOYMENT_NAME; "local" runs
+    # LOCAL_EMBEDDING_MODEL on the CPU with fastembed (ONNX).
+    EMBEDDING_BACKEND: str = "azure"
+    LOCAL_EMBEDDING_MODEL: str = "BAAI/bge-small-en-v1.5"
+    # Overrides the vector size the backend reports, e.g. for a custom deployment.
+    EMBEDDING_DIMENSION: Optional[int] = None
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_THREADS: int = 4
+    # Embeddings of knowledge base search queries, reused for repeated queries.
+    EMBEDDING_CACHE_SIZE: int = 2000
+    EMBEDDING_CACHE_TTL: int = 86400
+
     # Qdrant Config
     QDRANT_URL: str
     QDRANT_COLLECTION_NAME: str
+    # Talk to Qdrant over gRPC instead of REST (lower per-call overhead).
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_GRPC_PORT: int = 6334
+
+    # Knowledge Base Retrieval Config
+    # Fuse dense and BM25 sparse search results with RRF. Only applies to
+    # collections created with a sparse vector.
+    KB_HYBRID_SEARCH: bool = True
+    # Default chunking of uploads: "structured" (token-budgeted, markdown
+    # aware) or "recursive" (2000/300-character splitter).
+    KB_CHUNKER: str = "structured"
+    KB_CHUNK_MAX_TOKENS: int = 512
+    KB_CHUNK_OVERLAP_TOKENS: int = 64
+    KB_CHUNK_MIN_TOKENS: int = 128
+    # Processes, per server worker, chunking the sections of large documents;
+    # 0 or 1 chunks them in the upload's thread.
+    KB_CHUNK_WORKERS: int = 2
+    # Storage of a newly created collection: "scalar" or "binary" quantization,
+    # original vectors on disk, and HNSW graph parameters (Qdrant defaults if unset).
+    KB_QUANTIZATION: Optional[str] = None
+    KB_VECTORS_ON_DISK: bool = False
+    KB_HNSW_M: Optional[int] = None
+    KB_HNSW_EF_CONSTRUCT: Optional[int] = None
+    # Search-time tuning. Oversampling only applies to quantized collections.
+    KB_SEARCH_HNSW_EF: Optional[int] = None
+    KB_SEARCH_SCORE_THRESHOLD: Optional[float] = None
+    KB_QUANTIZATION_OVERSAMPLING: float = 2.0
+    # Rerank search results with a local cross-encoder (needs fastembed):
+    # KB_RERANK_CANDIDATES results are fetched, rescored, and those scoring
+    # at least KB_RERANK_THRESHOLD (a logit, unset keeps all) are returned.
+    KB_RERANK: bool = False
+    KB_RERANK_MODEL: str = "Xenova/ms-marco-MiniLM-L-6-v2"
+    KB_RERANK_CANDIDATES: int = 50
+    KB_RERANK_THRESHOLD: Optional[float] = None
+    KB_RERANK_BATCH_SIZE: int = 16
+    KB_RERANK_THREADS: int = 2
+    # Token budget for knowledge base passages handed to the LLM by the
+    # search_vcell_knowledge_base tool, after merging neighboring chunks.
+    KB_CONTEXT_MAX_TOKENS: int = 3000
+    # Speculatively search the knowledge base for the latest user message
+    # while the first completion decides on tools. The results are reused if
+    # the model's search_vcell_knowledge_base query shares at least
+    # KB_PREFETCH_MIN_OVERLAP of its terms (Jaccard) with the message.
+    KB_PREFETCH: bool = False
+    KB_PREFETCH_LIMIT: int = 20
+    KB_PREFETCH_MIN_OVERLAP: float = 0.4
+
+    # VCell API Config
+    VCELL_API_URL: str = "https://vcell.cam.uchc.edu/api"
+    # Calls go through one shared HTTP client with a bounded connection pool.
+    VCELL_HTTP_MAX_CONNECTIONS: int = 20
+    VCELL_HTTP_TIMEOUT: float = 30.0
+    # Upstream requests in flight at once for a single batch request.
+    VCELL_BATCH_CONCURRENCY: int = 8
+    # Saved simulations never change, so entries only leave the cache when
+    # it is full.
+    SIMULATION_CACHE_SIZE: int = 2000
+    # Downloaded VCML/SBML/BNGL files, shared by the file endpoints, the LLM
+    # tools and bulk export.
+    MODEL_FILE_CACHE_SIZE: int = 50
+    MODEL_FILE_CACHE_TTL: int = 3600
+    # Bulk export: parallel downloads per archive, maximum biomodels per
+    # archive (larger requests are rejected) and archives streamed at once
+    # per server worker (further exports wait).
+    BULK_EXPORT_CONCURRENCY: int = 4
+    BULK_EXPORT_MAX_MODELS: int = 200
+    BULK_EXPORT_MAX_ACTIVE: int = 2
+    # Cached results of BNGL/SBML export availability checks.
+    FILE_PROBE_CACHE_SIZE: int = 2000
+    FILE_PROBE_CACHE_TTL: int = 3600
+    FILE_PROBE_TIMEOUT: float = 10.0
+    # Diagram images are cached per biomodel together with a thumbnail and
+    # a reduced variant for vision models, generated on DIAGRAM_IMAGE_THREADS
+    # worker threads. Resized variants are encoded as "png" (256-color
+    # palette) or "webp" (lossless).
+    DIAGRAM_CACHE_SIZE: int = 200
+    DIAGRAM_CACHE_TTL: int = 86400
+    DIAGRAM_THUMBNAIL_SIZE: int = 256
+    DIAGRAM_LLM_MAX_SIDE: int = 1024
+    DIAGRAM_VARIANT_FORMAT: str = "png"
+    DIAGRAM_IMAGE_THREADS: int = 2
+
+    # Publications are served from an in-memory catalog reloaded in the
+    # background at this interval (seconds).
+    PUBLICATIONS_REFRESH_SECONDS: int = 3600
+
+    # Second cache tier shared by all worker processes, for model files and
+    # query embeddings: "memory" (none; each worker keeps its
+    # own), "sqlite" (a local SQLite file, private to the user running the
+    # app, in a per-user directory of /dev/shm unless SHARED_CACHE_PATH is
+    # set) or "redis" (needs the redis package).
+    SHARED_CACHE_BACKEND: str = "memory"
+    SHARED_CACHE_PATH: Optional[str] = None
+    SHARED_CACHE_MAX_ENTRIES: int = 10000
+    SHARED_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Logging. LOG_LEVELS overrides LOG_LEVEL per logger, e.g.
+    # "vcelldb_service=DEBUG,llm_service=WARNING". LOG_FORMAT is "text" or
+    # "json"; an empty LOG_FILE disables the log file. Payloads logged with
+    # log_payload() are cut to LOG_MAX_PAYLOAD_CHARS and only
+    # LOG_PAYLOAD_SAMPLE_RATE of them are kept.
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""
+    LOG_FORMAT: str = "text"
+    LOG_FILE: Optional[str] = "app.log"
+    LOG_MAX_PAYLOAD_CHARS: int = 2000
+    LOG_PAYLOAD_SAMPLE_RATE: float = 1.0
+
+    # Server started by "python -m app.main". With more than one worker,
+    # requests are spread over SERVER_WORKERS processes and reload is off.
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_RELOAD: bool = True
+
+    # Send a Server-Timing header with each response's latency breakdown
+    # (auth, Supabase, LLM steps, tools, VCell and Qdrant calls).
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Prometheus metrics at /metrics: request latency per route, upstream,
+    # tool and LLM call latency, token usage and cache hit ratios.
+    METRICS_ENABLED: bool = True
 
     # Langfuse Config
     LANGFUSE_SECRET_KEY: str
     LANGFUSE_PUBLIC_KEY: str
     LANGFUSE_HOST: str
+    # Only LANGFUSE_SAMPLE_RATE of traces are recorded. Spans are exported in
+    # the background in batches of LANGFUSE_FLUSH_AT, or every
+    # LANGFUSE_FLUSH_INTERVAL seconds.
+    LANGFUSE_TRACING_ENABLED: bool = True
+    LANGFUSE_SAMPLE_RATE: float = 1.0
+    LANGFUSE_FLUSH_AT: int = 512
+    LANGFUSE_FLUSH_INTERVAL: float = 5.0
+    # Span input (arguments) and output (return value) capture, with
+    # comma-separated span names to skip. File contents and diagram images
+    # are not captured by default.
+    LANGFUSE_CAPTURE_INPUT: bool = True
+    LANGFUSE_CAPTURE_OUTPUT: bool = True
+    LANGFUSE_SKIP_INPUT_SPANS: str = ""
+    LANGFUSE_SKIP_OUTPUT_SPANS: str = "GET_VCML_FILE,GET_BNGL_FILE,GET_SBML_FILE,GET_DIAGRAM_IMAGE"
+    # Captured strings are truncated to this many characters and lists to
+    # this many items.
+    LANGFUSE_MAX_FIELD_CHARS: int = 5000
+    LANGFUSE_MAX_LIST_ITEMS: int = 50
 
     # Auth0 Config
     AUTH0_DOMAIN: Optional[str] = None
     AUTH0_AUDIENCE: Optional[str] = None
+    # Verified access tokens are cached (by SHA-256 hash) until they expire,
+    # so repeat requests skip signature verification.
+    AUTH_TOKEN_CACHE_SIZE: int = 1000
+    # Auth0 signing keys are re-downloaded in the background at this interval.
+    AUTH0_JWKS_REFRESH_SECONDS: int = 600
+    # A token with an unknown key id triggers a key download at most this
+    # often (seconds).
+    AUTH0_JWKS_MIN_REFETCH_SECONDS: int = 30
+    AUTH0_JWKS_TIMEOUT: float = 10.0
 
     # Supabase Config
     SUPABASE_URL: Optional[str] = None
     SUPABASE_SERVICE_ROLE_KEY: Optional[str] = None
+    # Queries run on a pool of this many threads, so at most this many are in
+    # flight; each gives up after SUPABASE_TIMEOUT seconds.
+    SUPABASE_MAX_CONCURRENCY: int = 8
+    SUPABASE_TIMEOUT: float = 10.0
 
     # LiteLLM Proxy Config
     LITELLM_URL: str = "http://litellm:4000"
@@ -46,5 +215,12 @@ class Settings(BaseSettings):
     DEFAULT_USER_BUDGET: Decimal = Decimal("10.00")
     DEFAULT_BUDGET_DURATION: str = "30d"
 
+    @model_validator(mode="after")
+    def _check_chunking(self):
+        check_chunk_budget(
+            self.KB_CHUNK_MAX_TOKENS, self.KB_CHUNK_OVERLAP_TOKENS, self.KB_CHUNK_MIN_TOKENS
+        )
+        return self
+
 
 settings = Settings()
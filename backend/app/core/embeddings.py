@@ -0,0 +1,144 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from app.core.config import settings
+
+# Output size of Azure OpenAI text-embedding-ada-002 / text-embedding-3-small.
+AZURE_EMBEDDING_DIMENSION = 1536
+
+
+class EmbeddingBackend(ABC):
+    """
+    Turns texts into dense vectors. Inputs are split into batches of
+    EMBEDDING_BATCH_SIZE and the batches run concurrently on a thread pool,
+    so large uploads are not embedded one request at a time.
+    """
+
+    dimension: int
+
+    def __init__(self):
+        self.batch_size = settings.EMBEDDING_BATCH_SIZE
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.EMBEDDING_THREADS,
+            thread_name_prefix="embeddings",
+        )
+
+    @abstractmethod
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed one batch of at most batch_size texts, preserving their order.
+        """
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, preserving their order.
+
+        Args:
+            texts (List[str]): The texts to embed.
+        Returns:
+            List[List[float]]: One vector per text.
+        """
+        if not texts:
+            return []
+        if len(texts) <= self.batch_size:
+            return self._embed_batch(texts)
+
+        batches = [
+            texts[start : start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        vectors = []
+        for batch_vectors in self.executor.map(self._embed_batch, batches):
+            vectors.extend(batch_vectors)
+        return vectors
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts without blocking the event loop, preserving their order.
+        By default the blocking embed() runs in a worker thread.
+
+        Args:
+            texts (List[str]): The texts to embed.
+        Returns:
+            List[List[float]]: One vector per text.
+        """
+        if not texts:
+            return []
+        return await asyncio.to_thread(self.embed, texts)
+
+
+class AzureEmbeddingBackend(EmbeddingBackend):
+    """
+    Embeddings from the Azure OpenAI (or OpenAI-compatible) deployment named
+    by AZURE_EMBEDDING_DEPLOYMENT_NAME. aembed() uses the async client and
+    keeps at most EMBEDDING_THREADS batch requests in flight.
+    """
+
+    def __init__(self, client, async_client):
+        super().__init__()
+        self.client = client
+        self.async_client = async_client
+        self.dimension = settings.EMBEDDING_DIMENSION or AZURE_EMBEDDING_DIMENSION
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        response = self.client.embeddings.create(
+            input=texts, model=settings.AZURE_EMBEDDING_DEPLOYMENT_NAME
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    async def _aembed_batch(
+        self, texts: List[str], semaphore: asyncio.Semaphore
+    ) -> List[List[float]]:
+        async with semaphore:
+            response = await self.async_client.embeddings.create(
+                input=texts, model=settings.AZURE_EMBEDDING_DEPLOYMENT_NAME
+            )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        semaphore = asyncio.Semaphore(settings.EMBEDDING_THREADS)
+        batches = await asyncio.gather(
+            *(
+                self._aembed_batch(texts[start : start + self.batch_size], semaphore)
+                for start in range(0, len(texts), self.batch_size)
+            )
+        )
+        return [vector for batch in batches for vector in batch]
+
+
+class LocalEmbeddingBackend(EmbeddingBackend):
+    """
+    In-process CPU embeddings from an ONNX model run by fastembed, with no
+    network round trip. The model is downloaded to the fastembed cache on
+    first use.
+    """
+
+    def __init__(self, model_name: str):
+        super().__init__()
+        try:
+            from fastembed import TextEmbedding
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_BACKEND=local requires fastembed: "
+                "poetry install --extras local-models"
+            ) from e
+
+        self.model = TextEmbedding(model_name=model_name)
+        self.dimension = settings.EMBEDDING_DIMENSION or self._model_dimension(
+            TextEmbedding, model_name
+        )
+
+    def _model_dimension(self, model_class, model_name: str) -> int:
+        for description in model_class.list_supported_models():
+            if description["model"].lower() == model_name.lower():
+                return description["dim"]
+        # Custom models are not listed; ask the model itself.
+        return len(self._embed_batch(["dimension probe"])[0])
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [
+            vector.tolist()
+            for vector in self.model.embed(texts, batch_size=self.batch_size)
+        ]
@@ -0,0 +1,121 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from jwt import PyJWKSet
+from jwt.exceptions import PyJWKClientError, PyJWKSetError
+
+from app.core.logger import get_logger
+
+logger = get_logger("jwks")
+
+
+class JWKSManager:
+    """
+    Async store of the signing keys published at a JWKS URL. Keys are
+    downloaded with httpx, never on a request's critical path once loaded:
+    they are prefetched at startup and refreshed in the background every
+    refresh_seconds (with +/-20% jitter so replicas do not refresh in step).
+    A token signed with an unknown kid (key rotation) triggers one refetch
+    shared by all concurrent callers, at most once per min_refetch_seconds,
+    so bad tokens cannot be used to hammer the identity provider.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        refresh_seconds: float,
+        min_refetch_seconds: float,
+        timeout: float,
+    ):
+        self.jwks_url = jwks_url
+        self.refresh_seconds = refresh_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self.timeout = timeout
+        self.loaded_at: Optional[float] = None
+        self._keys: Dict[str, Any] = {}
+        self._last_fetch_started = float("-inf")
+        self._fetch_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _download(self) -> dict:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.jwks_url)
+            response.raise_for_status()
+            return response.json()
+
+    async def _fetch(self):
+        data = await self._download()
+        keys = {
+            jwk.key_id: jwk.key
+            for jwk in PyJWKSet.from_dict(data).keys
+            if jwk.key_id and jwk.public_key_use in (None, "sig")
+        }
+        # Replace the whole key set at once; rotated-out keys disappear
+        self._keys = keys
+        self.loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(keys)} signing keys from {self.jwks_url}")
+
+    async def refresh(self):
+        """
+        Download the key set. Concurrent callers share one download.
+        """
+        if self._fetch_task is None or self._fetch_task.done():
+            self._last_fetch_started = time.monotonic()
+            self._fetch_task = asyncio.ensure_future(self._fetch())
+        await asyncio.shield(self._fetch_task)
+
+    async def get_signing_key(self, kid: Optional[str]) -> Any:
+        """
+        Return the public key for a token's kid, refetching the key set
+        (rate limited) if the kid is not known yet.
+
+        Args:
+            kid (Optional[str]): The kid from the token header.
+        Returns:
+            Any: The public key to verify the token with.
+        Raises:
+            PyJWKClientError: If no key matches or the key set cannot be loaded.
+        """
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        in_flight = self._fetch_task is not None and not self._fetch_task.done()
+        cooled_down = (
+            time.monotonic() - self._last_fetch_started >= self.min_refetch_seconds
+        )
+        if in_flight or cooled_down:
+            try:
+                await self.refresh()
+            except (httpx.HTTPError, ValueError, PyJWKSetError) as e:
+                raise PyJWKClientError(f"Failed to load signing keys: {e}") from e
+            key = self._keys.get(kid)
+
+        if key is None:
+            raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    async def _refresh_periodically(self):
+        while True:
+            try:
+                await self.refresh()
+                delay = self.refresh_seconds
+            except Exception:
+                logger.exception("Signing key refresh failed")
+                delay = self.min_refetch_seconds
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+
+    def start(self):
+        """
+        Prefetch the keys and keep refreshing them in the background.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
@@ -1,9 +1,15 @@
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
 
+# Imported on first use; the OpenAI SDK is slow to import
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+def get_litellm_client(virtual_key: str) -> "AsyncOpenAI":
+    from openai import AsyncOpenAI
 
-def get_litellm_client(virtual_key: str) -> AsyncOpenAI:
     return AsyncOpenAI(
         api_key=virtual_key,
         base_url=settings.LITELLM_URL,
@@ -1,8 +1,16 @@
+import atexit
+import copy
 import functools
+import json
 import logging
+import queue
+import random
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from uvicorn.logging import ColourizedFormatter
-from typing import Any, Callable
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
 
 
 class CustomColourizedFormatter(ColourizedFormatter):
@@ -30,6 +38,113 @@ class CustomColourizedFormatter(ColourizedFormatter):
         return formatted
 
 
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line, with any extra={...} fields included.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread. The stock
+    prepare() runs the formatter on the caller's thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Merge the args now, they may be mutated after the call returns
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _parse_levels(spec: str) -> dict:
+    """
+    Parse LOG_LEVELS, e.g. "vcelldb_service=DEBUG,llm_service=WARNING".
+    """
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_LOGGER_LEVELS = _parse_levels(settings.LOG_LEVELS)
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _output_handlers() -> list:
+    if settings.LOG_FORMAT == "json":
+        console_formatter = JSONFormatter()
+    else:
+        # Create a custom formatter with colored log levels for console logs
+        console_formatter = CustomColourizedFormatter(
+            "{asctime} | {levelname:<8} | {module} | {message}",
+            style="{",
+            datefmt="%Y-%m-%d %H:%M:%S",
+            use_colors=True,
+        )
+    ch = logging.StreamHandler(sys.stdout)
+    ch.setFormatter(console_formatter)
+    handlers = [ch]
+
+    if settings.LOG_FILE:
+        fh = logging.FileHandler(settings.LOG_FILE)
+        if settings.LOG_FORMAT == "json":
+            fh.setFormatter(JSONFormatter())
+        else:
+            fh.setFormatter(
+                logging.Formatter(
+                    "{asctime} | {levelname} | {module} | {message}",
+                    style="{",
+                    datefmt="%Y-%m-%d %H:%M:%S",
+                )
+            )
+        handlers.append(fh)
+    return handlers
+
+
+def _get_queue_handler() -> QueueHandler:
+    """
+    Loggers only put records on a queue; a single listener thread formats
+    them and writes to stdout and LOG_FILE, off the request path.
+    """
+    global _queue_handler, _listener
+    if _queue_handler is None:
+        log_queue = queue.SimpleQueue()
+        _queue_handler = _DeferredQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, *_output_handlers())
+        _listener.start()
+        # Flush what is still queued on exit
+        atexit.register(_listener.stop)
+    return _queue_handler
+
+
 def get_logger(name: str) -> logging.Logger:
     """Creates a logger object
     Args:
@@ -37,46 +152,46 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         logging.Logger: logger object to be used for logging
     """
-    # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(_LOGGER_LEVELS.get(name, settings.LOG_LEVEL.upper()))
 
     # Prevent adding multiple handlers if already exists
     if not logger.hasHandlers():
-        # Create console handler and set level to debug
-        ch = logging.StreamHandler(sys.stdout)
-        ch.setLevel(logging.DEBUG)
-
-        # Create a custom formatter with colored log levels for console logs
-        formatter = CustomColourizedFormatter(
-            "{asctime} | {levelname:<8} | {module} | {message}",
-            style="{",
-            datefmt="%Y-%m-%d %H:%M:%S",
-            use_colors=True,
-        )
+        logger.addHandler(_get_queue_handler())
 
-        # Add formatter to the handler for console output
-        ch.setFormatter(formatter)
-
-        # Add handler to the logger
-        logger.addHandler(ch)
+    return logger
 
-        fh = logging.FileHandler("app.log")
-        fh.setLevel(logging.DEBUG)
 
-        file_formatter = logging.Formatter(
-            "{asctime} | {levelname} | {module} | {message}",
-            style="{",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
+def truncate(value: Any, max_chars: Optional[int] = None) -> str:
+    """
+    str() of a value, cut to max_chars (default LOG_MAX_PAYLOAD_CHARS).
+    """
+    text = str(value)
+    max_chars = settings.LOG_MAX_PAYLOAD_CHARS if max_chars is None else max_chars
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more chars]"
 
-        # Add the plain formatter to the file handler
-        fh.setFormatter(file_formatter)
 
-        # Add file handler to the logger
-        logger.addHandler(fh)
+def log_payload(
+    logger: logging.Logger, message: str, payload: Any, level: int = logging.DEBUG
+):
+    """
+    Log a potentially large payload (API responses, conversations, tool
+    results). Nothing is rendered unless the level is enabled; then only
+    LOG_PAYLOAD_SAMPLE_RATE of the calls are logged, truncated.
 
-    return logger
+    Args:
+        logger (logging.Logger): The logger to use.
+        message (str): Text logged before the payload.
+        payload (Any): The payload.
+        level (int): Log level, DEBUG by default.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if random.random() >= settings.LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    logger.log(level, f"{message}: {truncate(payload)}", stacklevel=2)
 
 
 # Logger decorator implementation
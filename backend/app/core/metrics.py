@@ -0,0 +1,294 @@
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from app.core.timing import record_timing
+from app.utils.cache import CACHES
+
+# Seconds; spans cache hits on fast endpoints up to long LLM tool loops.
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "vcell_ai_http_request_duration_seconds",
+    "Time to serve an HTTP request, until the last body chunk is sent.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+# Gauges are summed over live workers when several processes serve the app
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "vcell_ai_http_requests_in_flight",
+    "HTTP requests being served.",
+    multiprocess_mode="livesum",
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "vcell_ai_upstream_request_duration_seconds",
+    "Latency of calls to upstream services (VCell API, Qdrant, Supabase).",
+    ["service", "endpoint", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUESTS_IN_FLIGHT = Gauge(
+    "vcell_ai_upstream_requests_in_flight",
+    "Calls to upstream services in progress.",
+    ["service"],
+    multiprocess_mode="livesum",
+)
+TOOL_DURATION = Histogram(
+    "vcell_ai_tool_duration_seconds",
+    "Time to execute an LLM tool call.",
+    ["tool", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_REQUEST_DURATION = Histogram(
+    "vcell_ai_llm_request_duration_seconds",
+    "Latency of chat completion calls.",
+    ["model", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_REQUESTS_IN_FLIGHT = Gauge(
+    "vcell_ai_llm_requests_in_flight",
+    "Chat completion calls in progress.",
+    ["model"],
+    multiprocess_mode="livesum",
+)
+LLM_TOKENS = Counter(
+    "vcell_ai_llm_tokens",
+    "Tokens used by chat completions.",
+    ["model", "type"],
+)
+KB_PREFETCH = Counter(
+    "vcell_ai_kb_prefetch",
+    "Knowledge base prefetches by whether the tool call could reuse them.",
+    ["outcome"],
+)
+
+
+class _CacheCollector:
+    """
+    Exports hit/miss counters and sizes of the named in-process caches.
+    Hit ratio: rate(vcell_ai_cache_hits_total) / (rate(hits) + rate(misses)).
+    With several workers, these are the caches of the worker serving the
+    scrape.
+    """
+
+    def collect(self):
+        hits = CounterMetricFamily(
+            "vcell_ai_cache_hits", "Cache lookups served from the cache.", labels=["cache"]
+        )
+        misses = CounterMetricFamily(
+            "vcell_ai_cache_misses", "Cache lookups that had to load the value.", labels=["cache"]
+        )
+        shared_hits = CounterMetricFamily(
+            "vcell_ai_cache_shared_hits",
+            "Cache lookups served from the cache shared by worker processes.",
+            labels=["cache"],
+        )
+        entries = GaugeMetricFamily(
+            "vcell_ai_cache_entries", "Entries currently cached.", labels=["cache"]
+        )
+        for name, cache in CACHES.items():
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            shared_hits.add_metric([name], cache.shared_hits)
+            entries.add_metric([name], len(cache))
+        yield hits
+        yield misses
+        yield shared_hits
+        yield entries
+
+
+REGISTRY.register(_CacheCollector())
+
+
+def _multiprocess_registry():
+    """
+    Registry aggregating the metrics written by every worker process to
+    PROMETHEUS_MULTIPROC_DIR, or None when the app runs in one process.
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return None
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(_CacheCollector())
+    return registry
+
+
+_MULTIPROCESS_REGISTRY = _multiprocess_registry()
+
+
+def clear_multiprocess_dir(path: str):
+    """
+    Delete the metric files left in a multiprocess directory by earlier
+    runs, whose workers' counters would otherwise be added to the new ones.
+    Call it before the workers start.
+
+    Args:
+        path (str): The PROMETHEUS_MULTIPROC_DIR directory.
+    """
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+
+
+def mark_worker_stopped():
+    """
+    Drop this worker's live gauges from the multiprocess metrics.
+    """
+    if _MULTIPROCESS_REGISTRY is not None:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+@contextmanager
+def track_upstream(service: str, endpoint: str):
+    """
+    Time a call to an upstream service. Exceptions are recorded with
+    outcome="error" and re-raised; the caller may also set
+    call["outcome"] = "error" on the yielded dict.
+
+    Args:
+        service (str): The upstream, e.g. "vcell" or "qdrant".
+        endpoint (str): A low-cardinality name for the operation.
+    """
+    call = {"outcome": "error"}
+    start = time.perf_counter()
+    UPSTREAM_REQUESTS_IN_FLIGHT.labels(service).inc()
+    try:
+        call["outcome"] = "success"
+        yield call
+    except BaseException:
+        call["outcome"] = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        UPSTREAM_REQUESTS_IN_FLIGHT.labels(service).dec()
+        UPSTREAM_REQUEST_DURATION.labels(service, endpoint, call["outcome"]).observe(elapsed)
+        record_timing(f"{service}.{endpoint}", elapsed)
+
+
+def timed_upstream(service: str, endpoint: str) -> Callable:
+    """
+    Decorator form of track_upstream for async functions. Services that
+    report failures as {"status": "error", ...} are recorded as errors too.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with track_upstream(service, endpoint) as call:
+                result = await func(*args, **kwargs)
+                if isinstance(result, dict) and result.get("status") == "error":
+                    call["outcome"] = "error"
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def track_tool(tool: str):
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - start
+        TOOL_DURATION.labels(tool, outcome).observe(elapsed)
+        record_timing(f"tool.{tool}", elapsed)
+
+
+@contextmanager
+def track_llm(model: str):
+    outcome = "error"
+    start = time.perf_counter()
+    LLM_REQUESTS_IN_FLIGHT.labels(model).inc()
+    try:
+        yield
+        outcome = "success"
+    finally:
+        LLM_REQUESTS_IN_FLIGHT.labels(model).dec()
+        LLM_REQUEST_DURATION.labels(model, outcome).observe(time.perf_counter() - start)
+
+
+def record_llm_usage(model: str, usage):
+    """
+    Count the tokens of a chat completion response's usage, if reported.
+    """
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.labels(model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template and the
+    number of requests in flight. Timing ends with the last body chunk, so
+    streamed responses are measured in full.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - start)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            record()
+
+
+def metrics_response_body() -> tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        tuple[bytes, str]: The body and its content type.
+    """
+    registry = _MULTIPROCESS_REGISTRY if _MULTIPROCESS_REGISTRY is not None else REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from app.core.config import settings
+
+
+class CrossEncoderReranker:
+    """
+    Rescores (query, passage) pairs with a local CPU cross-encoder run by
+    fastembed (ONNX). Unlike the bi-encoder used for retrieval, the
+    cross-encoder reads the query and passage together, so it separates
+    relevant chunks from merely similar ones much better, at a per-pair cost
+    that limits it to a short candidate list. Candidates are scored in
+    batches of KB_RERANK_BATCH_SIZE, concurrently on a thread pool.
+    """
+
+    def __init__(self, model_name: str):
+        try:
+            from fastembed.rerank.cross_encoder import TextCrossEncoder
+        except ImportError as e:
+            raise ImportError(
+                "KB_RERANK requires fastembed: poetry install --extras local-models"
+            ) from e
+
+        self.model = TextCrossEncoder(model_name=model_name)
+        self.batch_size = settings.KB_RERANK_BATCH_SIZE
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.KB_RERANK_THREADS,
+            thread_name_prefix="reranker",
+        )
+
+    def _score_batch(self, query: str, passages: List[str]) -> List[float]:
+        return [
+            float(score)
+            for score in self.model.rerank(query, passages, batch_size=self.batch_size)
+        ]
+
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        """
+        Score passages against a query, preserving their order.
+
+        Args:
+            query (str): The search query.
+            passages (List[str]): The candidate passages.
+        Returns:
+            List[float]: One relevance logit per passage; higher is more relevant.
+        """
+        if not passages:
+            return []
+        if len(passages) <= self.batch_size:
+            return self._score_batch(query, passages)
+
+        batches = [
+            passages[start : start + self.batch_size]
+            for start in range(0, len(passages), self.batch_size)
+        ]
+        scores = []
+        for batch_scores in self.executor.map(
+            lambda batch: self._score_batch(query, batch), batches
+        ):
+            scores.extend(batch_scores)
+        return scores
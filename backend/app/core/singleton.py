@@ -1,17 +1,51 @@
-from openai import AzureOpenAI, OpenAI
-from qdrant_client import QdrantClient
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+import httpx
 from app.core.config import settings
-from supabase import Client, create_client
+from app.core.embeddings import (
+    EmbeddingBackend,
+    AzureEmbeddingBackend,
+    LocalEmbeddingBackend,
+)
+from app.core.reranker import CrossEncoderReranker
+from app.utils.shared_cache import (
+    RedisCacheBackend,
+    SharedCacheBackend,
+    SQLiteCacheBackend,
+    private_cache_dir,
+)
+
+# The OpenAI, Qdrant and Supabase SDKs are slow to import, so each is
+# imported when its client is first created rather than at startup.
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient
+    from supabase import Client
 
 embeddings_client = None
+async_embeddings_client = None
+embedding_backend = None
+reranker = None
 qdrant_client = None
+async_qdrant_client = None
 supabase_client = None
+vcell_http_client = None
+_vcell_http_client_loop = None
+shared_cache_backend = None
+chunk_pool = None
 
 
 # Embeddings / document extraction client
 def connect_embeddings_client():
     global embeddings_client
     if embeddings_client is None:
+        from openai import AzureOpenAI, OpenAI
+
         if settings.PROVIDER == "azure":
             embeddings_client = AzureOpenAI(
                 api_key=settings.AZURE_API_KEY,
@@ -34,10 +68,80 @@ def get_embeddings_client():
     return embeddings_client
 
 
+# Async counterpart used for embedding calls made from request handlers
+def connect_async_embeddings_client():
+    global async_embeddings_client
+    if async_embeddings_client is None:
+        from openai import AsyncAzureOpenAI, AsyncOpenAI
+
+        if settings.PROVIDER == "azure":
+            async_embeddings_client = AsyncAzureOpenAI(
+                api_key=settings.AZURE_API_KEY,
+                api_version=settings.AZURE_API_VERSION,
+                azure_endpoint=settings.AZURE_ENDPOINT,
+            )
+        else:
+            ## THIS IS FOR LOCAL LLM ONLY
+            async_embeddings_client = AsyncOpenAI(
+                api_key=settings.AZURE_API_KEY,
+                base_url=settings.AZURE_ENDPOINT,
+                project=None,
+                organization=None,
+            )
+    return async_embeddings_client
+
+
+def get_async_embeddings_client():
+    connect_async_embeddings_client()
+    return async_embeddings_client
+
+
+# Embedding backend used for knowledge base ingestion and search
+def connect_embedding_backend():
+    global embedding_backend
+    if embedding_backend is None:
+        if settings.EMBEDDING_BACKEND == "local":
+            embedding_backend = LocalEmbeddingBackend(settings.LOCAL_EMBEDDING_MODEL)
+        else:
+            embedding_backend = AzureEmbeddingBackend(
+                get_embeddings_client(), get_async_embeddings_client()
+            )
+    return embedding_backend
+
+
+def get_embedding_backend() -> EmbeddingBackend:
+    connect_embedding_backend()
+    return embedding_backend
+
+
+# Cross-encoder used to rerank knowledge base search results. Created on a
+# worker thread, so concurrent first uses must not each load the model.
+_reranker_lock = threading.Lock()
+
+
+def connect_reranker():
+    global reranker
+    with _reranker_lock:
+        if reranker is None:
+            reranker = CrossEncoderReranker(settings.KB_RERANK_MODEL)
+    return reranker
+
+
+def get_reranker() -> CrossEncoderReranker:
+    connect_reranker()
+    return reranker
+
+
 def connect_qdrant():
     global qdrant_client
     if qdrant_client is None:
-        qdrant_client = QdrantClient(url=settings.QDRANT_URL)
+        from qdrant_client import QdrantClient
+
+        qdrant_client = QdrantClient(
+            url=settings.QDRANT_URL,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            grpc_port=settings.QDRANT_GRPC_PORT,
+        )
     return qdrant_client
 
 
@@ -47,19 +151,134 @@ def get_qdrant_client():
     return qdrant
 
 
+# Non-blocking client used by the Qdrant and knowledge base services
+def connect_async_qdrant():
+    global async_qdrant_client
+    if async_qdrant_client is None:
+        from qdrant_client import AsyncQdrantClient
+
+        async_qdrant_client = AsyncQdrantClient(
+            url=settings.QDRANT_URL,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            grpc_port=settings.QDRANT_GRPC_PORT,
+        )
+    return async_qdrant_client
+
+
+def get_async_qdrant_client() -> "AsyncQdrantClient":
+    connect_async_qdrant()
+    return async_qdrant_client
+
+
 def connect_supabase():
     global supabase_client
     if supabase_client is None:
         if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_ROLE_KEY:
             raise ValueError("Supabase configuration is missing")
+        from supabase import ClientOptions, create_client
+
         supabase_client = create_client(
             settings.SUPABASE_URL,
             settings.SUPABASE_SERVICE_ROLE_KEY,
+            options=ClientOptions(postgrest_client_timeout=settings.SUPABASE_TIMEOUT),
         )
     return supabase_client
 
 
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     connect_supabase()
     supabase = supabase_client
     return supabase
+
+
+# Shared HTTP client for VCell API calls, so requests reuse pooled connections
+def connect_vcell_http_client():
+    global vcell_http_client, _vcell_http_client_loop
+    loop = asyncio.get_running_loop()
+    # Pooled connections belong to the event loop that opened them
+    if vcell_http_client is None or _vcell_http_client_loop is not loop:
+        vcell_http_client = httpx.AsyncClient(
+            timeout=settings.VCELL_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.VCELL_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.VCELL_HTTP_MAX_CONNECTIONS,
+            ),
+        )
+        _vcell_http_client_loop = loop
+    return vcell_http_client
+
+
+def get_vcell_http_client() -> httpx.AsyncClient:
+    connect_vcell_http_client()
+    return vcell_http_client
+
+
+async def close_vcell_http_client():
+    global vcell_http_client, _vcell_http_client_loop
+    if vcell_http_client is not None:
+        await vcell_http_client.aclose()
+        vcell_http_client = None
+        _vcell_http_client_loop = None
+
+
+# Cache tier shared by the worker processes, per SHARED_CACHE_BACKEND
+def connect_shared_cache_backend():
+    global shared_cache_backend
+    if shared_cache_backend is None:
+        if settings.SHARED_CACHE_BACKEND == "sqlite":
+            path = settings.SHARED_CACHE_PATH or os.path.join(
+                private_cache_dir(
+                    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+                ),
+                "cache.sqlite3",
+            )
+            shared_cache_backend = SQLiteCacheBackend(
+                path, max_entries=settings.SHARED_CACHE_MAX_ENTRIES
+            )
+        elif settings.SHARED_CACHE_BACKEND == "redis":
+            shared_cache_backend = RedisCacheBackend(settings.SHARED_CACHE_REDIS_URL)
+        elif settings.SHARED_CACHE_BACKEND != "memory":
+            raise ValueError(
+                f"Unknown SHARED_CACHE_BACKEND: {settings.SHARED_CACHE_BACKEND}"
+            )
+    return shared_cache_backend
+
+
+def get_shared_cache_backend() -> Optional[SharedCacheBackend]:
+    connect_shared_cache_backend()
+    return shared_cache_backend
+
+
+async def close_shared_cache_backend():
+    global shared_cache_backend
+    if shared_cache_backend is not None:
+        await shared_cache_backend.close()
+        shared_cache_backend = None
+
+
+# Processes chunking the sections of large uploads. The pool is bounded,
+# created once by the lifespan, and starts its processes with "spawn":
+# forking the threaded server process could deadlock the children.
+def connect_chunk_pool():
+    global chunk_pool
+    if chunk_pool is None and settings.KB_CHUNK_WORKERS > 1:
+        chunk_pool = ProcessPoolExecutor(
+            max_workers=settings.KB_CHUNK_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return chunk_pool
+
+
+def get_chunk_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    The chunking pool, or None if the lifespan did not start one (or it is
+    disabled), in which case documents are chunked in the calling thread.
+    """
+    return chunk_pool
+
+
+def close_chunk_pool():
+    global chunk_pool
+    if chunk_pool is not None:
+        chunk_pool.shutdown(wait=False, cancel_futures=True)
+        chunk_pool = None
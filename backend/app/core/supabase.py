@@ -0,0 +1,39 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+from app.core.config import settings
+from app.core.metrics import track_upstream
+from app.core.singleton import get_supabase_client
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# supabase-py's client is synchronous; its calls run on these threads so a
+# slow Supabase response never blocks the event loop. The pool size caps
+# the queries in flight, and the others wait in its queue.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.SUPABASE_MAX_CONCURRENCY,
+    thread_name_prefix="supabase",
+)
+
+
+async def run_supabase(operation: str, query: Callable[["Client"], Any]) -> Any:
+    """
+    Run a blocking Supabase query on the bounded Supabase thread pool.
+    The time spent, including any wait for a free thread, is recorded as
+    upstream "supabase" latency and in the Server-Timing header.
+
+    Args:
+        operation (str): A low-cardinality name for the query, e.g. "user_role".
+        query (Callable[[Client], Any]): Builds and executes the query with
+            the shared client.
+    Returns:
+        Any: The query's result, usually a postgrest APIResponse.
+    """
+    loop = asyncio.get_running_loop()
+    with track_upstream("supabase", operation):
+        # The client (and the SDK) is created on first use, off the event loop
+        return await loop.run_in_executor(
+            _executor, lambda: query(get_supabase_client())
+        )
@@ -0,0 +1,104 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# name -> [total seconds, number of calls] for the request being served.
+# Child tasks share the same dict, so concurrent tool calls add up too.
+_request_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar(
+    "request_timings", default=None
+)
+
+# Server-Timing metric names must be HTTP tokens
+_INVALID_NAME_CHARS = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+def record_timing(name: str, seconds: float):
+    """
+    Add a duration to the current request's breakdown. Does nothing outside
+    a request.
+
+    Args:
+        name (str): What was timed, e.g. "vcell.biomodel" or "llm.tools".
+        seconds (float): How long it took.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        return
+    entry = timings.setdefault(name, [0.0, 0])
+    entry[0] += seconds
+    entry[1] += 1
+
+
+@contextmanager
+def timed(name: str):
+    """
+    Record the duration of the enclosed block, even if it raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start)
+
+
+def current_timings() -> Dict[str, dict]:
+    """
+    The current request's breakdown so far.
+
+    Returns:
+        Dict[str, dict]: duration_ms and calls per timed step.
+    """
+    timings = _request_timings.get() or {}
+    return {
+        name: {"duration_ms": round(seconds * 1000, 1), "calls": calls}
+        for name, (seconds, calls) in timings.items()
+    }
+
+
+def format_server_timing(timings: Dict[str, List[float]], total_seconds: float) -> str:
+    """
+    Render a breakdown as a Server-Timing header value.
+    """
+    metrics = []
+    for name, (seconds, calls) in timings.items():
+        metric = f"{_INVALID_NAME_CHARS.sub('_', name)};dur={seconds * 1000:.1f}"
+        if calls > 1:
+            metric += f';desc="{calls} calls"'
+        metrics.append(metric)
+    metrics.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware collecting the timings recorded while a request is
+    handled (auth, Supabase, LLM completions, tools, VCell and Qdrant calls)
+    and sending them in a Server-Timing response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, List[float]] = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                header = format_server_timing(timings, time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
@@ -0,0 +1,117 @@
+from typing import Any, Callable, Optional
+
+from langfuse import Langfuse
+from langfuse import observe as langfuse_observe
+
+from app.core.config import settings
+from app.core.logger import get_logger, truncate
+
+logger = get_logger("tracing")
+
+# Span inputs are function arguments; never send credentials to Langfuse
+_SECRET_KEYS = {"auth0_token", "virtual_key", "token", "api_key", "authorization"}
+
+langfuse_client: Optional[Langfuse] = None
+
+
+def _names(spec: str) -> set:
+    return {name.strip() for name in spec.split(",") if name.strip()}
+
+
+_SKIP_INPUT_SPANS = _names(settings.LANGFUSE_SKIP_INPUT_SPANS)
+_SKIP_OUTPUT_SPANS = _names(settings.LANGFUSE_SKIP_OUTPUT_SPANS)
+
+
+def _shrink(data: Any) -> Any:
+    """
+    Cap a span input/output before it is serialized: long strings are
+    truncated to LANGFUSE_MAX_FIELD_CHARS, long lists to
+    LANGFUSE_MAX_LIST_ITEMS, binary data is replaced by its size and
+    secrets are redacted.
+    """
+    if isinstance(data, str):
+        return truncate(data, settings.LANGFUSE_MAX_FIELD_CHARS)
+    if isinstance(data, (bytes, bytearray)):
+        return f"<{len(data)} bytes>"
+    if isinstance(data, dict):
+        return {
+            key: "***" if str(key).lower() in _SECRET_KEYS else _shrink(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        items = [_shrink(item) for item in data[: settings.LANGFUSE_MAX_LIST_ITEMS]]
+        if len(data) > settings.LANGFUSE_MAX_LIST_ITEMS:
+            items.append(f"... [{len(data) - settings.LANGFUSE_MAX_LIST_ITEMS} more items]")
+        return items
+    return data
+
+
+def _mask(*, data: Any, **kwargs) -> Any:
+    try:
+        return _shrink(data)
+    except Exception:
+        return "<unserializable>"
+
+
+def init_tracing():
+    """
+    Create the Langfuse client used by @observe. Spans are exported in
+    batches of LANGFUSE_FLUSH_AT (or every LANGFUSE_FLUSH_INTERVAL seconds)
+    by a background thread, and only LANGFUSE_SAMPLE_RATE of traces are kept.
+    """
+    global langfuse_client
+    if langfuse_client is None:
+        langfuse_client = Langfuse(
+            public_key=settings.LANGFUSE_PUBLIC_KEY,
+            secret_key=settings.LANGFUSE_SECRET_KEY,
+            host=settings.LANGFUSE_HOST,
+            tracing_enabled=settings.LANGFUSE_TRACING_ENABLED,
+            sample_rate=settings.LANGFUSE_SAMPLE_RATE,
+            flush_at=settings.LANGFUSE_FLUSH_AT,
+            flush_interval=settings.LANGFUSE_FLUSH_INTERVAL,
+            mask=_mask,
+        )
+        logger.info(
+            f"Langfuse tracing {'enabled' if settings.LANGFUSE_TRACING_ENABLED else 'disabled'}"
+            f" (sample rate {settings.LANGFUSE_SAMPLE_RATE})"
+        )
+    return langfuse_client
+
+
+def shutdown_tracing():
+    """
+    Export the spans still buffered.
+    """
+    if langfuse_client is not None:
+        langfuse_client.flush()
+
+
+def observe(
+    name: str,
+    capture_input: Optional[bool] = None,
+    capture_output: Optional[bool] = None,
+) -> Callable:
+    """
+    Langfuse @observe with capture settings from the config. Functions are
+    returned undecorated when tracing is disabled.
+
+    Args:
+        name (str): The span name.
+        capture_input (Optional[bool]): Record the arguments. Defaults to
+            LANGFUSE_CAPTURE_INPUT unless the span is in LANGFUSE_SKIP_INPUT_SPANS.
+        capture_output (Optional[bool]): Record the return value. Defaults to
+            LANGFUSE_CAPTURE_OUTPUT unless the span is in LANGFUSE_SKIP_OUTPUT_SPANS.
+    Returns:
+        Callable: The decorator.
+    """
+    if not settings.LANGFUSE_TRACING_ENABLED:
+        return lambda func: func
+    if capture_input is None:
+        capture_input = settings.LANGFUSE_CAPTURE_INPUT and name not in _SKIP_INPUT_SPANS
+    if capture_output is None:
+        capture_output = (
+            settings.LANGFUSE_CAPTURE_OUTPUT and name not in _SKIP_OUTPUT_SPANS
+        )
+    return langfuse_observe(
+        name=name, capture_input=capture_input, capture_output=capture_output
+    )
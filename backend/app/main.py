@@ -1,3 +1,9 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,15 +12,39 @@ from app.core.config import settings
 from app.services.knowledge_base_service import (
     create_knowledge_base_collection_if_not_exists,
 )
+from app.services.publications_service import publication_catalog
+from app.core.singleton import (
+    close_chunk_pool,
+    close_shared_cache_backend,
+    close_vcell_http_client,
+    connect_async_qdrant,
+    connect_chunk_pool,
+    connect_embedding_backend,
+    connect_reranker,
+    get_shared_cache_backend,
+)
+from app.utils.cache import configure_shared_cache
+from app.core.auth import start_jwks_refresh, stop_jwks_refresh
+from app.core.tracing import init_tracing, shutdown_tracing
 
 logger = get_logger(__file__)
 
+# Before any @observe span, so the configured client is the one used
+init_tracing()
+
 # Routers
 from app.routes.vcelldb_router import router as vcelldb_router
 from app.routes.llms_router import router as llms_router
 from app.routes.qdrant_router import router as qdrant_router
 from app.routes.knowledge_base_router import router as knowledge_base_router
 from app.routes.users_router import router as users_router
+from app.routes.metrics_router import router as metrics_router
+from app.core.metrics import (
+    MetricsMiddleware,
+    clear_multiprocess_dir,
+    mark_worker_stopped,
+)
+from app.core.timing import ServerTimingMiddleware
 
 ascii_art = """
 ╔════════════════════════════════════════════════════════════════════════════════════╗
@@ -24,24 +54,57 @@ ascii_art = """
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
-app = FastAPI()
 
-logger.info(f"Starting App : \n {ascii_art}")
-logger.info("App Ready")
-
-
-@app.on_event("startup")
-async def startup_event():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     """
-    Initialize the knowledge base collection on startup.
+    Create the shared clients and initialize the knowledge base collection
+    before serving; stop background tasks and close clients on shutdown.
+    The SDKs behind these clients are imported here rather than when the
+    app module is loaded.
     """
+    try:
+        configure_shared_cache(get_shared_cache_backend())
+    except Exception as e:
+        logger.error(f"Shared cache unavailable, caching per worker only: {e}")
+
+    try:
+        connect_async_qdrant()
+        # Loading the embedding model (or the OpenAI SDK) is blocking work
+        await asyncio.to_thread(connect_embedding_backend)
+        if settings.KB_RERANK:
+            await asyncio.to_thread(connect_reranker)
+    except Exception as e:
+        logger.error(f"Client initialization failed: {e}")
+
     logger.info("Initializing knowledge base collection...")
-    result = create_knowledge_base_collection_if_not_exists()
+    result = await create_knowledge_base_collection_if_not_exists()
     if result["status"] == "success":
         logger.info(f"Knowledge base initialization: {result['message']}")
     else:
         logger.error(f"Knowledge base initialization failed: {result['message']}")
 
+    connect_chunk_pool()
+    publication_catalog.start_refresh()
+    start_jwks_refresh()
+    logger.info("App Ready")
+
+    yield
+
+    publication_catalog.stop_refresh()
+    stop_jwks_refresh()
+    await close_vcell_http_client()
+    close_chunk_pool()
+    configure_shared_cache(None)
+    await close_shared_cache_backend()
+    shutdown_tracing()
+    mark_worker_stopped()
+
+
+app = FastAPI(lifespan=lifespan)
+
+logger.info(f"Starting App : \n {ascii_art}")
+
 
 # CORS setup
 app.add_middleware(
@@ -52,12 +115,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
 # Including the routers
 app.include_router(knowledge_base_router, tags=["Knowledge Base"], prefix="/kb")
 app.include_router(llms_router, tags=["LLM with Tool Calling"])
 app.include_router(vcelldb_router, tags=["VCellDB API Wrapper"])
 app.include_router(qdrant_router, tags=["Qdrant Vector DB"], prefix="/qdrant")
 app.include_router(users_router, tags=["Users"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, tags=["Metrics"])
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    workers = settings.SERVER_WORKERS
+    # Temporary metrics directory created for this run, removed on exit
+    owned_metrics_dir = None
+    if workers > 1 and settings.METRICS_ENABLED:
+        # Each worker writes its metrics here and /metrics reports them all
+        metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        if metrics_dir:
+            clear_multiprocess_dir(metrics_dir)
+        else:
+            owned_metrics_dir = tempfile.mkdtemp(prefix="vcell_ai_metrics_")
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = owned_metrics_dir
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            workers=workers,
+            reload=settings.SERVER_RELOAD and workers == 1,
+        )
+    finally:
+        if owned_metrics_dir is not None:
+            shutil.rmtree(owned_metrics_dir, ignore_errors=True)
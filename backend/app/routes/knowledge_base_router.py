@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Form, UploadFile, File
 from app.controllers.knowledge_base_controller import (
     create_collection_controller,
@@ -6,8 +7,10 @@ from app.controllers.knowledge_base_controller import (
     upload_text_controller,
     delete_file_controller,
     get_similar_controller,
+    get_similar_batch_controller,
     get_file_chunks_controller,
 )
+from app.schemas.knowledge_base_schema import SimilarBatchRequest
 from app.core.auth import require_admin
 
 # All knowledge base endpoints are admin-only.
@@ -38,26 +41,40 @@ async def get_files_endpoint():
 
 @router.post("/upload-pdf")
 async def upload_pdf_endpoint(
-    file: UploadFile = File(...), source_url: str = Form(None)
+    file: UploadFile = File(...),
+    source_url: str = Form(None),
+    chunker: str = Form(None),
+    max_tokens: int = Form(None),
+    overlap_tokens: int = Form(None),
 ):
     """
-    Upload a PDF file to the knowledge base.
+    Upload a PDF file to the knowledge base. chunker ("structured" or
+    "recursive"), max_tokens and overlap_tokens override the default chunking.
     """
     try:
-        return await upload_pdf_controller(file, source_url)
+        return await upload_pdf_controller(
+            file, source_url, chunker, max_tokens, overlap_tokens
+        )
     except Exception as e:
         raise e
 
 
 @router.post("/upload-text")
 async def upload_text_endpoint(
-    file: UploadFile = File(...), source_url: str = Form(None)
+    file: UploadFile = File(...),
+    source_url: str = Form(None),
+    chunker: str = Form(None),
+    max_tokens: int = Form(None),
+    overlap_tokens: int = Form(None),
 ):
     """
-    Upload a text file to the knowledge base.
+    Upload a text file to the knowledge base. chunker ("structured" or
+    "recursive"), max_tokens and overlap_tokens override the default chunking.
     """
     try:
-        return await upload_text_controller(file, source_url)
+        return await upload_text_controller(
+            file, source_url, chunker, max_tokens, overlap_tokens
+        )
     except Exception as e:
         raise e
 
@@ -74,22 +91,41 @@ async def delete_file_endpoint(file_name: str):
 
 
 @router.get("/similar")
-async def get_similar_endpoint(query: str, limit: int = 10):
+async def get_similar_endpoint(
+    query: str, limit: int = 10, rerank: Optional[bool] = None
+):
     """
-    Get similar chunks from the knowledge base.
+    Get similar chunks from the knowledge base. rerank overrides the
+    KB_RERANK setting for this request.
     """
     try:
-        return await get_similar_controller(query, limit)
+        return await get_similar_controller(query, limit, rerank)
+    except Exception as e:
+        raise e
+
+
+@router.post("/similar/batch")
+async def get_similar_batch_endpoint(request: SimilarBatchRequest):
+    """
+    Get similar chunks for many queries in one request. All queries are
+    embedded together and searched in a single Qdrant round trip; results
+    come back per query, in request order.
+    """
+    try:
+        return await get_similar_batch_controller(request)
     except Exception as e:
         raise e
 
 
 @router.get("/files/{file_name}/chunks")
-async def get_file_chunks_endpoint_router(file_name: str):
+async def get_file_chunks_endpoint_router(
+    file_name: str, offset: int = 0, limit: Optional[int] = None
+):
     """
-    Get all chunks for a specific file.
+    Get the chunks for a specific file, ordered by chunk index. Pass offset
+    and limit to page through large files; next_offset is null on the last page.
     """
     try:
-        return await get_file_chunks_controller(file_name)
+        return await get_file_chunks_controller(file_name, offset, limit)
     except Exception as e:
         raise e
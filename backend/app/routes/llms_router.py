@@ -8,14 +8,26 @@ from app.controllers.llms_controller import (
     analyse_diagram_controller,
 )
 from app.core.auth import verify_auth0_token, get_bearer_token
+from app.core.timing import current_timings
 from app.schemas.llms_schema import AnalysisResponse, ChatRequest, ChatResponse, LLMModel
 
 router = APIRouter()
 
 
-@router.post("/query", response_model=ChatResponse)
+def _with_timings(response: dict, timings: bool) -> dict:
+    """
+    Add the request's latency breakdown (also sent in the Server-Timing
+    header) to a response body when the caller asked for it.
+    """
+    if timings:
+        response["timings"] = current_timings()
+    return response
+
+
+@router.post("/query", response_model=ChatResponse, response_model_exclude_none=True)
 async def query_llm(
     request: ChatRequest,
+    timings: bool = False,
     payload: dict = Depends(verify_auth0_token),
     access_token: str = Depends(get_bearer_token),
 ):
@@ -23,6 +35,7 @@ async def query_llm(
     Endpoint to query the LLM and execute the necessary tools.
     Args:
         request (ChatRequest): The conversation history and model choice.
+        timings (bool): Include the latency breakdown in the response.
     Returns:
         dict: The final response after processing the prompt with the tools.
     """
@@ -32,13 +45,16 @@ async def query_llm(
         payload,
         access_token,
     )
-    return {"response": result, "bmkeys": bmkeys, "model_used": model_used}
+    return _with_timings(
+        {"response": result, "bmkeys": bmkeys, "model_used": model_used}, timings
+    )
 
 
-@router.post("/query/faq/{faq_id}", response_model=ChatResponse)
+@router.post("/query/faq/{faq_id}", response_model=ChatResponse, response_model_exclude_none=True)
 async def query_faq(
     faq_id: str,
     model: LLMModel = "openai-model",
+    timings: bool = False,
     payload: dict = Depends(verify_auth0_token),
 ):
     """
@@ -48,18 +64,22 @@ async def query_faq(
     Args:
         faq_id (str): Key identifying which FAQ quick action was clicked.
         model (LLMModel): The LiteLLM model alias to use.
+        timings (bool): Include the latency breakdown in the response.
     Returns:
         dict: The final response after executing the FAQ's tool and formatting the result.
     """
     result, bmkeys, model_used = await get_faq_llm_response(faq_id, model, payload)
-    return {"response": result, "bmkeys": bmkeys, "model_used": model_used}
+    return _with_timings(
+        {"response": result, "bmkeys": bmkeys, "model_used": model_used}, timings
+    )
 
 
-@router.post("/analyse/{biomodel_id}", response_model=AnalysisResponse)
+@router.post("/analyse/{biomodel_id}", response_model=AnalysisResponse, response_model_exclude_none=True)
 async def analyse_biomodel(
     biomodel_id: str,
     user_prompt: str,
     model: LLMModel = "openai-model",
+    timings: bool = False,
     payload: dict = Depends(verify_auth0_token),
 ):
     """
@@ -67,34 +87,38 @@ async def analyse_biomodel(
     Args:
         biomodel_id (str): The ID of the biomodel to be analyzed.
         user_prompt (str): The prompt entered by the user.
+        timings (bool): Include the latency breakdown in the response.
     Returns:
         dict: The analysis result from the LLM service.
     """
     result = await analyse_biomodel_controller(biomodel_id, user_prompt, model, payload)
-    return {"response": result}
+    return _with_timings({"response": result}, timings)
 
 
-@router.post("/analyse/{biomodel_id}/vcml", response_model=AnalysisResponse)
+@router.post("/analyse/{biomodel_id}/vcml", response_model=AnalysisResponse, response_model_exclude_none=True)
 async def analyse_vcml(
     biomodel_id: str,
     model: LLMModel = "openai-model",
+    timings: bool = False,
     payload: dict = Depends(verify_auth0_token),
 ):
     """
     Endpoint to analyze VCML content for a given biomodel.
     Args:
         biomodel_id (str): The ID of the biomodel to analyze.
+        timings (bool): Include the latency breakdown in the response.
     Returns:
         dict: The VCML analysis response.
     """
     result = await analyse_vcml_controller(biomodel_id, model, payload)
-    return {"response": result}
+    return _with_timings({"response": result}, timings)
 
 
-@router.post("/analyse/{biomodel_id}/diagram", response_model=AnalysisResponse)
+@router.post("/analyse/{biomodel_id}/diagram", response_model=AnalysisResponse, response_model_exclude_none=True)
 async def analyse_diagram(
     biomodel_id: str,
     model: LLMModel = "openai-model",
+    timings: bool = False,
     payload: dict = Depends(verify_auth0_token),
     access_token: str = Depends(get_bearer_token),
 ):
@@ -102,8 +126,9 @@ async def analyse_diagram(
     Endpoint to analyze diagram for a given biomodel.
     Args:
         biomodel_id (str): The ID of the biomodel to analyze.
+        timings (bool): Include the latency breakdown in the response.
     Returns:
         dict: The diagram analysis response.
     """
     result = await analyse_diagram_controller(biomodel_id, model, payload, access_token)
-    return {"response": result}
+    return _with_timings({"response": result}, timings)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import metrics_response_body
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    endpoint to expose Prometheus metrics.
+    """
+    body, content_type = metrics_response_body()
+    return Response(content=body, media_type=content_type)
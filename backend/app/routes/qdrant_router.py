@@ -3,12 +3,14 @@ from app.schemas.qdrant_schema import (
     CreateCollectionRequest,
     InsertPointRequest,
     SearchPointsRequest,
+    BatchSearchPointsRequest,
     DeleteDocumentRequest,
 )
 from app.controllers.qdrant_controller import (
     create_collection_controller,
     insert_point_controller,
     search_points_controller,
+    batch_search_points_controller,
     delete_document_controller,
 )
 
@@ -48,6 +50,18 @@ async def search_points(request: SearchPointsRequest):
         raise e
 
 
+@router.post("/search/batch", response_model=dict)
+async def batch_search_points(request: BatchSearchPointsRequest):
+    """
+    Endpoint to search a Qdrant collection for many vectors in one request.
+    Results are returned as one list per vector, in request order.
+    """
+    try:
+        return await batch_search_points_controller(request)
+    except HTTPException as e:
+        raise e
+
+
 @router.delete("/documents", response_model=dict)
 async def delete_document(request: DeleteDocumentRequest):
     """
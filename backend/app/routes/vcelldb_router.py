@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from typing import List, Literal, Optional
 from app.core.auth import get_optional_auth0_token
-from app.schemas.vcelldb_schema import BiomodelRequestParams, SimulationRequestParams
+from app.schemas.vcelldb_schema import (
+    BiomodelRequestParams,
+    SimulationRequestParams,
+    SimulationBatchRequest,
+    BulkExportRequest,
+)
 from app.controllers.vcelldb_controller import (
     get_biomodels_controller,
     get_simulation_details_controller,
+    get_simulation_details_batch_controller,
+    export_biomodels_controller,
     get_vcml_controller,
     get_bngl_controller,
     get_sbml_controller,
@@ -33,6 +40,15 @@ async def get_biomodels(
         raise e
 
 
+@router.post("/biomodel/export")
+async def export_biomodels(request: BulkExportRequest):
+    """
+    Endpoint to download the VCML/SBML/BNGL files of many biomodels, selected
+    by ID and/or by a biomodel search, as one streamed ZIP archive.
+    """
+    return await export_biomodels_controller(request)
+
+
 @router.get("/biomodel/{biomodel_id}/simulations", response_model=dict)
 async def get_simulations(
     biomodel_id: str, params: SimulationRequestParams = Depends()
@@ -47,6 +63,18 @@ async def get_simulations(
         raise e
 
 
+@router.post("/biomodel/{biomodel_id}/simulations/batch", response_model=dict)
+async def get_simulations_batch(biomodel_id: str, request: SimulationBatchRequest):
+    """
+    Endpoint to retrieve the details of many simulations of a biomodel in
+    one request.
+    """
+    try:
+        return await get_simulation_details_batch_controller(biomodel_id, request)
+    except HTTPException as e:
+        raise e
+
+
 @router.get("/biomodel/{biomodel_id}/biomodel.vcml", response_model=str)
 async def get_vcml(biomodel_id: str, truncate: bool = False):
     """
@@ -95,33 +123,55 @@ async def get_diagram_url(biomodel_id: str):
 @router.get("/biomodel/{biomodel_id}/diagram/image")
 async def get_diagram_image(
     biomodel_id: str,
+    variant: Literal["original", "thumbnail", "llm"] = "original",
     auth0_token: Optional[str] = Depends(get_optional_auth0_token),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
-    Endpoint to get the diagram image (PNG) for a given biomodel. If a
+    Endpoint to get the diagram image for a given biomodel: the original
+    PNG, a small thumbnail, or the reduced image sent to vision models. If a
     valid Authorization bearer token is sent, this also works for private
     and shared biomodels.
     """
-    return await get_diagram_image_controller(biomodel_id, auth0_token)
+    return await get_diagram_image_controller(
+        biomodel_id, auth0_token, variant, if_none_match
+    )
 
 
 @router.get("/biomodel/{biomodel_id}/applications/files", response_model=dict)
-async def get_biomodel_applications_files(biomodel_id: str):
+async def get_biomodel_applications_files(biomodel_id: str, check_files: bool = False):
     """
     Endpoint to get applications data along with SBML and BNGL file URLs for a given biomodel.
+    With check_files=true, each application also reports whether its BNGL and
+    SBML exports are available, and their size.
     """
     try:
-        return await get_biomodel_applications_files_controller(biomodel_id)
+        return await get_biomodel_applications_files_controller(biomodel_id, check_files)
     except HTTPException as e:
         raise e
 
 
 @router.get("/publications", response_model=List[dict])
-async def get_publications():
+async def get_publications(
+    query: str = "",
+    author: str = "",
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    biomodel_key: str = "",
+    limit: Optional[int] = Query(None, ge=1),
+):
     """
-    Endpoint to retrieve publications from the VCell API.
+    Endpoint to retrieve publications from the VCell API, optionally
+    filtered by text, author, year range and linked biomodel key.
     """
     try:
-        return await get_publications_controller()
+        return await get_publications_controller(
+            query=query,
+            author=author,
+            year_from=year_from,
+            year_to=year_to,
+            biomodel_key=biomodel_key,
+            limit=limit,
+        )
     except HTTPException as e:
         raise e
@@ -0,0 +1,71 @@
+from typing import List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.core.config import settings
+from app.utils.chunker import check_chunk_budget
+
+
+class ChunkingOptions(BaseModel):
+    """
+    Per-upload chunking settings. Unset fields use the KB_CHUNK_* settings.
+    An overlap_tokens at least max_tokens, or a min_tokens above it, is rejected.
+    """
+
+    strategy: Optional[Literal["structured", "recursive"]] = Field(
+        default=None,
+        description="'structured' splits markdown by headings, tables and sentences "
+        "within a token budget; 'recursive' is the 2000/300-character splitter",
+    )
+    max_tokens: Optional[int] = Field(
+        default=None, description="Token budget per chunk", ge=32, le=8192
+    )
+    overlap_tokens: Optional[int] = Field(
+        default=None, description="Tokens repeated between consecutive chunks", ge=0
+    )
+    min_tokens: Optional[int] = Field(
+        default=None, description="Smaller sections are merged with the next one", ge=0
+    )
+
+    @model_validator(mode="after")
+    def _check_budget(self):
+        # Only the fields given are checked; the defaults of the others are
+        # capped to fit by resolve()
+        check_chunk_budget(
+            self.max_tokens or settings.KB_CHUNK_MAX_TOKENS,
+            self.overlap_tokens or 0,
+            self.min_tokens or 0,
+        )
+        return self
+
+    def resolve(self) -> Tuple[int, int, int]:
+        """
+        The effective token parameters. Defaults from the KB_CHUNK_* settings
+        are capped to fit a smaller max_tokens: the overlap to half of it and
+        min_tokens to all of it.
+
+        Returns:
+            Tuple[int, int, int]: max_tokens, overlap_tokens and min_tokens.
+        """
+        max_tokens = self.max_tokens or settings.KB_CHUNK_MAX_TOKENS
+        overlap_tokens = self.overlap_tokens
+        if overlap_tokens is None:
+            overlap_tokens = min(settings.KB_CHUNK_OVERLAP_TOKENS, max_tokens // 2)
+        min_tokens = self.min_tokens
+        if min_tokens is None:
+            min_tokens = min(settings.KB_CHUNK_MIN_TOKENS, max_tokens)
+        return max_tokens, overlap_tokens, min_tokens
+
+
+class SimilarBatchRequest(BaseModel):
+    """Schema for searching the knowledge base with many queries at once."""
+
+    queries: List[str] = Field(
+        ..., description="Queries to search for", min_length=1, max_length=50
+    )
+    limit: int = Field(
+        default=10, description="Maximum number of chunks per query", gt=0, le=100
+    )
+    rerank: Optional[bool] = Field(
+        default=None, description="Rerank with the cross-encoder; defaults to KB_RERANK"
+    )
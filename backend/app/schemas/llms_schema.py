@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -14,7 +14,10 @@ class ChatResponse(BaseModel):
     response: str
     bmkeys: list = Field(default_factory=list)
     model_used: str
+    # Per-step latency breakdown, only with ?timings=true
+    timings: Optional[dict] = None
 
 
 class AnalysisResponse(BaseModel):
     response: str
+    timings: Optional[dict] = None
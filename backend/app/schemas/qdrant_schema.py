@@ -10,6 +10,20 @@ class CreateCollectionRequest(BaseModel):
     distance: str = Field(
         ..., description="Distance metric to use", pattern="^(cosine|dot)$"
     )
+    quantization: Optional[str] = Field(
+        default=None,
+        description="Vector quantization to use",
+        pattern="^(scalar|binary)$",
+    )
+    on_disk: bool = Field(
+        default=False, description="Store the original vectors on disk"
+    )
+    hnsw_m: Optional[int] = Field(
+        default=None, description="Edges per node in the HNSW graph", gt=0
+    )
+    hnsw_ef_construct: Optional[int] = Field(
+        default=None, description="Candidate list size while building the HNSW graph", gt=0
+    )
 
 
 class InsertPointRequest(BaseModel):
@@ -31,6 +45,40 @@ class SearchPointsRequest(BaseModel):
     limit: Optional[int] = Field(
         default=10, description="Maximum number of points to return", gt=0, le=100
     )
+    hnsw_ef: Optional[int] = Field(
+        default=None, description="Candidate list size while searching the HNSW graph", gt=0
+    )
+    score_threshold: Optional[float] = Field(
+        default=None, description="Minimum similarity score of returned points"
+    )
+    oversampling: Optional[float] = Field(
+        default=None,
+        description="Candidate oversampling factor for rescoring quantized vectors",
+        ge=1,
+    )
+
+
+class BatchSearchPointsRequest(BaseModel):
+    """Schema for searching points in Qdrant for many vectors at once."""
+
+    collection_name: str = Field(..., description="Name of the collection to search in")
+    vectors: List[List[float]] = Field(
+        ..., description="Vectors to search for", min_length=1, max_length=100
+    )
+    limit: Optional[int] = Field(
+        default=10, description="Maximum number of points to return per vector", gt=0, le=100
+    )
+    hnsw_ef: Optional[int] = Field(
+        default=None, description="Candidate list size while searching the HNSW graph", gt=0
+    )
+    score_threshold: Optional[float] = Field(
+        default=None, description="Minimum similarity score of returned points"
+    )
+    oversampling: Optional[float] = Field(
+        default=None,
+        description="Candidate oversampling factor for rescoring quantized vectors",
+        ge=1,
+    )
 
 
 class DeleteDocumentRequest(BaseModel):
@@ -1,8 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import date
 from enum import Enum
 
+from app.core.config import settings
+
 
 class CategoryEnum(str, Enum):
     all = "all"
@@ -37,3 +39,21 @@ class BiomodelRequestParams(BaseModel, use_enum_values=True):
 class SimulationRequestParams(BaseModel):
     bmId: str  # Biomodel ID for which simulations will be fetched
     simId: str  # Simulation ID to fetch specific simulation details
+
+
+class SimulationBatchRequest(BaseModel):
+    simIds: List[str] = Field(
+        ..., min_length=1, max_length=100
+    )  # Simulation IDs to fetch for the biomodel
+
+
+class BulkExportRequest(BaseModel):
+    bmIds: Optional[List[str]] = Field(
+        None, max_length=settings.BULK_EXPORT_MAX_MODELS
+    )  # Biomodel IDs to export
+    query: Optional[BiomodelRequestParams] = (
+        None  # Biomodel search whose results are also exported
+    )
+    formats: List[Literal["vcml", "sbml", "bngl"]] = Field(
+        ["vcml"], min_length=1
+    )  # File formats to include for each biomodel
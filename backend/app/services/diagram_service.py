@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.vcelldb_service import get_diagram_image
+from app.utils.cache import AsyncLRUCache
+from app.utils.images import image_etag, resize_image
+
+logger = get_logger("diagram_service")
+
+DIAGRAM_VARIANTS = ("original", "thumbnail", "llm")
+
+_image_executor = ThreadPoolExecutor(
+    max_workers=settings.DIAGRAM_IMAGE_THREADS, thread_name_prefix="diagram"
+)
+
+# (biomodel_id, token hash or None) -> {variant: {content, media_type, etag}}
+diagram_cache = AsyncLRUCache(
+    settings.DIAGRAM_CACHE_SIZE, ttl_seconds=settings.DIAGRAM_CACHE_TTL, name="diagram"
+)
+
+
+def _build_variants(original: bytes) -> dict:
+    """
+    Produce the cached variants of a diagram: the original, a gallery
+    thumbnail and a reduced image for vision models.
+    """
+    variants = {"original": (original, "image/png")}
+    for name, max_side in (
+        ("thumbnail", settings.DIAGRAM_THUMBNAIL_SIZE),
+        ("llm", settings.DIAGRAM_LLM_MAX_SIDE),
+    ):
+        try:
+            variants[name] = resize_image(
+                original, max_side, settings.DIAGRAM_VARIANT_FORMAT
+            )
+        except Exception as e:
+            logger.warning(f"Could not resize diagram, serving the original: {str(e)}")
+            variants[name] = variants["original"]
+
+    return {
+        name: {"content": content, "media_type": media_type, "etag": image_etag(content)}
+        for name, (content, media_type) in variants.items()
+    }
+
+
+def _cache_key(biomodel_id: str, auth0_token: Optional[str]) -> tuple:
+    # Diagrams fetched with a user's token may be private, so they are only
+    # served again for the same token.
+    if not auth0_token:
+        return (biomodel_id, None)
+    return (biomodel_id, hashlib.sha256(auth0_token.encode("utf-8")).hexdigest())
+
+
+async def get_diagram_image_variant(
+    biomodel_id: str, variant: str = "original", auth0_token: Optional[str] = None
+) -> dict:
+    """
+    Get a diagram image variant for a biomodel from the cache, fetching the
+    diagram from the VCell API and generating all of its variants (in a
+    worker thread) on a miss.
+
+    Args:
+        biomodel_id (str): ID of the biomodel.
+        variant (str): "original", "thumbnail" (at most DIAGRAM_THUMBNAIL_SIZE
+            px) or "llm" (at most DIAGRAM_LLM_MAX_SIDE px, for vision models).
+        auth0_token (Optional[str]): Verified Auth0 access token for the
+            logged-in user, if any. Required for private or shared biomodels.
+
+    Returns:
+        dict: The image content (bytes), its media_type and etag.
+    """
+    if variant not in DIAGRAM_VARIANTS:
+        raise ValueError(f"Unknown diagram variant: {variant}")
+
+    async def load() -> dict:
+        original = await get_diagram_image(biomodel_id, auth0_token)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_image_executor, _build_variants, original)
+
+    variants = await diagram_cache.get_or_load(_cache_key(biomodel_id, auth0_token), load)
+    return variants[variant]
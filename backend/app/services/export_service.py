@@ -0,0 +1,143 @@
+import asyncio
+import json
+from functools import partial
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.schemas.vcelldb_schema import BiomodelRequestParams
+from app.services.vcelldb_service import (
+    fetch_biomodels,
+    get_bngl_file,
+    get_sbml_file,
+    get_vcml_file,
+)
+from app.utils.zip_stream import ZipStreamWriter
+
+logger = get_logger("export_service")
+
+# Archives streamed at once by this worker; further exports wait for a slot,
+# so upstream downloads stay bounded however many requests arrive
+_export_slots = asyncio.Semaphore(settings.BULK_EXPORT_MAX_ACTIVE)
+
+EXPORT_FORMATS = {
+    # Exports need the whole file, never the 500-character preview (truncate=True)
+    "vcml": partial(get_vcml_file, truncate=False),
+    "sbml": get_sbml_file,
+    "bngl": get_bngl_file,
+}
+
+
+async def resolve_export_biomodel_ids(
+    biomodel_ids: Optional[List[str]] = None,
+    query: Optional[BiomodelRequestParams] = None,
+) -> List[str]:
+    """
+    Collect the biomodels to export: the given IDs followed by those
+    matching the query, without duplicates.
+
+    Args:
+        biomodel_ids (Optional[List[str]]): Explicit biomodel IDs.
+        query (Optional[BiomodelRequestParams]): Biomodel search whose results
+            are added to the export.
+    Returns:
+        List[str]: The biomodel IDs to export.
+    Raises:
+        ValueError: If more than BULK_EXPORT_MAX_MODELS biomodels are selected.
+    """
+    limit = settings.BULK_EXPORT_MAX_MODELS
+    ids = list(biomodel_ids or [])
+    if query is not None:
+        # One row past the limit is enough to tell that the search selects too many
+        query.maxRows = min(query.maxRows or limit + 1, limit + 1)
+        result = await fetch_biomodels(query)
+        ids.extend(result["unique_model_keys (bmkey)"])
+    ids = list(dict.fromkeys(str(i) for i in ids if i))
+    if len(ids) > limit:
+        raise ValueError(
+            f"More than {limit} biomodels selected; narrow the search or export in parts."
+        )
+    return ids
+
+
+async def _export_file(biomodel_id: str, file_format: str) -> dict:
+    try:
+        content = await EXPORT_FORMATS[file_format](biomodel_id)
+    except Exception as e:
+        logger.error(f"Error exporting {file_format} for biomodel {biomodel_id}: {str(e)}")
+        return {
+            "biomodel_id": biomodel_id,
+            "format": file_format,
+            "status": "error",
+            "message": str(e),
+        }
+    if not content:
+        # get_bngl_file returns "" for models that are not rule-based
+        return {"biomodel_id": biomodel_id, "format": file_format, "status": "not_available"}
+    return {
+        "biomodel_id": biomodel_id,
+        "format": file_format,
+        "status": "success",
+        "path": f"{biomodel_id}/biomodel.{file_format}",
+        "content": content.encode("utf-8"),
+    }
+
+
+async def stream_biomodels_zip(
+    biomodel_ids: List[str], formats: List[str]
+) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP archive of the requested model files. BULK_EXPORT_CONCURRENCY
+    workers download files (through the model file cache) and each file is
+    written to the stream as soon as it is ready. Downloads wait while the
+    client is slow to read, so at most about two files per worker are held
+    in memory. The archive ends with manifest.json, which lists every
+    requested file and whether it was exported. At most
+    BULK_EXPORT_MAX_ACTIVE archives are streamed at once; others wait.
+
+    Args:
+        biomodel_ids (List[str]): The biomodels to export.
+        formats (List[str]): File formats to include ("vcml", "sbml", "bngl").
+    Yields:
+        bytes: Consecutive pieces of the ZIP archive.
+    """
+    # Wait for an export slot before downloading anything
+    async with _export_slots:
+        jobs: asyncio.Queue = asyncio.Queue()
+        for biomodel_id in biomodel_ids:
+            for file_format in formats:
+                jobs.put_nowait((biomodel_id, file_format))
+        total = jobs.qsize()
+        concurrency = max(1, min(settings.BULK_EXPORT_CONCURRENCY, total))
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+        async def worker():
+            while True:
+                try:
+                    biomodel_id, file_format = jobs.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await results.put(await _export_file(biomodel_id, file_format))
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        archive = ZipStreamWriter()
+        manifest = []
+        try:
+            for _ in range(total):
+                result = await results.get()
+                content = result.pop("content", None)
+                manifest.append(result)
+                if content is not None:
+                    # Compression is CPU-bound; keep it off the event loop
+                    yield await asyncio.to_thread(archive.add, result["path"], content)
+
+            manifest.sort(key=lambda entry: (entry["biomodel_id"], entry["format"]))
+            yield archive.add("manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+            yield archive.close()
+            logger.info(
+                f"Exported {sum(1 for entry in manifest if entry['status'] == 'success')}/{total} "
+                f"files for {len(biomodel_ids)} biomodels"
+            )
+        finally:
+            for task in workers:
+                task.cancel()
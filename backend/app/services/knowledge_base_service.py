@@ -1,99 +1,413 @@
+import asyncio
 import os
 import uuid
 from datetime import datetime, timezone
-from markitdown import MarkItDown
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from app.core.config import settings
-from app.core.singleton import get_embeddings_client, get_qdrant_client
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from app.core.singleton import (
+    get_embeddings_client,
+    get_embedding_backend,
+    get_async_qdrant_client,
+    get_chunk_pool,
+    get_reranker,
+)
+from app.utils import bm25
+from app.utils.chunker import Chunk, chunk_markdown
+from app.utils.context_packing import pack_context
+from app.utils.cache import AsyncLRUCache
+from app.utils.tokens import count_tokens
+from app.schemas.knowledge_base_schema import ChunkingOptions
 from app.services.qdrant_service import (
     create_qdrant_collection,
+    create_qdrant_payload_collection,
+    create_qdrant_payload_index,
     insert_qdrant_points,
-    search_qdrant_points,
+    upsert_qdrant_payload,
+    scroll_qdrant_points,
+    search_qdrant_points_batch,
     delete_qdrant_documents,
 )
-from langfuse import observe
+from app.core.timing import timed
+from app.core.tracing import observe
+
+
+@lru_cache(maxsize=1)
+def _get_markitdown_client():
+    # markitdown[all] pulls in every document converter; import it on the
+    # first upload rather than at startup
+    from markitdown import MarkItDown
+
+    return MarkItDown(
+        llm_client=get_embeddings_client(), model=settings.AZURE_DEPLOYMENT_NAME
+    )
 
-embeddings_client = get_embeddings_client()
-qdrant_client = get_qdrant_client()
-markitdown_client = MarkItDown(
-    llm_client=embeddings_client, model=settings.AZURE_DEPLOYMENT_NAME
-)
 
 KB_COLLECTION_NAME = settings.QDRANT_COLLECTION_NAME
 
+# One vectorless point per uploaded file, so listing files never has to read
+# the (large) chunk payloads of the main collection.
+KB_MANIFEST_COLLECTION_NAME = f"{KB_COLLECTION_NAME}_files"
+
+# Payload fields the knowledge base filters and sorts on, and their index types.
+KB_PAYLOAD_INDEXES = {"file_name": "keyword", "chunk_index": "integer"}
+
+# Page size used when walking a scroll through to the end.
+KB_SCROLL_PAGE_SIZE = 256
+
+# Name of the BM25 sparse vector stored next to the dense embedding.
+KB_SPARSE_VECTOR_NAME = "bm25"
+
+# Hybrid search fetches this many candidates per retriever for every result
+# it returns, so RRF has overlapping rankings to fuse.
+KB_HYBRID_PREFETCH_FACTOR = 4
+
+# Whether each collection was created with the sparse vector, keyed by name.
+_sparse_support: Dict[str, bool] = {}
 
-def create_knowledge_base_collection_if_not_exists():
+# (embedding model, query) -> query embedding, shared across worker processes
+query_embedding_cache = AsyncLRUCache(
+    settings.EMBEDDING_CACHE_SIZE,
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL,
+    name="embedding",
+    shared=True,
+)
+
+
+async def _supports_sparse(collection_name: str) -> bool:
     """
-    Create a knowledge base collection in Qdrant if it does not exist.
+    Whether a collection stores the BM25 sparse vector. Collections created
+    before hybrid search was added are dense-only until they are rebuilt.
+    """
+    if collection_name not in _sparse_support:
+        collection_info = await get_async_qdrant_client().get_collection(collection_name)
+        params = collection_info.config.params
+        _sparse_support[collection_name] = KB_SPARSE_VECTOR_NAME in (
+            params.sparse_vectors or {}
+        )
+    return _sparse_support[collection_name]
+
+
+async def _ensure_payload_indexes(
+    collection_name: str, indexes: Dict[str, str], collection_info=None
+):
+    """
+    Create any of the given payload indexes that a collection is missing.
+    Collections created before an index was introduced get it back-filled here.
+
+    Args:
+        collection_name (str): The name of the collection to index.
+        indexes (Dict[str, str]): Payload field name -> index type.
+        collection_info: The collection's info, if already fetched.
+    """
+    if collection_info is None:
+        collection_info = await get_async_qdrant_client().get_collection(collection_name)
+    existing = collection_info.payload_schema or {}
+    for field_name, field_schema in indexes.items():
+        if field_name not in existing:
+            await create_qdrant_payload_index(collection_name, field_name, field_schema)
+
+
+async def create_knowledge_base_collection_if_not_exists():
+    """
+    Create a knowledge base collection in Qdrant if it does not exist, along
+    with its payload indexes and its per-file manifest collection.
     """
     try:
         # Check if collection exists
-        collections = qdrant_client.get_collections()
+        collections = await get_async_qdrant_client().get_collections()
         collection_names = [col.name for col in collections.collections]
 
         if KB_COLLECTION_NAME not in collection_names:
-            # Create collection with 1536 dimensions (Azure OpenAI text-embedding-ada-002)
-            result = create_qdrant_collection(
-                collection_name=KB_COLLECTION_NAME, vector_size=1536, distance="cosine"
+            # The vector size follows the configured embedding model
+            result = await create_qdrant_collection(
+                collection_name=KB_COLLECTION_NAME,
+                vector_size=get_embedding_backend().dimension,
+                distance="cosine",
+                sparse_vector_name=KB_SPARSE_VECTOR_NAME,
+                quantization=settings.KB_QUANTIZATION,
+                on_disk=settings.KB_VECTORS_ON_DISK,
+                hnsw_m=settings.KB_HNSW_M,
+                hnsw_ef_construct=settings.KB_HNSW_EF_CONSTRUCT,
             )
-            return {"status": "success", "message": result}
+            _sparse_support.pop(KB_COLLECTION_NAME, None)
+            message = result["message"]
         else:
+            message = f"Collection {KB_COLLECTION_NAME} already exists."
+
+        collection_info = await get_async_qdrant_client().get_collection(KB_COLLECTION_NAME)
+        vector_size = collection_info.config.params.vectors.size
+        if vector_size != get_embedding_backend().dimension:
             return {
-                "status": "success",
-                "message": f"Collection {KB_COLLECTION_NAME} already exists.",
+                "status": "error",
+                "message": (
+                    f"Collection {KB_COLLECTION_NAME} stores {vector_size}-d vectors "
+                    f"but the {settings.EMBEDDING_BACKEND} embedding backend produces "
+                    f"{get_embedding_backend().dimension}-d vectors. Use a different "
+                    "QDRANT_COLLECTION_NAME or re-create the collection."
+                ),
             }
+
+        await _ensure_payload_indexes(
+            KB_COLLECTION_NAME, KB_PAYLOAD_INDEXES, collection_info
+        )
+
+        if KB_MANIFEST_COLLECTION_NAME not in collection_names:
+            await create_qdrant_payload_collection(KB_MANIFEST_COLLECTION_NAME)
+            await _ensure_payload_indexes(
+                KB_MANIFEST_COLLECTION_NAME, {"file_name": "keyword"}
+            )
+            # Files uploaded before the manifest existed only live as chunks.
+            await rebuild_knowledge_base_manifest()
+
+        return {"status": "success", "message": message}
     except Exception as e:
         return {"status": "error", "message": f"Error creating collection: {str(e)}"}
 
 
-def embed_text(text: str):
+def _manifest_point_id(file_name: str) -> str:
+    """
+    Deterministic manifest point ID for a file, so re-uploads overwrite it.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, file_name))
+
+
+async def _upsert_manifest_entry(
+    file_name: str, total_chunks: int, source_url: str, uploaded_at: str
+):
+    """
+    Record a file in the knowledge base manifest.
     """
-    Embed a text string using Azure OpenAI.
+    await upsert_qdrant_payload(
+        collection_name=KB_MANIFEST_COLLECTION_NAME,
+        point_id=_manifest_point_id(file_name),
+        payload={
+            "file_name": file_name,
+            "total_chunks": total_chunks,
+            "source_url": source_url,
+            "uploaded_at": uploaded_at,
+        },
+    )
+
+
+async def rebuild_knowledge_base_manifest(collection_name: str = KB_COLLECTION_NAME):
+    """
+    Rebuild the per-file manifest from the chunks stored in a collection.
+    Only the small metadata fields are read, never the chunk text.
+
+    Args:
+        collection_name (str): The name of the collection to read chunks from.
+    """
+    entries = {}
+    offset = None
+    while True:
+        page = await scroll_qdrant_points(
+            collection_name=collection_name,
+            limit=KB_SCROLL_PAGE_SIZE,
+            offset=offset,
+            with_payload=["file_name", "total_chunks", "source_url", "uploaded_at"],
+        )
+        for point in page["message"]:
+            if point.payload and "file_name" in point.payload:
+                entries.setdefault(point.payload["file_name"], point.payload)
+        offset = page["next_offset"]
+        if offset is None:
+            break
+
+    for file_name, payload in entries.items():
+        await _upsert_manifest_entry(
+            file_name,
+            payload.get("total_chunks", 0),
+            payload.get("source_url", ""),
+            payload.get("uploaded_at", ""),
+        )
+
+    return {"status": "success", "message": f"Manifest rebuilt with {len(entries)} files."}
+
+
+async def embed_text(text: str):
+    """
+    Embed a text string using the configured embedding backend.
 
     Args:
         text (str): The text to embed.
     """
-    response = embeddings_client.embeddings.create(
-        input=text, model=settings.AZURE_EMBEDDING_DEPLOYMENT_NAME
+    with timed("embedding"):
+        return (await get_embedding_backend().aembed([text]))[0]
+
+
+async def embed_texts(texts: List[str]):
+    """
+    Embed many text strings in batches using the configured embedding backend.
+
+    Args:
+        texts (List[str]): The texts to embed.
+    """
+    with timed("embedding"):
+        return await get_embedding_backend().aembed(texts)
+
+
+async def embed_queries(queries: List[str]) -> List[List[float]]:
+    """
+    Embed search queries, reusing cached embeddings of repeated queries.
+    The queries not cached yet are embedded together.
+
+    Args:
+        queries (List[str]): The queries to embed.
+    Returns:
+        List[List[float]]: One vector per query.
+    """
+    model = (
+        settings.LOCAL_EMBEDDING_MODEL
+        if settings.EMBEDDING_BACKEND == "local"
+        else settings.AZURE_EMBEDDING_DEPLOYMENT_NAME
     )
-    return response.data[0].embedding
+    keys = [(model, query) for query in queries]
+    vectors = [await query_embedding_cache.aget(key) for key in keys]
+    missing = [index for index, vector in enumerate(vectors) if vector is None]
+    query_embedding_cache.hits += len(queries) - len(missing)
+    query_embedding_cache.misses += len(missing)
+    if missing:
+        embedded = await embed_texts([queries[index] for index in missing])
+        for index, vector in zip(missing, embedded):
+            vectors[index] = vector
+            await query_embedding_cache.aset(keys[index], vector)
+    return vectors
+
+
+@lru_cache(maxsize=1)
+def _get_recursive_text_splitter():
+    """
+    Character-based splitter used by the "recursive" chunking strategy.
+    LangChain is imported on first use.
+    """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
 
+    return RecursiveCharacterTextSplitter(chunk_size=2000, chunk_overlap=300)
 
-def chunk_text(text: str):
+
+def chunk_text(text: str, options: Optional[ChunkingOptions] = None) -> List[Chunk]:
     """
-    Chunk a text string into smaller chunks using LangChain RecursiveCharacterTextSplitter.
-    The chunk size is 2000 characters and the overlap is 300 characters.
+    Chunk a text string into smaller chunks.
+
+    The "structured" strategy splits markdown along headings, tables and
+    sentences within a token budget and records each chunk's heading path.
+    The "recursive" strategy uses LangChain RecursiveCharacterTextSplitter
+    with 2000-character chunks and a 300-character overlap.
 
     Args:
         text (str): The text to chunk.
+        options (ChunkingOptions): Per-upload overrides of the KB_CHUNK_* settings.
     """
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=2000, chunk_overlap=300)
-    return text_splitter.split_text(text)
+    options = options or ChunkingOptions()
+    strategy = options.strategy or settings.KB_CHUNKER
+
+    if strategy == "recursive":
+        return [
+            {"text": chunk, "section_path": [], "token_count": count_tokens(chunk)}
+            for chunk in _get_recursive_text_splitter().split_text(text)
+        ]
+
+    max_tokens, overlap_tokens, min_tokens = options.resolve()
+    return chunk_markdown(
+        text,
+        max_tokens=max_tokens,
+        overlap_tokens=overlap_tokens,
+        min_tokens=min_tokens,
+        pool=get_chunk_pool(),
+    )
+
+
+def _embedding_input(chunk: Chunk) -> str:
+    """
+    Text embedded for a chunk: its heading path followed by the chunk, so a
+    chunk from the middle of a section still carries what the section is about.
+    """
+    if not chunk["section_path"]:
+        return chunk["text"]
+    return " > ".join(chunk["section_path"]) + "\n\n" + chunk["text"]
 
 
-def get_knowledge_base_files(collection_name: str = KB_COLLECTION_NAME):
+async def index_chunks(file_name: str, chunks: List[Chunk], source_url: str = None):
     """
-    Get all files names from a collection in Qdrant.
+    Embed chunks of a file, upload them to the knowledge base collection and
+    record the file in the manifest. Chunks already stored for the same
+    file name are replaced.
 
     Args:
-        collection_name (str): The name of the collection to get the files from.
+        file_name (str): Name to use for the file in the collection.
+        chunks (List[Chunk]): The chunks of the file, in order.
+        source_url (str): Optional source URL to record on each chunk.
     """
-    try:
-        # Get all points from the collection
-        points = qdrant_client.scroll(
-            collection_name=collection_name,
-            limit=1000,  # Adjust as needed
-            with_payload=True,
-        )[0]
+    # Shared by every chunk from this upload
+    uploaded_at = datetime.now(timezone.utc).isoformat()
+    with_sparse = await _supports_sparse(KB_COLLECTION_NAME)
+
+    # Embed all chunks up front, in batches
+    embeddings = await embed_texts([_embedding_input(chunk) for chunk in chunks])
+
+    # A re-upload replaces the file: drop its previous chunks (only once the
+    # new ones are embedded) so each chunk_index is stored once per file
+    await delete_qdrant_documents(KB_COLLECTION_NAME, file_name)
+
+    for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+        # Create unique point ID
+        point_id = int(uuid.uuid4().hex[:16], 16)
+
+        # Create payload with file name and chunk
+        payload = {
+            "file_name": file_name,
+            "chunk": chunk["text"],
+            "chunk_index": i,
+            "total_chunks": len(chunks),
+            "section_path": chunk["section_path"],
+            "token_count": chunk["token_count"],
+            "source_url": source_url or "",
+            "uploaded_at": uploaded_at,
+        }
 
-        # Extract unique file names from payloads
-        file_names = set()
-        for point in points:
-            if point.payload and "file_name" in point.payload:
-                file_names.add(point.payload["file_name"])
+        # Insert into Qdrant
+        await insert_qdrant_points(
+            collection_name=KB_COLLECTION_NAME,
+            point_id=point_id,
+            vector=embedding,
+            payload=payload,
+            sparse_vector=(
+                bm25.encode_document(_embedding_input(chunk)) if with_sparse else None
+            ),
+            sparse_vector_name=KB_SPARSE_VECTOR_NAME,
+        )
+
+    await _upsert_manifest_entry(file_name, len(chunks), source_url or "", uploaded_at)
+
+
+async def get_knowledge_base_files(collection_name: str = KB_MANIFEST_COLLECTION_NAME):
+    """
+    Get all files names from the knowledge base manifest in Qdrant.
+
+    Args:
+        collection_name (str): The name of the manifest collection to get the files from.
+    """
+    try:
+        file_names = []
+        offset = None
+        while True:
+            page = await scroll_qdrant_points(
+                collection_name=collection_name,
+                limit=KB_SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=["file_name"],
+            )
+            file_names.extend(
+                point.payload["file_name"]
+                for point in page["message"]
+                if point.payload and "file_name" in point.payload
+            )
+            offset = page["next_offset"]
+            if offset is None:
+                break
 
-        return {"status": "success", "files": list(file_names)}
+        return {"status": "success", "files": file_names}
     except Exception as e:
         return {"status": "error", "message": f"Error getting files: {str(e)}"}
 
@@ -109,13 +423,18 @@ def extract_text_from_pdf(file_path: str) -> str:
         str: Extracted text from the PDF.
     """
     try:
-        result = markitdown_client.convert(file_path)
+        result = _get_markitdown_client().convert(file_path)
         return result.text_content
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 
-def upload_pdf_file(file_path: str, file_name: str = None, source_url: str = None):
+async def upload_pdf_file(
+    file_path: str,
+    file_name: str = None,
+    source_url: str = None,
+    chunking: Optional[ChunkingOptions] = None,
+):
     """
     Upload a PDF file to a collection in Qdrant.
     The file is converted to text and then chunked into smaller chunks.
@@ -125,49 +444,22 @@ def upload_pdf_file(file_path: str, file_name: str = None, source_url: str = Non
         file_path (str): Path to the PDF file to upload.
         file_name (str): Name to use for the file in the collection. If None, uses the original filename.
         source_url (str): Optional source URL to record on each chunk.
+        chunking (ChunkingOptions): Optional chunking overrides for this upload.
     """
     try:
         # Ensure collection exists
-        create_knowledge_base_collection_if_not_exists()
+        await create_knowledge_base_collection_if_not_exists()
 
         # Use provided file_name or extract from path
         if file_name is None:
             file_name = os.path.basename(file_path)
 
-        # Extract text from PDF
-        text = extract_text_from_pdf(file_path)
-
-        # Chunk the text
-        chunks = chunk_text(text)
-
-        # Shared by every chunk from this upload
-        uploaded_at = datetime.now(timezone.utc).isoformat()
-
-        # Embed and upload each chunk
-        for i, chunk in enumerate(chunks):
-            # Create unique point ID
-            point_id = int(uuid.uuid4().hex[:16], 16)
+        # Extract text from PDF and chunk it in a worker thread
+        text = await asyncio.to_thread(extract_text_from_pdf, file_path)
+        chunks = await asyncio.to_thread(chunk_text, text, chunking)
 
-            # Embed the chunk
-            embedding = embed_text(chunk)
-
-            # Create payload with file name and chunk
-            payload = {
-                "file_name": file_name,
-                "chunk": chunk,
-                "chunk_index": i,
-                "total_chunks": len(chunks),
-                "source_url": source_url or "",
-                "uploaded_at": uploaded_at,
-            }
-
-            # Insert into Qdrant
-            insert_qdrant_points(
-                collection_name=KB_COLLECTION_NAME,
-                point_id=point_id,
-                vector=embedding,
-                payload=payload,
-            )
+        # Embed and upload each chunk, then record the file in the manifest
+        await index_chunks(file_name, chunks, source_url)
 
         return {
             "status": "success",
@@ -177,7 +469,12 @@ def upload_pdf_file(file_path: str, file_name: str = None, source_url: str = Non
         return {"status": "error", "message": f"Error uploading PDF file: {str(e)}"}
 
 
-def upload_text_file(file_path: str, file_name: str = None, source_url: str = None):
+async def upload_text_file(
+    file_path: str,
+    file_name: str = None,
+    source_url: str = None,
+    chunking: Optional[ChunkingOptions] = None,
+):
     """
     Upload a text file to a collection in Qdrant.
     The file is converted to text and then chunked into smaller chunks.
@@ -187,10 +484,11 @@ def upload_text_file(file_path: str, file_name: str = None, source_url: str = No
         file_path (str): Path to the text file to upload.
         file_name (str): Name to use for the file in the collection. If None, uses the original filename.
         source_url (str): Optional source URL to record on each chunk.
+        chunking (ChunkingOptions): Optional chunking overrides for this upload.
     """
     try:
         # Ensure collection exists
-        create_knowledge_base_collection_if_not_exists()
+        await create_knowledge_base_collection_if_not_exists()
 
         # Use provided file_name or extract from path
         if file_name is None:
@@ -200,37 +498,11 @@ def upload_text_file(file_path: str, file_name: str = None, source_url: str = No
         with open(file_path, "r", encoding="utf-8") as file:
             text = file.read()
 
-        # Chunk the text
-        chunks = chunk_text(text)
-
-        # Shared by every chunk from this upload
-        uploaded_at = datetime.now(timezone.utc).isoformat()
-
-        # Embed and upload each chunk
-        for i, chunk in enumerate(chunks):
-            # Create unique point ID
-            point_id = int(uuid.uuid4().hex[:16], 16)
-
-            # Embed the chunk
-            embedding = embed_text(chunk)
-
-            # Create payload with file name and chunk
-            payload = {
-                "file_name": file_name,
-                "chunk": chunk,
-                "chunk_index": i,
-                "total_chunks": len(chunks),
-                "source_url": source_url or "",
-                "uploaded_at": uploaded_at,
-            }
+        # Chunk the text in a worker thread
+        chunks = await asyncio.to_thread(chunk_text, text, chunking)
 
-            # Insert into Qdrant
-            insert_qdrant_points(
-                collection_name=KB_COLLECTION_NAME,
-                point_id=point_id,
-                vector=embedding,
-                payload=payload,
-            )
+        # Embed and upload each chunk, then record the file in the manifest
+        await index_chunks(file_name, chunks, source_url)
 
         return {
             "status": "success",
@@ -240,7 +512,7 @@ def upload_text_file(file_path: str, file_name: str = None, source_url: str = No
         return {"status": "error", "message": f"Error uploading text file: {str(e)}"}
 
 
-def delete_knowledge_base_file(
+async def delete_knowledge_base_file(
     file_name: str, collection_name: str = KB_COLLECTION_NAME
 ):
     """
@@ -251,78 +523,278 @@ def delete_knowledge_base_file(
         collection_name (str): The name of the collection to delete from.
     """
     try:
-        result = delete_qdrant_documents(collection_name, file_name)
+        result = await delete_qdrant_documents(collection_name, file_name)
+        await delete_qdrant_documents(KB_MANIFEST_COLLECTION_NAME, file_name)
         return result
     except Exception as e:
         return {"status": "error", "message": f"Error deleting file: {str(e)}"}
 
 
+async def rerank_results(query: str, results: List[dict], limit: int) -> List[dict]:
+    """
+    Rescore search results with the cross-encoder and keep the best ones.
+
+    Args:
+        query (str): The search query.
+        results (List[dict]): Formatted search results with file_name,
+            section_path and chunk.
+        limit (int): The maximum number of results to keep.
+    Returns:
+        List[dict]: At most limit results scoring at least KB_RERANK_THRESHOLD,
+        best first. score is the cross-encoder logit and retrieval_score the
+        score from the vector search.
+    """
+    passages = [
+        _embedding_input({"text": result["chunk"], "section_path": result["section_path"]})
+        for result in results
+    ]
+    # Cross-encoder inference is CPU-bound, and the first call downloads and
+    # loads the model; keep both off the event loop
+    scores = await asyncio.to_thread(lambda: get_reranker().score(query, passages))
+
+    reranked = [
+        {**result, "score": score, "retrieval_score": result["score"]}
+        for result, score in zip(results, scores)
+        if settings.KB_RERANK_THRESHOLD is None or score >= settings.KB_RERANK_THRESHOLD
+    ]
+    reranked.sort(key=lambda result: result["score"], reverse=True)
+    return reranked[:limit]
+
+
+async def _search_similar_chunks(
+    collection_name: str,
+    queries: List[str],
+    limit: int,
+    hybrid: Optional[bool],
+    rerank: Optional[bool],
+) -> List[List[dict]]:
+    """
+    Search the knowledge base for many queries with one embedding call and
+    one Qdrant batch query. Returns one list of formatted results per query.
+    """
+    if hybrid is None:
+        hybrid = settings.KB_HYBRID_SEARCH
+    hybrid = hybrid and await _supports_sparse(collection_name)
+    if rerank is None:
+        rerank = settings.KB_RERANK
+    search_limit = max(limit, settings.KB_RERANK_CANDIDATES) if rerank else limit
+
+    # Embed all queries not cached yet together
+    query_embeddings = await embed_queries(queries)
+
+    # Search for similar chunks
+    result = await search_qdrant_points_batch(
+        collection_name=collection_name,
+        vectors=query_embeddings,
+        limit=search_limit,
+        sparse_vectors=(
+            [bm25.encode_query(query) for query in queries] if hybrid else None
+        ),
+        sparse_vector_name=KB_SPARSE_VECTOR_NAME,
+        prefetch_limit=search_limit * KB_HYBRID_PREFETCH_FACTOR,
+        hnsw_ef=settings.KB_SEARCH_HNSW_EF,
+        score_threshold=settings.KB_SEARCH_SCORE_THRESHOLD,
+        oversampling=(
+            settings.KB_QUANTIZATION_OVERSAMPLING if settings.KB_QUANTIZATION else None
+        ),
+    )
+
+    # Format the results
+    formatted_results = [
+        [
+            {
+                "score": point.score,
+                "file_name": point.payload.get("file_name", ""),
+                "chunk_index": point.payload.get("chunk_index", 0),
+                "section_path": point.payload.get("section_path", []),
+                "chunk": point.payload.get("chunk", ""),
+            }
+            for point in points
+        ]
+        for points in result["message"]
+    ]
+
+    if rerank:
+        formatted_results = await asyncio.gather(
+            *(
+                rerank_results(query, results, limit)
+                for query, results in zip(queries, formatted_results)
+            )
+        )
+    return list(formatted_results)
+
+
 @observe(name="GET_SIMILAR_CHUNKS")
-def get_similar_chunks(
-    collection_name: str = KB_COLLECTION_NAME, query: str = "", limit: int = 10
+async def get_similar_chunks(
+    collection_name: str = KB_COLLECTION_NAME,
+    query: str = "",
+    limit: int = 10,
+    hybrid: Optional[bool] = None,
+    rerank: Optional[bool] = None,
 ):
     """
     Get similar chunks from a collection in Qdrant.
 
+    With hybrid search, dense cosine results are fused with BM25 results so
+    exact terms (solver names, "FRAP", model IDs) are not lost. Scores are
+    then RRF scores rather than cosine similarities.
+
+    With reranking, KB_RERANK_CANDIDATES results are fetched and rescored by
+    the cross-encoder, and only the best limit results above
+    KB_RERANK_THRESHOLD are returned, so there may be fewer than limit.
+
     Args:
         collection_name (str): The name of the collection to get the similar chunks from.
         query (str): The query to get the similar chunks from.
         limit (int): The number of similar chunks to return.
+        hybrid (bool): Whether to use hybrid search. Defaults to the
+            KB_HYBRID_SEARCH setting; ignored for dense-only collections.
+        rerank (bool): Whether to rerank with the cross-encoder. Defaults
+            to the KB_RERANK setting.
     """
     try:
-        # Embed the query
-        query_embedding = embed_text(query)
-
-        # Search for similar chunks
-        result = search_qdrant_points(
-            collection_name=collection_name, vector=query_embedding, limit=limit
+        results = await _search_similar_chunks(
+            collection_name, [query], limit, hybrid, rerank
         )
+        return {"status": "success", "results": results[0]}
+    except Exception as e:
+        return {"status": "error", "message": f"Error getting similar chunks: {str(e)}"}
 
-        # Format the results
-        formatted_results = []
-        for point in result["message"]:
-            formatted_results.append(
-                {
-                    "score": point.score,
-                    "file_name": point.payload.get("file_name", ""),
-                    "chunk": point.payload.get("chunk", ""),
-                }
-            )
 
-        return {"status": "success", "results": formatted_results}
+@observe(name="GET_SIMILAR_CHUNKS_BATCH")
+async def get_similar_chunks_batch(
+    collection_name: str = KB_COLLECTION_NAME,
+    queries: Optional[List[str]] = None,
+    limit: int = 10,
+    hybrid: Optional[bool] = None,
+    rerank: Optional[bool] = None,
+):
+    """
+    Get similar chunks for many queries at once, e.g. rewritten queries or
+    sub-questions of one user question. All queries are embedded in one
+    request and searched in one Qdrant round trip.
+
+    Args:
+        collection_name (str): The name of the collection to get the similar chunks from.
+        queries (List[str]): The queries to get the similar chunks for.
+        limit (int): The number of similar chunks to return per query.
+        hybrid (bool): Whether to use hybrid search, as in get_similar_chunks.
+        rerank (bool): Whether to rerank with the cross-encoder, as in get_similar_chunks.
+    """
+    try:
+        if not queries:
+            return {"status": "success", "results": []}
+
+        results = await _search_similar_chunks(
+            collection_name, queries, limit, hybrid, rerank
+        )
+        return {
+            "status": "success",
+            "results": [
+                {"query": query, "results": query_results}
+                for query, query_results in zip(queries, results)
+            ],
+        }
     except Exception as e:
         return {"status": "error", "message": f"Error getting similar chunks: {str(e)}"}
 
 
-def get_file_chunks(file_name: str, collection_name: str = KB_COLLECTION_NAME):
+async def get_knowledge_base_context(
+    query: str, limit: int = 5, max_tokens: Optional[int] = None
+):
+    """
+    Retrieve knowledge base context for the LLM: the top limit chunks for a
+    query, with consecutive chunks of the same file merged (dropping their
+    repeated overlap) and packed best first into a token budget.
+
+    Args:
+        query (str): The query to retrieve context for.
+        limit (int): The number of chunks to retrieve before merging.
+        max_tokens (int): Token budget for the returned passages. Defaults
+            to the KB_CONTEXT_MAX_TOKENS setting.
+    """
+    result = await get_similar_chunks(query=query, limit=limit)
+    if result["status"] != "success":
+        return result
+    return build_knowledge_base_context(result["results"], limit, max_tokens)
+
+
+def build_knowledge_base_context(
+    results: List[dict], limit: int, max_tokens: Optional[int] = None
+):
+    """
+    Pack the top limit of already retrieved search results into knowledge
+    base context, as get_knowledge_base_context does. Lets results fetched
+    ahead of time with a larger limit serve a smaller request.
+
+    Args:
+        results (List[dict]): Search results from get_similar_chunks, best first.
+        limit (int): The number of results to use.
+        max_tokens (int): Token budget for the returned passages. Defaults
+            to the KB_CONTEXT_MAX_TOKENS setting.
+    """
+    passages = pack_context(
+        results[:limit], max_tokens or settings.KB_CONTEXT_MAX_TOKENS
+    )
+    return {"status": "success", "results": passages}
+
+
+async def get_file_chunks(
+    file_name: str,
+    collection_name: str = KB_COLLECTION_NAME,
+    offset: int = 0,
+    limit: Optional[int] = None,
+):
     """
-    Get all chunks for a specific file from the knowledge base.
+    Get the chunks of a specific file from the knowledge base, ordered by
+    chunk index. Uses the file_name and chunk_index payload indexes, so only
+    the requested file's chunks are read.
 
     Args:
         file_name (str): The name of the file to get chunks for.
         collection_name (str): The name of the collection to search in.
+        offset (int): The first chunk index to return.
+        limit (int): The maximum number of chunks to return. If None, all
+            chunks from offset onwards are returned.
     """
     try:
-        # Get all points from the collection
-        points = qdrant_client.scroll(
-            collection_name=collection_name, limit=1000, with_payload=True
-        )[0]
-
-        # Filter points for the specific file
         file_chunks = []
-        for point in points:
-            if point.payload and point.payload.get("file_name") == file_name:
+        start_from = offset
+        while True:
+            page_size = KB_SCROLL_PAGE_SIZE
+            if limit is not None:
+                page_size = min(page_size, limit - len(file_chunks))
+
+            page = await scroll_qdrant_points(
+                collection_name=collection_name,
+                file_name=file_name,
+                limit=page_size,
+                order_by="chunk_index",
+                start_from=start_from,
+                with_payload=["chunk_index", "chunk", "total_chunks", "section_path"],
+            )
+            points = page["message"]
+            for point in points:
                 file_chunks.append(
                     {
                         "chunk_index": point.payload.get("chunk_index", 0),
                         "chunk": point.payload.get("chunk", ""),
                         "total_chunks": point.payload.get("total_chunks", 0),
+                        "section_path": point.payload.get("section_path", []),
                     }
                 )
 
-        # Sort by chunk index
-        file_chunks.sort(key=lambda x: x["chunk_index"])
-
-        return {"status": "success", "chunks": file_chunks}
+            # A short page means the file has no chunks left
+            if len(points) < page_size:
+                next_offset = None
+                break
+            # index_chunks replaces a file's chunks on re-upload, so chunk
+            # indexes are unique within a file and none are skipped here
+            start_from = file_chunks[-1]["chunk_index"] + 1
+            if limit is not None and len(file_chunks) >= limit:
+                next_offset = start_from
+                break
+
+        return {"status": "success", "chunks": file_chunks, "next_offset": next_offset}
     except Exception as e:
         return {"status": "error", "message": f"Error getting file chunks: {str(e)}"}
@@ -1,8 +1,8 @@
 import httpx
-from supabase import Client
 
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.supabase import run_supabase
 
 logger = get_logger("litellm_service")
 
@@ -36,7 +36,7 @@ async def provision_user(auth0_sub: str, email: str) -> str:
     return data["key"]
 
 
-async def get_or_create_virtual_key(auth0_sub: str, email: str, supabase: Client) -> str:
+async def get_or_create_virtual_key(auth0_sub: str, email: str) -> str:
     """
     Return the user's existing LiteLLM virtual key, provisioning a new one if
     none is stored in Supabase yet.
@@ -44,17 +44,17 @@ async def get_or_create_virtual_key(auth0_sub: str, email: str, supabase: Client
     Args:
         auth0_sub (str): The Auth0 subject claim, used as LiteLLM's user_id.
         email (str): The user's email, passed to provision_user on first login.
-        supabase (Client): Supabase client used to look up / persist the virtual key.
 
     Returns:
         str: The user's LiteLLM virtual key.
     """
-    response = (
-        supabase.table("users")
+    response = await run_supabase(
+        "virtual_key",
+        lambda supabase: supabase.table("users")
         .select("litellm_virtual_key")
         .eq("auth0_sub", auth0_sub)
         .limit(1)
-        .execute()
+        .execute(),
     )
     existing_key = response.data[0].get("litellm_virtual_key") if response.data else None
     if existing_key:
@@ -62,10 +62,15 @@ async def get_or_create_virtual_key(auth0_sub: str, email: str, supabase: Client
 
     virtual_key = await provision_user(auth0_sub, email)
 
-    supabase.table("users").upsert(
-        {"auth0_sub": auth0_sub, "litellm_virtual_key": virtual_key},
-        on_conflict="auth0_sub",
-    ).execute()
+    await run_supabase(
+        "save_virtual_key",
+        lambda supabase: supabase.table("users")
+        .upsert(
+            {"auth0_sub": auth0_sub, "litellm_virtual_key": virtual_key},
+            on_conflict="auth0_sub",
+        )
+        .execute(),
+    )
 
     return virtual_key
 
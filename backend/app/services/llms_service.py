@@ -6,18 +6,28 @@ from app.utils.tools_utils import (
 from app.services.vcelldb_service import (
     fetch_biomodels,
     get_vcml_file,
-    get_diagram_image,
+)
+from app.services.diagram_service import get_diagram_image_variant
+
+from app.services.knowledge_base_service import (
+    get_similar_chunks,
+    build_knowledge_base_context,
 )
 
 from app.utils.system_prompt import SYSTEM_PROMPT
 from app.utils.faq_registry import FAQ_REGISTRY
+from app.utils import bm25
 
 from app.schemas.vcelldb_schema import BiomodelRequestParams
 from app.core.litellm import get_litellm_client
 from app.core.config import settings
+import asyncio
 import base64
 import json
-from app.core.logger import get_logger
+import logging
+from app.core.logger import get_logger, log_payload
+from app.core.metrics import KB_PREFETCH, record_llm_usage, track_llm
+from app.core.timing import timed
 
 logger = get_logger("llm_service")
 
@@ -43,24 +53,81 @@ def _is_budget_error(error: Exception) -> bool:
     )
 
 
-async def _create_chat_completion(virtual_key: str, model: str, **kwargs):
+async def _create_chat_completion(
+    virtual_key: str, model: str, step: str = "completion", **kwargs
+):
     """
     Call the requested model; on a budget-exceeded error, silently retry
-    against local-model using the master key.
+    against local-model using the master key. The call is reported in the
+    Server-Timing header as llm.<step>.
     """
+    with timed(f"llm.{step}"):
+        try:
+            return await _timed_chat_completion(virtual_key, model, **kwargs)
+        except Exception as error:
+            if model != LOCAL_MODEL and _is_budget_error(error):
+                logger.info(
+                    f"Budget limit reached for {model}; falling back to {LOCAL_MODEL}"
+                )
+                return await _timed_chat_completion(virtual_key, LOCAL_MODEL, **kwargs)
+            raise
+
+
+async def _timed_chat_completion(virtual_key: str, model: str, **kwargs):
     client = get_litellm_client(_key_for_model(virtual_key, model))
-    try:
-        return await client.chat.completions.create(model=model, **kwargs)
-    except Exception as error:
-        if model != LOCAL_MODEL and _is_budget_error(error):
-            logger.info(
-                f"Budget limit reached for {model}; falling back to {LOCAL_MODEL}"
-            )
-            local_client = get_litellm_client(_key_for_model(virtual_key, LOCAL_MODEL))
-            return await local_client.chat.completions.create(
-                model=LOCAL_MODEL, **kwargs
-            )
-        raise
+    with track_llm(model):
+        response = await client.chat.completions.create(model=model, **kwargs)
+    record_llm_usage(model, getattr(response, "usage", None))
+    return response
+
+
+KB_TOOL_NAME = "search_vcell_knowledge_base"
+
+
+def _start_kb_prefetch(user_prompt: str):
+    """
+    Start searching the knowledge base for the user's message in the
+    background, so the search overlaps the tool-selection completion.
+    Returns None when prefetching is disabled.
+    """
+    if not settings.KB_PREFETCH or not isinstance(user_prompt, str):
+        return None
+    return asyncio.create_task(
+        get_similar_chunks(query=user_prompt, limit=settings.KB_PREFETCH_LIMIT)
+    )
+
+
+def _queries_overlap(first: str, second: str) -> float:
+    """
+    Jaccard overlap of the BM25 terms of two queries.
+    """
+    first_terms, second_terms = set(bm25.tokenize(first)), set(bm25.tokenize(second))
+    if not first_terms or not second_terms:
+        return 0.0
+    return len(first_terms & second_terms) / len(first_terms | second_terms)
+
+
+async def _prefetched_kb_result(prefetch, user_prompt: str, args: dict):
+    """
+    The knowledge base tool result for args built from the prefetched
+    search, or None if the model's query differs too much from the user's
+    message, asks for more results than were prefetched, or the prefetch failed.
+    """
+    query = args.get("query", "")
+    limit = args.get("limit", 5)
+    overlap = _queries_overlap(user_prompt, query)
+    if overlap < settings.KB_PREFETCH_MIN_OVERLAP or limit > settings.KB_PREFETCH_LIMIT:
+        logger.info(f"KB prefetch miss (overlap {overlap:.2f}) for query {query}")
+        KB_PREFETCH.labels("miss").inc()
+        return None
+
+    prefetched = await prefetch
+    if prefetched["status"] != "success":
+        KB_PREFETCH.labels("failed").inc()
+        return None
+    KB_PREFETCH.labels("hit").inc()
+    logger.info(f"KB prefetch hit (overlap {overlap:.2f}) for query {query}")
+    return build_knowledge_base_context(prefetched["results"], limit)
 
 
 async def get_llm_response(
@@ -110,62 +177,84 @@ async def get_response_with_tools(
 
     user_prompt = conversation_history[-1]["content"]
 
-    logger.info(f"User prompt: {user_prompt}")
+    log_payload(logger, "User prompt", user_prompt, logging.INFO)
 
-    response = await _create_chat_completion(
-        virtual_key,
-        model,
-        messages=messages,
-        tools=tools,
-        tool_choice="auto",
-    )
+    prefetch = _start_kb_prefetch(user_prompt)
+    try:
+        response = await _create_chat_completion(
+            virtual_key,
+            model,
+            step="tools",
+            messages=messages,
+            tools=tools,
+            tool_choice="auto",
+        )
 
-    # Handle the tool calls
-    response_message = response.choices[0].message
-    tool_calls = response_message.tool_calls
+        # Handle the tool calls
+        response_message = response.choices[0].message
+        tool_calls = response_message.tool_calls
 
-    messages.append(response_message.model_dump(exclude_none=True))
+        messages.append(response_message.model_dump(exclude_none=True))
 
-    bmkeys = []
+        bmkeys = []
 
-    if not tool_calls:
-        final_response = response_message.content or ""
-        logger.info(f"LLM Response: {final_response}")
-        return final_response, bmkeys, response.model
+        if prefetch is not None and not any(
+            tool_call.function.name == KB_TOOL_NAME for tool_call in tool_calls or []
+        ):
+            prefetch.cancel()
+            prefetch = None
 
-    for tool_call in tool_calls:
-        # Extract the function name and arguments
-        name = tool_call.function.name
-        args = json.loads(tool_call.function.arguments)
+        if not tool_calls:
+            final_response = response_message.content or ""
+            log_payload(logger, "LLM Response", final_response, logging.INFO)
+            return final_response, bmkeys, response.model
 
-        logger.info(f"Tool Call: {name} with args: {args}")
+        for tool_call in tool_calls:
+            # Extract the function name and arguments
+            name = tool_call.function.name
+            args = json.loads(tool_call.function.arguments)
 
-        # Execute the tool function
-        result = await execute_tool(name, args, auth0_token)
+            logger.info(f"Tool Call: {name} with args: {args}")
 
-        logger.info(f"Tool Result: {str(result)[:500]}")
+            # Reuse the speculative knowledge base search when it matches
+            result = None
+            if name == KB_TOOL_NAME and prefetch is not None:
+                result = await _prefetched_kb_result(prefetch, user_prompt, args)
 
-        # Extract bmkeys only if result is a dictionary and contains the expected key
-        if isinstance(result, dict):
-            bmkeys = result.get("unique_model_keys (bmkey)", [])
+            # Execute the tool function
+            if result is None:
+                result = await execute_tool(name, args, auth0_token)
 
-        # Send the result back to the model
-        messages.append(
-            {"role": "tool", "tool_call_id": tool_call.id, "content": str(result)}
-        )
+            log_payload(logger, "Tool Result", result)
+
+            # Extract bmkeys only if result is a dictionary and contains the expected key
+            if isinstance(result, dict):
+                bmkeys = result.get("unique_model_keys (bmkey)", [])
+
+            # Send the result back to the model
+            messages.append(
+                {"role": "tool", "tool_call_id": tool_call.id, "content": str(result)}
+            )
+    finally:
+        # Nothing reads the prefetch once the tools have run (or failed), so
+        # stop an unused search, e.g. after a miss, instead of leaving it
+        # running unawaited. Cancelling a finished task does nothing.
+        if prefetch is not None:
+            prefetch.cancel()
 
-    logger.info(str(messages))
+    log_payload(logger, "Messages", messages)
 
     # Send back the final response incorporating the tool result
     completion = await _create_chat_completion(
         virtual_key,
         model,
+        step="answer",
         messages=messages,
     )
 
     final_response = completion.choices[0].message.content
 
-    logger.info(f"LLM Response: {final_response}")
+    log_payload(logger, "LLM Response", final_response, logging.INFO)
 
     return final_response, bmkeys, completion.model
 
@@ -197,7 +286,7 @@ async def get_faq_response(
     # execute_tool may mutate the args dict it's given (e.g. fetch_biomodels forces maxRows); pass a copy so FAQ_REGISTRY's entries stay untouched.
     result = await execute_tool(faq["tool"], dict(faq["args"]))
 
-    logger.info(f"FAQ tool result: {str(result)[:500]}")
+    log_payload(logger, "FAQ tool result", result)
 
     bmkeys = []
     if isinstance(result, dict):
@@ -208,6 +297,7 @@ async def get_faq_response(
     response = await _create_chat_completion(
         virtual_key,
         model,
+        step="answer",
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt},
@@ -216,7 +306,7 @@ async def get_faq_response(
 
     final_response = response.choices[0].message.content
 
-    logger.info(f"FAQ LLM Response: {final_response}")
+    log_payload(logger, "FAQ LLM Response", final_response, logging.INFO)
 
     return final_response, bmkeys, response.model
 
@@ -331,9 +421,10 @@ async def analyse_diagram(
         # Fetch the diagram image ourselves and inline it as base64: the
         # LLM provider fetches image_url URLs from its own infrastructure,
         # with no way for it to send our Authorization header, so a plain
-        # VCell URL can never work for a private/shared biomodel.
-        image_bytes = await get_diagram_image(biomodel_id, auth0_token)
-        image_data_uri = f"data:image/png;base64,{base64.b64encode(image_bytes).decode('utf-8')}"
+        # VCell URL can never work for a private/shared biomodel. The
+        # reduced "llm" variant costs fewer image tokens than the original.
+        image = await get_diagram_image_variant(biomodel_id, "llm", auth0_token)
+        image_data_uri = f"data:{image['media_type']};base64,{base64.b64encode(image['content']).decode('utf-8')}"
         # Diagram Analysis
         diagram_analysis_prompt = (
             "You are a VCell BioModel Assistant, designed to help users understand and interact with biological models in VCell. "
@@ -347,6 +438,7 @@ async def analyse_diagram(
         response = await _create_chat_completion(
             virtual_key,
             model,
+            step="vision",
             messages=[
                 {
                     "role": "user",
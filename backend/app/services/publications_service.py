@@ -0,0 +1,228 @@
+import asyncio
+import re
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.vcelldb_service import fetch_publications
+from app.utils import bm25
+
+logger = get_logger("publications_service")
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _words(text) -> Set[str]:
+    return set(_WORD_PATTERN.findall(str(text or "").lower()))
+
+
+def _terms(text) -> Set[str]:
+    # Free-text terms: indexed and queried with the same tokenizer
+    return set(bm25.tokenize(str(text or "")))
+
+
+def _biomodel_keys(publication: dict) -> Set[str]:
+    return {
+        str(reference["bmKey"])
+        for reference in publication.get("biomodelReferences") or []
+        if isinstance(reference, dict) and reference.get("bmKey")
+    }
+
+
+def _year(publication: dict) -> Optional[int]:
+    try:
+        return int(publication.get("year"))
+    except (TypeError, ValueError):
+        return None
+
+
+class PublicationCatalog:
+    """
+    In-memory copy of the VCell publications list, refreshed in the
+    background every PUBLICATIONS_REFRESH_SECONDS, with inverted indexes on
+    author names, title and citation words, year and linked biomodel keys so
+    tool calls can return just the matching publications.
+    """
+
+    def __init__(self):
+        self.publications: List[dict] = []
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._by_author: Dict[str, Set[int]] = defaultdict(set)
+        self._by_text: Dict[str, Set[int]] = defaultdict(set)
+        self._by_year: Dict[int, Set[int]] = defaultdict(set)
+        self._by_biomodel_key: Dict[str, Set[int]] = defaultdict(set)
+
+    def _index(self, publications: List[dict]):
+        by_author, by_text = defaultdict(set), defaultdict(set)
+        by_year, by_biomodel_key = defaultdict(set), defaultdict(set)
+        for i, publication in enumerate(publications):
+            for word in _words(publication.get("authors")):
+                by_author[word].add(i)
+            for field in ("title", "authors", "citation"):
+                for term in _terms(publication.get(field)):
+                    by_text[term].add(i)
+            year = _year(publication)
+            if year is not None:
+                by_year[year].add(i)
+            for key in _biomodel_keys(publication):
+                by_biomodel_key[key].add(i)
+
+        # Swap everything at once so readers never see a half-built index
+        self.publications = publications
+        self._by_author, self._by_text = by_author, by_text
+        self._by_year, self._by_biomodel_key = by_year, by_biomodel_key
+        self.loaded_at = time.monotonic()
+
+    async def refresh(self, only_if_stale: bool = False):
+        """
+        Reload the catalog from the VCell API. Refreshes never overlap; on
+        failure the previous catalog is kept.
+
+        Args:
+            only_if_stale (bool): Skip the reload if another caller refreshed
+                the catalog while this one waited.
+        """
+        async with self._lock:
+            if only_if_stale and not self._is_stale():
+                return
+            publications = await fetch_publications()
+            self._index([p for p in publications if isinstance(p, dict)])
+            logger.info(f"Publication catalog refreshed: {len(self.publications)} publications")
+
+    def _is_stale(self) -> bool:
+        return (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > 2 * settings.PUBLICATIONS_REFRESH_SECONDS
+        )
+
+    async def ensure_loaded(self):
+        """
+        Load the catalog if it is empty, or reload it if the background
+        refresh has not run for two intervals.
+        """
+        if not self._is_stale():
+            return
+        try:
+            await self.refresh(only_if_stale=True)
+        except Exception:
+            if not self.publications:
+                raise
+            logger.exception("Publication catalog refresh failed; serving the previous copy")
+
+    async def _refresh_periodically(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Periodic publication catalog refresh failed")
+            await asyncio.sleep(settings.PUBLICATIONS_REFRESH_SECONDS)
+
+    def start_refresh(self):
+        """
+        Start refreshing the catalog in the background. Safe to call twice.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    def stop_refresh(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def search(
+        self,
+        query: str = "",
+        author: str = "",
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        biomodel_key: str = "",
+        limit: Optional[int] = None,
+    ) -> dict:
+        """
+        Filter the catalog. Filters combine with AND; the free-text query
+        ranks the remaining publications by how many of its terms appear in
+        their title, authors or citation, and drops those matching none.
+        Stopwords are ignored, so a query made only of them matches nothing.
+
+        Args:
+            query (str): Free-text terms to look for.
+            author (str): Author name(s); every word must match an author.
+            year_from (int): Earliest publication year.
+            year_to (int): Latest publication year.
+            biomodel_key (str): Only publications linked to this biomodel key.
+            limit (int): Maximum number of publications to return; None for all.
+        Returns:
+            dict: total_matches and the matching publications, newest first
+            within equal query relevance.
+        """
+        candidates = set(range(len(self.publications)))
+
+        for word in _words(author):
+            candidates &= self._by_author.get(word, set())
+        if biomodel_key:
+            candidates &= self._by_biomodel_key.get(str(biomodel_key).strip(), set())
+        if year_from is not None or year_to is not None:
+            low = year_from if year_from is not None else float("-inf")
+            high = year_to if year_to is not None else float("inf")
+            candidates &= {
+                i for year, ids in self._by_year.items() if low <= year <= high for i in ids
+            }
+
+        scores = {i: 0 for i in candidates}
+        if query and query.strip():
+            # A query of stopwords alone matches nothing rather than everything
+            for term in _terms(query):
+                for i in self._by_text.get(term, set()) & candidates:
+                    scores[i] += 1
+            scores = {i: score for i, score in scores.items() if score > 0}
+
+        ranked = sorted(
+            scores,
+            key=lambda i: (scores[i], _year(self.publications[i]) or 0),
+            reverse=True,
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return {
+            "total_matches": len(scores),
+            "publications": [self.publications[i] for i in ranked],
+        }
+
+
+publication_catalog = PublicationCatalog()
+
+
+async def search_publications(
+    query: str = "",
+    author: str = "",
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    biomodel_key: str = "",
+    limit: Optional[int] = None,
+) -> dict:
+    """
+    Search the cached VCell publications catalog, loading it on first use.
+
+    Args:
+        query (str): Free-text terms matched against title, authors and citation.
+        author (str): Author name(s) to filter by.
+        year_from (int): Earliest publication year.
+        year_to (int): Latest publication year.
+        biomodel_key (str): Only publications linked to this biomodel key.
+        limit (int): Maximum number of publications to return; None for all.
+    Returns:
+        dict: total_matches and the matching publications.
+    """
+    await publication_catalog.ensure_loaded()
+    return publication_catalog.search(
+        query=query,
+        author=author,
+        year_from=year_from,
+        year_to=year_to,
+        biomodel_key=biomodel_key,
+        limit=limit,
+    )
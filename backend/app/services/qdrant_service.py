@@ -1,18 +1,22 @@
-from qdrant_client.models import (
-    Distance,
-    VectorParams,
-    PointStruct,
-    FilterSelector,
-    Filter,
-    FieldCondition,
-    MatchValue,
-)
-from app.core.singleton import get_qdrant_client
+from typing import List, Optional, Tuple
+from app.core.singleton import get_async_qdrant_client
+from app.core.metrics import timed_upstream
+from app.utils.lazy import lazy_import
 
-client = get_qdrant_client()
+# qdrant_client takes about a second to import; defer it to the first call
+models = lazy_import("qdrant_client.models")
 
 
-def create_qdrant_collection(collection_name: str, vector_size: int, distance: str):
+async def create_qdrant_collection(
+    collection_name: str,
+    vector_size: int,
+    distance: str,
+    sparse_vector_name: Optional[str] = None,
+    quantization: Optional[str] = None,
+    on_disk: bool = False,
+    hnsw_m: Optional[int] = None,
+    hnsw_ef_construct: Optional[int] = None,
+):
     """
     Create a new collection in Qdrant.
 
@@ -20,23 +24,103 @@ def create_qdrant_collection(collection_name: str, vector_size: int, distance: s
         collection_name (str): The name of the collection to create.
         vector_size (int): The size of the vector.
         distance (str): The distance metric to use. Can be "cosine" or "dot".
+        sparse_vector_name (str): If set, also store a sparse lexical vector
+            under this name. Qdrant applies IDF weighting to it at query time.
+        quantization (str): Keep a compressed copy of the vectors in RAM for
+            search. Can be "scalar" (int8, 4x smaller) or "binary" (32x
+            smaller, best with high-dimensional embeddings such as ada-002).
+        on_disk (bool): Store the original float32 vectors on disk. Pairs
+            with quantization, which then only reads them back to rescore.
+        hnsw_m (int): Edges per node in the HNSW graph. Qdrant's default is 16.
+        hnsw_ef_construct (int): Candidate list size while building the HNSW
+            graph. Qdrant's default is 100.
     """
     if distance == "cosine":
-        distance = Distance.COSINE
+        distance = models.Distance.COSINE
     elif distance == "dot":
-        distance = Distance.DOT
-    client.create_collection(
+        distance = models.Distance.DOT
+
+    quantization_config = None
+    if quantization == "scalar":
+        quantization_config = models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+            )
+        )
+    elif quantization == "binary":
+        quantization_config = models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        )
+
+    hnsw_config = None
+    if hnsw_m is not None or hnsw_ef_construct is not None:
+        hnsw_config = models.HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct)
+
+    sparse_vectors_config = None
+    if sparse_vector_name:
+        sparse_vectors_config = {
+            sparse_vector_name: models.SparseVectorParams(modifier=models.Modifier.IDF)
+        }
+    await get_async_qdrant_client().create_collection(
         collection_name=collection_name,
-        vectors_config=VectorParams(size=vector_size, distance=distance),
+        vectors_config=models.VectorParams(
+            size=vector_size, distance=distance, on_disk=on_disk
+        ),
+        sparse_vectors_config=sparse_vectors_config,
+        quantization_config=quantization_config,
+        hnsw_config=hnsw_config,
     )
     return {"status": "success", "message": collection_name + " created successfully."}
 
 
-def insert_qdrant_points(
+async def create_qdrant_payload_collection(collection_name: str):
+    """
+    Create a new collection in Qdrant that stores payloads only, without vectors.
+
+    Args:
+        collection_name (str): The name of the collection to create.
+    """
+    await get_async_qdrant_client().create_collection(
+        collection_name=collection_name, vectors_config={}
+    )
+    return {"status": "success", "message": collection_name + " created successfully."}
+
+
+async def create_qdrant_payload_index(
+    collection_name: str, field_name: str, field_schema: str
+):
+    """
+    Create a payload index on a field of a collection in Qdrant.
+
+    Args:
+        collection_name (str): The name of the collection to index.
+        field_name (str): The payload field to index.
+        field_schema (str): The index type to use. Can be "keyword" or "integer".
+    """
+    if field_schema == "keyword":
+        field_schema = models.PayloadSchemaType.KEYWORD
+    elif field_schema == "integer":
+        field_schema = models.PayloadSchemaType.INTEGER
+    await get_async_qdrant_client().create_payload_index(
+        collection_name=collection_name,
+        field_name=field_name,
+        field_schema=field_schema,
+        wait=True,
+    )
+    return {
+        "status": "success",
+        "message": f"Index on {field_name} created in {collection_name}.",
+    }
+
+
+@timed_upstream("qdrant", "upsert")
+async def insert_qdrant_points(
     collection_name: str,
     point_id: int,
     vector: list[float],
     payload: dict,
+    sparse_vector: Optional[Tuple[List[int], List[float]]] = None,
+    sparse_vector_name: Optional[str] = None,
 ):
     """
     Insert a new point into a collection in Qdrant.
@@ -46,38 +130,258 @@ def insert_qdrant_points(
         point_id (int): The ID of the point to insert.
         vector (list[float]): The vector of the point to insert.
         payload (dict): The payload of the point to insert.
+        sparse_vector (Tuple[List[int], List[float]]): Optional sparse vector
+            (indices, values) to store alongside the dense vector.
+        sparse_vector_name (str): The name of the sparse vector in the collection.
     """
-    operation_info = client.upsert(
+    if sparse_vector is not None:
+        indices, values = sparse_vector
+        # "" is the name of the collection's default (unnamed) dense vector
+        vector = {
+            "": vector,
+            sparse_vector_name: models.SparseVector(indices=indices, values=values),
+        }
+    operation_info = await get_async_qdrant_client().upsert(
         collection_name=collection_name,
         wait=True,
         points=[
-            PointStruct(id=point_id, vector=vector, payload=payload),
+            models.PointStruct(id=point_id, vector=vector, payload=payload),
         ],
     )
     return {"status": "success", "message": operation_info}
 
 
-def search_qdrant_points(
+@timed_upstream("qdrant", "upsert_payload")
+async def upsert_qdrant_payload(collection_name: str, point_id: str, payload: dict):
+    """
+    Insert or replace a vectorless point in a payload-only collection in Qdrant.
+
+    Args:
+        collection_name (str): The name of the collection to upsert the point into.
+        point_id (str): The ID of the point to upsert.
+        payload (dict): The payload of the point to upsert.
+    """
+    operation_info = await get_async_qdrant_client().upsert(
+        collection_name=collection_name,
+        wait=True,
+        points=[models.PointStruct(id=point_id, vector={}, payload=payload)],
+    )
+    return {"status": "success", "message": operation_info}
+
+
+@timed_upstream("qdrant", "scroll")
+async def scroll_qdrant_points(
     collection_name: str,
+    file_name: Optional[str] = None,
+    limit: int = 100,
+    offset=None,
+    order_by: Optional[str] = None,
+    start_from: Optional[int] = None,
+    with_payload=True,
+):
+    """
+    Page through points in a collection in Qdrant.
+
+    Args:
+        collection_name (str): The name of the collection to scroll.
+        file_name (str): Only return points whose "file_name" payload matches.
+        limit (int): The maximum number of points to return.
+        offset: The point ID to resume from, as returned in "next_offset".
+            Ignored when order_by is set.
+        order_by (str): An indexed payload field to sort the points by.
+        start_from (int): The lowest order_by value to return.
+        with_payload: True, or a list of payload fields to return.
+    """
+    scroll_filter = None
+    if file_name is not None:
+        scroll_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="file_name", match=models.MatchValue(value=file_name)
+                )
+            ]
+        )
+
+    points, next_offset = await get_async_qdrant_client().scroll(
+        collection_name=collection_name,
+        scroll_filter=scroll_filter,
+        limit=limit,
+        offset=None if order_by else offset,
+        order_by=(
+            models.OrderBy(key=order_by, start_from=start_from) if order_by else None
+        ),
+        with_payload=with_payload,
+        with_vectors=False,
+    )
+
+    return {"status": "success", "message": points, "next_offset": next_offset}
+
+
+def _search_request(
     vector: list[float],
+    limit: int,
+    sparse_vector: Optional[Tuple[List[int], List[float]]],
+    sparse_vector_name: Optional[str],
+    prefetch_limit: Optional[int],
+    search_params: Optional["models.SearchParams"],
+    score_threshold: Optional[float],
+) -> "models.QueryRequest":
+    """
+    Build the query for one search vector: a plain dense search, or dense and
+    sparse prefetches fused with RRF when a sparse vector is given.
+    """
+    if sparse_vector is None:
+        return models.QueryRequest(
+            query=vector,
+            limit=limit,
+            params=search_params,
+            score_threshold=score_threshold,
+            with_payload=True,
+        )
+
+    indices, values = sparse_vector
+    prefetch_limit = prefetch_limit or limit
+    return models.QueryRequest(
+        prefetch=[
+            models.Prefetch(
+                query=vector,
+                limit=prefetch_limit,
+                params=search_params,
+                score_threshold=score_threshold,
+            ),
+            models.Prefetch(
+                query=models.SparseVector(indices=indices, values=values),
+                using=sparse_vector_name,
+                limit=prefetch_limit,
+            ),
+        ],
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        limit=limit,
+        with_payload=True,
+    )
+
+
+@timed_upstream("qdrant", "query_batch_points")
+async def search_qdrant_points_batch(
+    collection_name: str,
+    vectors: List[list[float]],
     limit: int = 10,
+    sparse_vectors: Optional[List[Tuple[List[int], List[float]]]] = None,
+    sparse_vector_name: Optional[str] = None,
+    prefetch_limit: Optional[int] = None,
+    hnsw_ef: Optional[int] = None,
+    score_threshold: Optional[float] = None,
+    oversampling: Optional[float] = None,
 ):
     """
-    Search for points in a collection in Qdrant.
+    Search for the points closest to each of many vectors in a collection in
+    Qdrant, in a single round trip.
+
+    When sparse vectors are given (one per dense vector), each search is
+    hybrid: the dense and sparse searches each fetch prefetch_limit
+    candidates and the two rankings are merged with Reciprocal Rank Fusion.
+    The dense search parameters (hnsw_ef, score_threshold, oversampling) then
+    apply to the dense candidates, since fused RRF scores are not similarities.
+
+    Args:
+        collection_name (str): The name of the collection to search in.
+        vectors (List[list[float]]): The vectors to search for.
+        limit (int): The maximum number of points to return per vector.
+        sparse_vectors (List[Tuple[List[int], List[float]]]): Optional sparse
+            query vectors (indices, values) for hybrid search, aligned with vectors.
+        sparse_vector_name (str): The name of the sparse vector in the collection.
+        prefetch_limit (int): Candidates fetched per search before fusion.
+            Defaults to limit.
+        hnsw_ef (int): Candidate list size while searching the HNSW graph.
+            Higher is more accurate and slower. Defaults to the collection's
+            ef_construct.
+        score_threshold (float): Drop dense results scoring below this.
+        oversampling (float): On quantized collections, fetch this many
+            times more candidates with the compressed vectors and rescore
+            them with the original vectors.
+    Returns:
+        dict: "message" holds one list of points per vector, in order.
+    """
+    search_params = None
+    if hnsw_ef is not None or oversampling is not None:
+        search_params = models.SearchParams(
+            hnsw_ef=hnsw_ef,
+            quantization=(
+                models.QuantizationSearchParams(rescore=True, oversampling=oversampling)
+                if oversampling is not None
+                else None
+            ),
+        )
+
+    if sparse_vectors is None:
+        sparse_vectors = [None] * len(vectors)
+    requests = [
+        _search_request(
+            vector,
+            limit,
+            sparse_vector,
+            sparse_vector_name,
+            prefetch_limit,
+            search_params,
+            score_threshold,
+        )
+        for vector, sparse_vector in zip(vectors, sparse_vectors)
+    ]
+    responses = await get_async_qdrant_client().query_batch_points(
+        collection_name=collection_name, requests=requests
+    )
+
+    return {
+        "status": "success",
+        "message": [response.points for response in responses],
+    }
+
+
+async def search_qdrant_points(
+    collection_name: str,
+    vector: list[float],
+    limit: int = 10,
+    sparse_vector: Optional[Tuple[List[int], List[float]]] = None,
+    sparse_vector_name: Optional[str] = None,
+    prefetch_limit: Optional[int] = None,
+    hnsw_ef: Optional[int] = None,
+    score_threshold: Optional[float] = None,
+    oversampling: Optional[float] = None,
+):
+    """
+    Search for points in a collection in Qdrant. A single-vector
+    search_qdrant_points_batch; see there for hybrid search.
 
     Args:
         collection_name (str): The name of the collection to search in.
         vector (list[float]): The vector to search for.
         limit (int): The maximum number of points to return.
+        sparse_vector (Tuple[List[int], List[float]]): Optional sparse query
+            vector (indices, values) for hybrid search.
+        sparse_vector_name (str): The name of the sparse vector in the collection.
+        prefetch_limit (int): Candidates fetched per search before fusion.
+            Defaults to limit.
+        hnsw_ef (int): Candidate list size while searching the HNSW graph.
+        score_threshold (float): Drop dense results scoring below this.
+        oversampling (float): Candidate oversampling factor for rescoring
+            quantized vectors.
     """
-    search_result = client.query_points(
-        collection_name=collection_name, query=vector, with_payload=True, limit=limit
-    ).points
-
-    return {"status": "success", "message": search_result}
+    result = await search_qdrant_points_batch(
+        collection_name=collection_name,
+        vectors=[vector],
+        limit=limit,
+        sparse_vectors=[sparse_vector] if sparse_vector is not None else None,
+        sparse_vector_name=sparse_vector_name,
+        prefetch_limit=prefetch_limit,
+        hnsw_ef=hnsw_ef,
+        score_threshold=score_threshold,
+        oversampling=oversampling,
+    )
+    return {"status": "success", "message": result["message"][0]}
 
 
-def delete_qdrant_documents(collection_name: str, file_name: str):
+@timed_upstream("qdrant", "delete")
+async def delete_qdrant_documents(collection_name: str, file_name: str):
     """
     Delete a document from a collection in Qdrant.
 
@@ -85,14 +389,14 @@ def delete_qdrant_documents(collection_name: str, file_name: str):
         collection_name (str): The name of the collection to delete the document from.
         file_name (str): The name of the document to delete.
     """
-    client.delete(
+    await get_async_qdrant_client().delete(
         collection_name=collection_name,
-        points_selector=FilterSelector(
-            filter=Filter(
+        points_selector=models.FilterSelector(
+            filter=models.Filter(
                 must=[
-                    FieldCondition(
+                    models.FieldCondition(
                         key="file_name",
-                        match=MatchValue(value=file_name),
+                        match=models.MatchValue(value=file_name),
                     ),
                 ],
             )
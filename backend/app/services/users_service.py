@@ -1,10 +1,10 @@
 from datetime import datetime, timezone
 
-from app.core.singleton import get_supabase_client
+from app.core.supabase import run_supabase
 from app.services.litellm_service import get_or_create_virtual_key
 
 
-def sync_auth0_user(payload: dict) -> dict | None:
+async def sync_auth0_user(payload: dict) -> dict | None:
     """
     Create or update the local Supabase user row from verified Auth0 claims.
     """
@@ -20,33 +20,31 @@ def sync_auth0_user(payload: dict) -> dict | None:
     if payload.get("name") is not None:
         user_values["name"] = payload.get("name")
 
-    supabase = get_supabase_client()
-
     # AuthSync can run more than once during client hydration; upsert keeps this idempotent.
-    response = (
-        supabase.table("users")
+    response = await run_supabase(
+        "sync_user",
+        lambda supabase: supabase.table("users")
         .upsert(
             user_values,
             on_conflict="auth0_sub",
         )
-        .execute()
+        .execute(),
     )
 
     return response.data[0] if response.data else None
 
 
-def get_user_role(auth0_sub: str) -> str | None:
+async def get_user_role(auth0_sub: str) -> str | None:
     """
     Look up a synced user's role in Supabase.
     """
-    supabase = get_supabase_client()
-
-    response = (
-        supabase.table("users")
+    response = await run_supabase(
+        "user_role",
+        lambda supabase: supabase.table("users")
         .select("role")
         .eq("auth0_sub", auth0_sub)
         .limit(1)
-        .execute()
+        .execute(),
     )
 
     return response.data[0].get("role") if response.data else None
@@ -58,10 +56,9 @@ async def sync_current_user(payload: dict) -> dict:
     """
     auth0_sub = payload["sub"]
 
-    supabase = get_supabase_client()
-    await get_or_create_virtual_key(auth0_sub, payload.get("email") or "", supabase)
+    await get_or_create_virtual_key(auth0_sub, payload.get("email") or "")
 
-    user = sync_auth0_user(payload)
+    user = await sync_auth0_user(payload)
 
     return {
         "status": "success",
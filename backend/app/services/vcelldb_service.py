@@ -1,17 +1,38 @@
-from app.core.logger import get_logger
+from app.core.logger import get_logger, log_payload
 import httpx
 import asyncio
 import re
 from app.schemas.vcelldb_schema import BiomodelRequestParams, SimulationRequestParams
-from urllib.parse import urlencode, quote
-from langfuse import observe
+from app.core.config import settings
+from app.core.singleton import get_vcell_http_client
+from app.utils.cache import AsyncLRUCache
+from app.core.metrics import timed_upstream
+from urllib.parse import urlencode, quote, urlparse
+from app.core.tracing import observe
 from typing import List, Optional
 
-VCELL_API_BASE_URL = "https://vcell.cam.uchc.edu/api/v0"
-VCELL_API_V1_BASE_URL = "https://vcell.cam.uchc.edu/api/v1"
+VCELL_API_BASE_URL = f"{settings.VCELL_API_URL}/v0"
+VCELL_API_V1_BASE_URL = f"{settings.VCELL_API_URL}/v1"
 
 logger = get_logger("vcelldb_service")
 
+# (bmId, simId) -> simulation details
+simulation_cache = AsyncLRUCache(settings.SIMULATION_CACHE_SIZE, name="simulation")
+# (format, bmId) -> model file content, shared by the file endpoints,
+# the LLM tools and bulk export, and across worker processes
+model_file_cache = AsyncLRUCache(
+    settings.MODEL_FILE_CACHE_SIZE,
+    ttl_seconds=settings.MODEL_FILE_CACHE_TTL,
+    name="model_file",
+    shared=True,
+)
+# export URL -> {"available", "size_bytes"}
+file_probe_cache = AsyncLRUCache(
+    settings.FILE_PROBE_CACHE_SIZE,
+    ttl_seconds=settings.FILE_PROBE_CACHE_TTL,
+    name="file_probe",
+)
+
 
 def sanitize_vcml_content(vcml_content: str) -> str:
     """
@@ -50,12 +71,12 @@ async def check_vcell_connectivity() -> bool:
     try:
         import socket
 
-        hostname = "vcell.cam.uchc.edu"
+        hostname = urlparse(settings.VCELL_API_URL).hostname
         logger.info(f"Checking connectivity to {hostname}")
 
-        # Try to resolve the hostname
-        ip_address = socket.gethostbyname(hostname)
-        logger.info(f"Successfully resolved {hostname} to {ip_address}")
+        # Try to resolve the hostname, without blocking the event loop
+        addresses = await asyncio.get_running_loop().getaddrinfo(hostname, None)
+        logger.info(f"Successfully resolved {hostname} to {addresses[0][4][0]}")
         return True
     except socket.gaierror as e:
         logger.error(f"DNS resolution failed for {hostname}: {e}")
@@ -66,6 +87,7 @@ async def check_vcell_connectivity() -> bool:
 
 
 @observe(name="GET_LEGACY_VCELL_TOKEN")
+@timed_upstream("vcell", "users/bearerToken")
 async def get_legacy_vcell_token(auth0_token: str) -> str:
     """
     Exchanges a verified Auth0 access token for a legacy VCell (v0) API
@@ -89,6 +111,7 @@ async def get_legacy_vcell_token(auth0_token: str) -> str:
 
 
 @observe(name="FETCH_BIOMODELS")
+@timed_upstream("vcell", "biomodel")
 async def fetch_biomodels(
     params: BiomodelRequestParams, auth0_token: Optional[str] = None
 ) -> dict:
@@ -156,12 +179,78 @@ async def fetch_simulation_details(params: SimulationRequestParams) -> dict:
     Returns:
         Simulation: A Simulation object containing simulation details.
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{VCELL_API_BASE_URL}/biomodel/{params.bmId}/simulation/{params.simId}"
-        )
-        response.raise_for_status()
-        return response.json()
+    return await simulation_cache.get_or_load(
+        (params.bmId, params.simId),
+        lambda: _request_simulation_details(params.bmId, params.simId),
+    )
+
+
+@timed_upstream("vcell", "biomodel/simulation")
+async def _request_simulation_details(biomodel_id: str, simulation_id: str) -> dict:
+    client = get_vcell_http_client()
+    response = await client.get(
+        f"{VCELL_API_BASE_URL}/biomodel/{biomodel_id}/simulation/{simulation_id}"
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+@observe(name="FETCH_SIMULATION_DETAILS_BATCH")
+async def fetch_simulation_details_batch(
+    biomodel_id: str, simulation_ids: List[str]
+) -> dict:
+    """
+    Fetch the details of many simulations of a biomodel. Cached simulations
+    are served locally; the rest are requested concurrently, at most
+    VCELL_BATCH_CONCURRENCY at a time.
+
+    Args:
+        biomodel_id (str): ID of the biomodel.
+        simulation_ids (List[str]): IDs of the simulations to fetch.
+
+    Returns:
+        dict: One entry per distinct simulation ID, in request order, with
+        status "success" and the simulation, or status "error" and a message.
+    """
+    semaphore = asyncio.Semaphore(settings.VCELL_BATCH_CONCURRENCY)
+
+    async def request(simulation_id: str) -> dict:
+        async with semaphore:
+            return await _request_simulation_details(biomodel_id, simulation_id)
+
+    async def fetch(simulation_id: str) -> dict:
+        try:
+            simulation = await simulation_cache.get_or_load(
+                (biomodel_id, simulation_id), lambda: request(simulation_id)
+            )
+            return {"simId": simulation_id, "status": "success", "simulation": simulation}
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"HTTP error fetching simulation {simulation_id} of biomodel {biomodel_id}: {e.response.status_code}"
+            )
+            return {
+                "simId": simulation_id,
+                "status": "error",
+                "message": f"VCell API returned {e.response.status_code}",
+            }
+        except httpx.RequestError as e:
+            logger.error(
+                f"Request error fetching simulation {simulation_id} of biomodel {biomodel_id}: {str(e)}"
+            )
+            return {
+                "simId": simulation_id,
+                "status": "error",
+                "message": "Error communicating with VCell API.",
+            }
+
+    unique_ids = list(dict.fromkeys(simulation_ids))
+    simulations = await asyncio.gather(*(fetch(sim_id) for sim_id in unique_ids))
+    return {
+        "biomodel_id": biomodel_id,
+        "simulations": simulations,
+        "total_simulations": len(simulations),
+        "failed": sum(1 for simulation in simulations if simulation["status"] == "error"),
+    }
 
 
 @observe(name="GET_VCML_FILE")
@@ -170,6 +259,7 @@ async def get_vcml_file(
 ) -> str:
     """
     Fetches the VCML file content for a given biomodel with retry logic.
+    Downloads are kept in the model file cache.
 
     Args:
         biomodel_id (str): ID of the biomodel.
@@ -178,6 +268,17 @@ async def get_vcml_file(
     Returns:
         str: VCML content of the biomodel.
     """
+    vcml_content = await model_file_cache.get_or_load(
+        ("vcml", biomodel_id), lambda: _download_vcml_file(biomodel_id, max_retries)
+    )
+    if truncate:
+        return sanitize_vcml_content(vcml_content[:500])
+    else:
+        return sanitize_vcml_content(vcml_content)
+
+
+@timed_upstream("vcell", "biomodel.vcml")
+async def _download_vcml_file(biomodel_id: str, max_retries: int) -> str:
     logger.info(f"Fetching VCML file for biomodel: {biomodel_id}")
 
     # Check connectivity first
@@ -199,13 +300,9 @@ async def get_vcml_file(
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.get(url)
                 logger.info(f"Response status: {response.status_code}")
-                logger.info(f"Response headers: {dict(response.headers)}")
+                log_payload(logger, "Response headers", dict(response.headers))
                 response.raise_for_status()
-
-                if truncate:
-                    return sanitize_vcml_content(response.text[:500])
-                else:
-                    return sanitize_vcml_content(response.text)
+                return response.text
 
         except httpx.HTTPStatusError as e:
             logger.error(
@@ -281,6 +378,13 @@ async def get_bngl_file(
     Returns:
         str: BNGL content of the biomodel, or empty string if not rule-based.
     """
+    return await model_file_cache.get_or_load(
+        ("bngl", biomodel_id), lambda: _download_bngl_file(biomodel_id, max_retries)
+    )
+
+
+@timed_upstream("vcell", "biomodel.bngl")
+async def _download_bngl_file(biomodel_id: str, max_retries: int) -> str:
     logger.info(f"Fetching BNGL file for biomodel: {biomodel_id}")
 
     # Check connectivity first
@@ -302,7 +406,7 @@ async def get_bngl_file(
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.get(url)
                 logger.info(f"Response status: {response.status_code}")
-                logger.info(f"Response headers: {dict(response.headers)}")
+                log_payload(logger, "Response headers", dict(response.headers))
 
                 if response.status_code == 404:
                     logger.info(f"BNGL not available for biomodel {biomodel_id}")
@@ -371,6 +475,13 @@ async def get_sbml_file(biomodel_id: str) -> str:
     Returns:
         str: SBML content of the biomodel.
     """
+    return await model_file_cache.get_or_load(
+        ("sbml", biomodel_id), lambda: _download_sbml_file(biomodel_id)
+    )
+
+
+@timed_upstream("vcell", "biomodel.sbml")
+async def _download_sbml_file(biomodel_id: str) -> str:
     try:
         url = f"{VCELL_API_BASE_URL}/biomodel/{biomodel_id}/biomodel.sbml"
         logger.info(f"Requesting SBML file URL: {url}")
@@ -411,6 +522,7 @@ async def get_diagram_url(biomodel_id: str) -> str:
 
 
 @observe(name="GET_DIAGRAM_IMAGE")
+@timed_upstream("vcell", "biomodel/diagram")
 async def get_diagram_image(
     biomodel_id: str, auth0_token: Optional[str] = None
 ) -> bytes:
@@ -431,21 +543,80 @@ async def get_diagram_image(
         legacy_token = await get_legacy_vcell_token(auth0_token)
         headers["Authorization"] = f"Bearer {legacy_token}"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{VCELL_API_BASE_URL}/biomodel/{biomodel_id}/diagram", headers=headers
-        )
+    client = get_vcell_http_client()
+    response = await client.get(
+        f"{VCELL_API_BASE_URL}/biomodel/{biomodel_id}/diagram", headers=headers
+    )
+    response.raise_for_status()
+    return response.content
+
+
+@timed_upstream("vcell", "file_probe")
+async def _request_file_probe(url: str) -> dict:
+    """
+    Check whether an export URL serves a file, without downloading it.
+    Uses HEAD, falling back to a streamed GET that is closed after the
+    headers when the server does not allow HEAD (405/501). That GET is a
+    real request, so upstream still generates the export (e.g. the SBML
+    conversion) even though the body is never read.
+    Only 404 and 410 mean the file does not exist; any other unsuccessful
+    status (408, 429, 5xx, ...) raises HTTPStatusError.
+    """
+    client = get_vcell_http_client()
+    timeout = settings.FILE_PROBE_TIMEOUT
+    response = await client.head(url, timeout=timeout)
+    if response.status_code in (405, 501):
+        async with client.stream("GET", url, timeout=timeout) as response:
+            pass
+    if response.status_code not in (404, 410):
         response.raise_for_status()
-        return response.content
+
+    available = response.is_success
+    content_length = response.headers.get("content-length")
+    return {
+        "available": available,
+        "size_bytes": int(content_length) if available and content_length else None,
+    }
+
+
+async def probe_file(url: str, semaphore: asyncio.Semaphore) -> dict:
+    """
+    Cached availability and size of an export URL. Only a found file or a
+    404/410 is cached; errors and any other upstream status (e.g. 408, 429
+    or 5xx) give available=None (unknown) and are not cached.
+
+    Args:
+        url (str): The file URL to check.
+        semaphore (asyncio.Semaphore): Bounds concurrent upstream probes.
+
+    Returns:
+        dict: available (bool or None) and size_bytes (int or None).
+    """
+
+    async def request() -> dict:
+        async with semaphore:
+            return await _request_file_probe(url)
+
+    try:
+        return await file_probe_cache.get_or_load(url, request)
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        logger.warning(f"Could not probe {url}: {str(e)}")
+        return {"available": None, "size_bytes": None}
 
 
 @observe(name="FETCH_BIOMODEL_APPLICATIONS_FILES")
-async def fetch_biomodel_applications_files(biomodel_id: str) -> dict:
+async def fetch_biomodel_applications_files(
+    biomodel_id: str, check_files: bool = False
+) -> dict:
     """
     Fetch applications data along with SBML and BNGL file URLs for a given biomodel.
 
     Args:
         biomodel_id (str): ID of the biomodel.
+        check_files (bool): Also check, concurrently, whether each
+            application's BNGL and SBML exports exist and how large they are.
+            Adds bngl_available/bngl_size_bytes and sbml_available/sbml_size_bytes
+            to each application; available is None when the check failed.
 
     Returns:
         dict: A dictionary containing applications data and file URLs for each application.
@@ -453,12 +624,12 @@ async def fetch_biomodel_applications_files(biomodel_id: str) -> dict:
     params = BiomodelRequestParams(bmId=biomodel_id)
     logger.info(f"Fetching biomodel applications files for biomodel: {biomodel_id}")
     biomodel_data = await fetch_biomodels(params)
-    logger.info(f"Biomodel data: {biomodel_data}")
+    log_payload(logger, "Biomodel data", biomodel_data)
     applications = []
     if biomodel_data.get("data") and len(biomodel_data["data"]) > 0:
         biomodel = biomodel_data["data"][0]
         applications = biomodel.get("applications", [])
-    logger.info(f"Applications: {applications}")
+
     # Generate file URLs for each application
     applications_with_files = []
     for app in applications:
@@ -472,9 +643,28 @@ async def fetch_biomodel_applications_files(biomodel_id: str) -> dict:
 
         # Add file URLs to the application data
         app_with_files = {**app, "bngl_url": bngl_url, "sbml_url": sbml_url}
-        logger.info(f"Application with files: {app_with_files}")
         applications_with_files.append(app_with_files)
-    logger.info(f"Applications with files: {applications_with_files}")
+
+    if check_files and applications_with_files:
+        semaphore = asyncio.Semaphore(settings.VCELL_BATCH_CONCURRENCY)
+        file_types = ("bngl", "sbml")
+        probes = await asyncio.gather(
+            *(
+                probe_file(app[f"{file_type}_url"], semaphore)
+                for app in applications_with_files
+                for file_type in file_types
+            )
+        )
+        for i, app in enumerate(applications_with_files):
+            for j, file_type in enumerate(file_types):
+                probe = probes[i * len(file_types) + j]
+                app[f"{file_type}_available"] = probe["available"]
+                app[f"{file_type}_size_bytes"] = probe["size_bytes"]
+
+    logger.info(
+        f"Found {len(applications_with_files)} applications for biomodel {biomodel_id}"
+    )
+    log_payload(logger, "Applications with files", applications_with_files)
     return {
         "biomodel_id": biomodel_id,
         "applications": applications_with_files,
@@ -483,6 +673,7 @@ async def fetch_biomodel_applications_files(biomodel_id: str) -> dict:
 
 
 @observe(name="FETCH_PUBLICATIONS")
+@timed_upstream("vcell", "publication")
 async def fetch_publications() -> List[dict]:
     """
     Fetch a list of publications from the VCell API.
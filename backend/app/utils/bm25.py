@@ -0,0 +1,87 @@
+import re
+import zlib
+from collections import Counter
+from typing import List, Tuple
+
+# BM25 term-frequency saturation and length normalisation. The IDF half of
+# BM25 is computed by Qdrant itself (the sparse vector is created with the
+# IDF modifier), so only the per-document term weights are computed here.
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Expected chunk length in tokens; ~2000-character chunks land around here.
+BM25_AVG_DOC_LENGTH = 256
+
+# Keeps identifiers such as "FRAP", "Smoldyn", "CVODE" and numeric model IDs
+# as single tokens.
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be but by can do does for from has have how i if in
+    into is it its me my of on or our so such that the their then there these
+    they this to was we what when where which who why will with you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase a text and split it into alphanumeric tokens, dropping stopwords.
+
+    Args:
+        text (str): The text to tokenize.
+    Returns:
+        List[str]: The tokens, in order of appearance.
+    """
+    return [
+        token
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in _STOPWORDS
+    ]
+
+
+def token_index(token: str) -> int:
+    """
+    Stable sparse-vector dimension for a token. Python's hash() is salted per
+    process, so a CRC is used to keep indices identical across workers.
+    """
+    return zlib.crc32(token.encode("utf-8")) & 0x7FFFFFFF
+
+
+def _to_sparse(weights: dict) -> Tuple[List[int], List[float]]:
+    indices = list(weights.keys())
+    return indices, [weights[index] for index in indices]
+
+
+def encode_document(text: str) -> Tuple[List[int], List[float]]:
+    """
+    Encode a document as BM25 term weights for a Qdrant sparse vector.
+
+    Args:
+        text (str): The document text.
+    Returns:
+        Tuple[List[int], List[float]]: Sparse vector indices and values.
+    """
+    tokens = tokenize(text)
+    length_norm = 1 - BM25_B + BM25_B * len(tokens) / BM25_AVG_DOC_LENGTH
+
+    weights = {}
+    for token, tf in Counter(tokens).items():
+        index = token_index(token)
+        weight = tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+        # Sum on the (unlikely) event two tokens hash to the same index
+        weights[index] = weights.get(index, 0.0) + weight
+    return _to_sparse(weights)
+
+
+def encode_query(text: str) -> Tuple[List[int], List[float]]:
+    """
+    Encode a query for BM25 scoring: every distinct term weighs 1, and Qdrant
+    applies the IDF of each term at search time.
+
+    Args:
+        text (str): The query text.
+    Returns:
+        Tuple[List[int], List[float]]: Sparse vector indices and values.
+    """
+    return _to_sparse({token_index(token): 1.0 for token in set(tokenize(text))})
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.core.logger import get_logger
+from app.utils.shared_cache import SharedCacheBackend
+
+logger = get_logger("cache")
+
+_MISSING = object()
+
+# Named caches, exported as metrics by app.core.metrics
+CACHES: Dict[str, "AsyncLRUCache"] = {}
+
+# Second tier of the caches created with shared=True, common to all worker
+# processes. None keeps every cache in process memory only.
+_shared_backend: Optional[SharedCacheBackend] = None
+# Writes to the shared tier run in the background; keep them referenced
+_pending_writes: set = set()
+
+
+def configure_shared_cache(backend: Optional[SharedCacheBackend]):
+    """
+    Set the backend shared by the caches created with shared=True.
+
+    Args:
+        backend (Optional[SharedCacheBackend]): The backend, or None to
+            keep entries in process memory only.
+    """
+    global _shared_backend
+    _shared_backend = backend
+
+
+class AsyncLRUCache:
+    """
+    In-process LRU cache for values loaded by coroutines. Entries expire
+    after ttl_seconds (never, if None) and the least recently used entry is
+    evicted once max_entries is reached. Concurrent misses on the same key
+    share a single load, so a burst of identical requests makes one upstream
+    call. Failed loads are not cached. Caches given a name are reported by
+    the /metrics endpoint.
+
+    With shared=True and a backend set by configure_shared_cache(), local
+    misses are looked up in that backend, and loaded values are written
+    to it, so worker processes reuse each other's entries. Shared values
+    must be JSON serializable; JSON turns tuples into lists.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        name: Optional[str] = None,
+        shared: bool = False,
+    ):
+        if name is not None:
+            CACHES[name] = self
+        elif shared:
+            raise ValueError("Shared caches need a name")
+        self.name = name
+        self.shared = shared
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._loading: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for key, or default if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """
+        Store a value. ttl_seconds overrides the cache's default TTL for this entry.
+        """
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _shared_key(self, key: Hashable) -> str:
+        return f"vcell_ai:{self.name}:{json.dumps(key, default=str)}"
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Like get(), but a local miss is looked up in the shared backend.
+        Shared entries are copied into this process with their remaining TTL.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        backend = _shared_backend
+        if not self.shared or backend is None:
+            return default
+        try:
+            data = await backend.get(self._shared_key(key))
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {self.name}: {e}")
+            return default
+        if data is None:
+            return default
+        entry = json.loads(data)
+        ttl = entry["expires_at"] - time.time() if entry["expires_at"] is not None else None
+        if ttl is not None and ttl <= 0:
+            return default
+        self.shared_hits += 1
+        self.set(key, entry["value"], ttl_seconds=ttl)
+        return entry["value"]
+
+    async def aset(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """
+        Like set(), and also write the entry to the shared backend in the
+        background.
+        """
+        self.set(key, value, ttl_seconds)
+        backend = _shared_backend
+        if not self.shared or backend is None:
+            return
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.time() + ttl if ttl is not None else None
+        data = json.dumps({"value": value, "expires_at": expires_at}).encode("utf-8")
+        task = asyncio.ensure_future(self._write_shared(backend, key, data, ttl))
+        _pending_writes.add(task)
+        task.add_done_callback(_pending_writes.discard)
+
+    async def _write_shared(
+        self, backend: SharedCacheBackend, key: Hashable, data: bytes, ttl: Optional[float]
+    ):
+        try:
+            await backend.set(self._shared_key(key), data, ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {self.name}: {e}")
+
+    def pop(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached value for key, calling loader() to fill it on a miss.
+
+        Args:
+            key (Hashable): The cache key.
+            loader (Callable[[], Awaitable[Any]]): Coroutine function producing the value.
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        value = await self.aget(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        task = asyncio.ensure_future(loader())
+        self._loading[key] = task
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            self._loading.pop(key, None)
+        await self.aset(key, value)
+        return value
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,374 @@
+import re
+from concurrent.futures import Executor
+from functools import partial
+from typing import List, Optional, TypedDict
+
+from app.utils.tokens import count_tokens
+
+_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+_TABLE_ROW_PATTERN = re.compile(r"^\s*\|")
+_TABLE_SEPARATOR_PATTERN = re.compile(r"^\s*\|?\s*:?-{3,}")
+_SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+# Documents shorter than this are chunked in the calling thread; handing
+# sections to worker processes costs more than it saves.
+PARALLEL_MIN_CHARS = 200_000
+
+
+class Chunk(TypedDict):
+    text: str
+    section_path: List[str]
+    token_count: int
+
+
+class _Block(TypedDict):
+    kind: str  # "heading", "paragraph", "table" or "code"
+    text: str
+    section_path: List[str]
+    tokens: int
+
+
+def _block(kind: str, lines: List[str], section_path: List[str]) -> _Block:
+    text = "\n".join(lines).strip("\n")
+    return {
+        "kind": kind,
+        "text": text,
+        "section_path": list(section_path),
+        "tokens": count_tokens(text),
+    }
+
+
+def _parse_blocks(text: str) -> List[_Block]:
+    """
+    Split markdown (as produced by MarkItDown) into headings, paragraphs,
+    tables and fenced code blocks, each tagged with its heading path.
+    """
+    blocks = []
+    headings = []  # (level, title) of the enclosing sections
+    paragraph = []
+    lines = text.splitlines()
+
+    def section_path():
+        return [title for _, title in headings]
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append(_block("paragraph", paragraph, section_path()))
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        fence = _FENCE_PATTERN.match(line)
+        if fence:
+            flush_paragraph()
+            code = [line]
+            i += 1
+            while i < len(lines):
+                code.append(lines[i])
+                i += 1
+                if lines[i - 1].strip().startswith(fence.group(1)):
+                    break
+            blocks.append(_block("code", code, section_path()))
+            continue
+
+        heading = _HEADING_PATTERN.match(line)
+        if heading:
+            flush_paragraph()
+            level = len(heading.group(1))
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, heading.group(2)))
+            blocks.append(_block("heading", [line], section_path()))
+        elif _TABLE_ROW_PATTERN.match(line):
+            flush_paragraph()
+            table = []
+            while i < len(lines) and _TABLE_ROW_PATTERN.match(lines[i]):
+                table.append(lines[i])
+                i += 1
+            blocks.append(_block("table", table, section_path()))
+            continue
+        elif not line.strip():
+            flush_paragraph()
+        else:
+            paragraph.append(line)
+        i += 1
+
+    flush_paragraph()
+    return blocks
+
+
+def _split_characters(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text without usable whitespace (long URLs, sequences, base64)
+    into consecutive slices of at most max_tokens, each as long as fits.
+    """
+    parts = []
+    while text:
+        # Longest prefix within the budget, but at least one character
+        low, high = 1, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count_tokens(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        parts.append(text[:low])
+        text = text[low:]
+    return parts
+
+
+def _pack_pieces(pieces: List[str], max_tokens: int, separator: str) -> List[str]:
+    """
+    Greedily join pieces into groups of at most max_tokens. A single piece
+    over the budget is split on whitespace, and a single word over the
+    budget by characters.
+    """
+    groups = []
+    current, current_tokens = [], 0
+    for piece in pieces:
+        tokens = count_tokens(piece)
+        if tokens > max_tokens:
+            words = piece.split()
+            if len(words) <= 1:
+                # Nothing left to split on; the slices are groups of their own
+                if current:
+                    groups.append(separator.join(current))
+                    current, current_tokens = [], 0
+                groups.extend(_split_characters(piece.strip(), max_tokens))
+                continue
+            if len(words) <= 8:
+                pieces_of_piece = _pack_pieces(words, max_tokens, " ")
+            else:
+                # Words average well under 2 tokens; re-pack word windows by count
+                pieces_of_piece = _pack_pieces(
+                    [" ".join(words[j : j + 8]) for j in range(0, len(words), 8)],
+                    max_tokens,
+                    " ",
+                )
+        else:
+            pieces_of_piece = [piece]
+
+        for part in pieces_of_piece:
+            part_tokens = count_tokens(part)
+            if current and current_tokens + part_tokens > max_tokens:
+                groups.append(separator.join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+    if current:
+        groups.append(separator.join(current))
+    return groups
+
+
+def _split_oversized(block: _Block, max_tokens: int) -> List[_Block]:
+    """
+    Split a block that does not fit in one chunk. Tables are split by rows
+    and repeat their header row in every piece; code is split by lines;
+    prose by sentences.
+    """
+    if block["tokens"] <= max_tokens:
+        return [block]
+
+    if block["kind"] == "table":
+        rows = block["text"].split("\n")
+        header = rows[:2] if len(rows) > 1 and _TABLE_SEPARATOR_PATTERN.match(rows[1]) else rows[:1]
+        header_text = "\n".join(header)
+        budget = max(1, max_tokens - count_tokens(header_text))
+        texts = [
+            f"{header_text}\n{group}"
+            for group in _pack_pieces(rows[len(header):], budget, "\n")
+        ]
+    elif block["kind"] == "code":
+        texts = _pack_pieces(block["text"].split("\n"), max_tokens, "\n")
+    else:
+        texts = _pack_pieces(
+            _SENTENCE_END_PATTERN.split(block["text"]), max_tokens, " "
+        )
+
+    return [
+        {**block, "text": text, "tokens": count_tokens(text)} for text in texts
+    ]
+
+
+def _overlap_tail(blocks: List[_Block], overlap_tokens: int) -> List[_Block]:
+    """
+    Trailing sentences of a chunk's last prose block, up to overlap_tokens,
+    to repeat at the start of the next chunk. Tables and code are not repeated.
+    """
+    if overlap_tokens <= 0 or not blocks or blocks[-1]["kind"] != "paragraph":
+        return []
+
+    last = blocks[-1]
+    tail, tail_tokens = [], 0
+    for sentence in reversed(_SENTENCE_END_PATTERN.split(last["text"])):
+        tokens = count_tokens(sentence)
+        if tail_tokens + tokens > overlap_tokens:
+            break
+        tail.insert(0, sentence)
+        tail_tokens += tokens
+
+    if not tail:
+        return []
+    text = " ".join(tail)
+    return [{**last, "text": text, "tokens": tail_tokens, "kind": "overlap"}]
+
+
+def _common_path(blocks: List[_Block]) -> List[str]:
+    paths = [block["section_path"] for block in blocks if block["kind"] != "overlap"]
+    if not paths:
+        return []
+    common = paths[0]
+    for path in paths[1:]:
+        size = 0
+        while size < min(len(common), len(path)) and common[size] == path[size]:
+            size += 1
+        common = common[:size]
+    return list(common)
+
+
+def _chunk_section(
+    text: str, max_tokens: int, overlap_tokens: int, min_tokens: int
+) -> List[Chunk]:
+    blocks = []
+    for block in _parse_blocks(text):
+        # Leave room for the overlap repeated at the start of a chunk
+        blocks.extend(_split_oversized(block, max(1, max_tokens - overlap_tokens)))
+
+    chunks = []
+    current, current_tokens = [], 0
+
+    def emit(carry: List[_Block]) -> List[_Block]:
+        # Headings at the end of a chunk belong with the content after them
+        while current and current[-1]["kind"] == "heading":
+            carry.insert(0, current.pop())
+        if any(block["kind"] != "overlap" for block in current):
+            chunk_text = "\n\n".join(block["text"] for block in current)
+            chunks.append(
+                {
+                    "text": chunk_text,
+                    "section_path": _common_path(current),
+                    "token_count": count_tokens(chunk_text),
+                }
+            )
+        return carry
+
+    for block in blocks:
+        starts_section = block["kind"] == "heading"
+        if current and (
+            current_tokens + block["tokens"] > max_tokens
+            or (starts_section and current_tokens >= min_tokens)
+        ):
+            carry = [] if starts_section else _overlap_tail(current, overlap_tokens)
+            current = emit(carry)
+            current_tokens = sum(b["tokens"] for b in current)
+        current.append(block)
+        current_tokens += block["tokens"]
+
+    emit([])
+    return chunks
+
+
+def _split_top_level_sections(text: str) -> List[str]:
+    """
+    Split markdown at its highest-level headings, ignoring "#" lines inside
+    code fences, so each part can be chunked independently with complete
+    section paths.
+    """
+    lines = text.splitlines()
+    in_fence = False
+    headings = []  # (line number, level)
+    for number, line in enumerate(lines):
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+            continue
+        heading = None if in_fence else _HEADING_PATTERN.match(line)
+        if heading:
+            headings.append((number, len(heading.group(1))))
+
+    if not headings:
+        return [text]
+
+    top_level = min(level for _, level in headings)
+    starts = [number for number, level in headings if level == top_level]
+    bounds = [0] + [start for start in starts if start > 0] + [len(lines)]
+    return [
+        "\n".join(lines[begin:end])
+        for begin, end in zip(bounds, bounds[1:])
+        if "\n".join(lines[begin:end]).strip()
+    ]
+
+
+def check_chunk_budget(max_tokens: int, overlap_tokens: int, min_tokens: int):
+    """
+    Reject chunking parameters that cannot produce sensible chunks: an
+    overlap as large as the budget repeats whole chunks, and a minimum above
+    the budget can never be reached.
+
+    Args:
+        max_tokens (int): Token budget per chunk.
+        overlap_tokens (int): Tokens repeated between consecutive chunks.
+        min_tokens (int): Smaller sections are merged with the next one.
+    Raises:
+        ValueError: If overlap_tokens >= max_tokens or min_tokens > max_tokens.
+    """
+    if overlap_tokens >= max_tokens:
+        raise ValueError(
+            f"overlap_tokens ({overlap_tokens}) must be less than max_tokens ({max_tokens})"
+        )
+    if min_tokens > max_tokens:
+        raise ValueError(
+            f"min_tokens ({min_tokens}) must not exceed max_tokens ({max_tokens})"
+        )
+
+
+def chunk_markdown(
+    text: str,
+    max_tokens: int = 512,
+    overlap_tokens: int = 64,
+    min_tokens: int = 128,
+    pool: Optional[Executor] = None,
+) -> List[Chunk]:
+    """
+    Split markdown into chunks of at most max_tokens tokens along its
+    structure. A heading starts a new chunk once the current one holds
+    min_tokens, tables and code blocks are only split between rows or lines,
+    and prose is split between sentences. Chunks cut for size repeat up to
+    overlap_tokens of trailing sentences from the previous chunk.
+
+    With a pool, large documents are split at their top-level headings and
+    the sections are chunked in parallel on it.
+
+    Args:
+        text (str): The markdown text to chunk.
+        max_tokens (int): Token budget per chunk.
+        overlap_tokens (int): Tokens repeated between consecutive chunks of a section.
+        min_tokens (int): Smaller sections are merged with the next one.
+        pool (Optional[Executor]): Process pool for the sections of large
+            documents. None chunks everything in the calling thread.
+    Returns:
+        List[Chunk]: The chunks with their heading path and token count.
+    Raises:
+        ValueError: If the token parameters are inconsistent, see check_chunk_budget.
+    """
+    check_chunk_budget(max_tokens, overlap_tokens, min_tokens)
+    chunk_section = partial(
+        _chunk_section,
+        max_tokens=max_tokens,
+        overlap_tokens=overlap_tokens,
+        min_tokens=min_tokens,
+    )
+
+    if pool is None or len(text) < PARALLEL_MIN_CHARS:
+        return chunk_section(text)
+
+    sections = _split_top_level_sections(text)
+    if len(sections) == 1:
+        return chunk_section(text)
+
+    chunks = []
+    for section_chunks in pool.map(chunk_section, sections, chunksize=4):
+        chunks.extend(section_chunks)
+    return chunks
@@ -0,0 +1,121 @@
+from typing import Dict, List, Tuple
+
+from app.utils.tokens import count_tokens
+
+# Shortest suffix/prefix match treated as chunk overlap rather than coincidence.
+_MIN_OVERLAP_CHARS = 20
+
+
+def _strip_overlap(previous: str, following: str) -> str:
+    """
+    Drop the start of following that repeats the end of previous. Chunkers
+    repeat a tail of each chunk at the start of the next one; merging
+    neighbors without removing it would send that text twice.
+    """
+    following = following.lstrip()
+    for size in range(min(len(previous), len(following)), _MIN_OVERLAP_CHARS - 1, -1):
+        if previous.endswith(following[:size]):
+            return following[size:].lstrip()
+    return following
+
+
+def _common_path(paths: List[List[str]]) -> List[str]:
+    common = paths[0]
+    for path in paths[1:]:
+        size = 0
+        while size < min(len(common), len(path)) and common[size] == path[size]:
+            size += 1
+        common = common[:size]
+    return list(common)
+
+
+def merge_neighbor_chunks(results: List[dict]) -> List[dict]:
+    """
+    Merge search results that are consecutive chunks of the same file into
+    single passages, removing the overlap text between them. Duplicate hits
+    on the same chunk are kept once.
+
+    Args:
+        results (List[dict]): Search results with score, file_name,
+            chunk_index, section_path and chunk.
+    Returns:
+        List[dict]: Passages with score (the best of their chunks),
+        file_name, chunk_indices, section_path and chunk (the merged text).
+    """
+    by_chunk: Dict[Tuple[str, int], dict] = {}
+    for result in results:
+        key = (result["file_name"], result["chunk_index"])
+        if key not in by_chunk or result["score"] > by_chunk[key]["score"]:
+            by_chunk[key] = result
+
+    passages = []
+    current = None
+    for (file_name, chunk_index), result in sorted(by_chunk.items()):
+        if (
+            current is not None
+            and current["file_name"] == file_name
+            and current["chunk_indices"][-1] == chunk_index - 1
+        ):
+            current["chunk"] = "\n\n".join(
+                part
+                for part in (
+                    current["chunk"],
+                    _strip_overlap(current["chunk"], result["chunk"]),
+                )
+                if part
+            )
+            current["chunk_indices"].append(chunk_index)
+            current["score"] = max(current["score"], result["score"])
+            current["section_paths"].append(result["section_path"])
+            continue
+
+        current = {
+            "score": result["score"],
+            "file_name": file_name,
+            "chunk_indices": [chunk_index],
+            "section_paths": [result["section_path"]],
+            "chunk": result["chunk"],
+        }
+        passages.append(current)
+
+    return [
+        {
+            "score": passage["score"],
+            "file_name": passage["file_name"],
+            "chunk_indices": passage["chunk_indices"],
+            "section_path": _common_path(passage.pop("section_paths")),
+            "chunk": passage["chunk"],
+        }
+        for passage in passages
+    ]
+
+
+def pack_context(results: List[dict], max_tokens: int) -> List[dict]:
+    """
+    Assemble search results into the passages handed to the LLM. Chunks are
+    taken best score first, each kept only if the merged passages still fit
+    in max_tokens; a chunk next to one already kept costs only its text
+    beyond the shared overlap. A long run of neighbors is therefore trimmed
+    to its best chunks rather than dropped as a whole.
+
+    Args:
+        results (List[dict]): Search results with score, file_name,
+            chunk_index, section_path and chunk.
+        max_tokens (int): Token budget for all passages together.
+    Returns:
+        List[dict]: The merged passages, best first, each with its token_count.
+    """
+    selected = []
+    passages = []
+    for result in sorted(results, key=lambda result: result["score"], reverse=True):
+        candidate = merge_neighbor_chunks(selected + [result])
+        if sum(count_tokens(passage["chunk"]) for passage in candidate) > max_tokens:
+            continue
+        selected.append(result)
+        passages = candidate
+
+    passages.sort(key=lambda passage: passage["score"], reverse=True)
+    return [
+        {**passage, "token_count": count_tokens(passage["chunk"])}
+        for passage in passages
+    ]
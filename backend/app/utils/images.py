@@ -0,0 +1,74 @@
+import hashlib
+import io
+from typing import Tuple
+
+from PIL import Image
+
+MEDIA_TYPES = {"png": "image/png", "webp": "image/webp"}
+
+
+def image_etag(data: bytes) -> str:
+    """
+    Strong ETag for image bytes.
+    """
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag. As If-None-Match uses
+    weak comparison, a W/ prefix on either side is ignored, and "*" matches
+    any current representation.
+
+    Args:
+        if_none_match (str): The request's If-None-Match header.
+        etag (str): The current ETag.
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    opaque_tag = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque_tag:
+            return True
+    return False
+
+
+def resize_image(data: bytes, max_side: int, image_format: str = "png") -> Tuple[bytes, str]:
+    """
+    Shrink an image to fit in max_side x max_side and re-encode it compactly.
+    Diagrams are flat drawings with few colors, so PNGs are reduced to a
+    256-color palette, which is typically several times smaller than the
+    truecolor original with no visible loss; WebP is encoded losslessly.
+    The original bytes are kept if re-encoding does not make them smaller.
+
+    Args:
+        data (bytes): The source image (any format Pillow reads).
+        max_side (int): Maximum width and height, in pixels.
+        image_format (str): "png" (palette) or "webp".
+    Returns:
+        Tuple[bytes, str]: The encoded image and its media type.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        source_format = (source.format or "").lower()
+        image = source.convert("RGBA")
+
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        resized = True
+    else:
+        resized = False
+
+    output = io.BytesIO()
+    if image_format == "webp":
+        image.save(output, format="WEBP", lossless=True, method=4)
+    else:
+        image_format = "png"
+        image.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(
+            output, format="PNG", optimize=True
+        )
+    encoded = output.getvalue()
+
+    if not resized and len(encoded) >= len(data) and source_format in MEDIA_TYPES:
+        return data, MEDIA_TYPES[source_format]
+    return encoded, MEDIA_TYPES[image_format]
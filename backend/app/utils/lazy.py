@@ -0,0 +1,31 @@
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access,
+    so heavy dependencies stay off the application's import path.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def __getattr__(self, attribute: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Import a module on first use.
+
+    Args:
+        name (str): The module's full name, e.g. "qdrant_client.models".
+    Returns:
+        LazyModule: A proxy forwarding attribute access to the module.
+    """
+    return LazyModule(name)
@@ -0,0 +1,183 @@
+import asyncio
+import os
+import sqlite3
+import stat
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# Expired and surplus rows are deleted every this many writes
+_PRUNE_EVERY = 256
+
+
+def _check_private(path: str, st: os.stat_result):
+    # Entries are trusted when read back: anyone else able to write the
+    # store could plant model files or embeddings served to every user
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(
+            f"{path} must be owned by this user and not accessible to others"
+        )
+
+
+def private_cache_dir(base_dir: str) -> str:
+    """
+    Create (or reuse) a directory only this user can access, for the
+    shared cache of the workers running as this user.
+
+    Args:
+        base_dir (str): Where to create it, e.g. "/dev/shm".
+    Returns:
+        str: The directory path.
+    """
+    path = os.path.join(base_dir, f"vcell_ai_cache-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    _check_private(path, st)
+    return path
+
+
+class SharedCacheBackend(ABC):
+    """
+    Byte store shared by the worker processes of one deployment, used as
+    the second tier of AsyncLRUCache. Implementations must be safe to use
+    from several processes at once.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the value stored under key, or None if missing or expired.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        """
+        Store value under key, expiring after ttl_seconds if given.
+        """
+
+    async def close(self):
+        pass
+
+
+class SQLiteCacheBackend(SharedCacheBackend):
+    """
+    Shared cache in a local SQLite database in WAL mode, so the workers on
+    one host share entries without another service. Put it on a tmpfs such
+    as /dev/shm to keep it in memory. The file must be private to the user
+    running the workers. Queries run on a dedicated thread.
+    Past max_entries, the least recently written entries are dropped.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-cache")
+        self._connection: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        # Create the file readable by this user only (SQLite gives its WAL
+        # and shared-memory files the same mode) and refuse one planted by
+        # someone else
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        try:
+            _check_private(path, os.fstat(fd))
+        finally:
+            os.close(fd)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Losing the cache in a crash is harmless
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT value FROM cache WHERE key = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, ttl_seconds: Optional[float]):
+        connection = self._connect()
+        expires_at = time.time() + ttl_seconds if ttl_seconds is not None else None
+        # REPLACE gives the row a new rowid, so rowid order is write order
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY == 0:
+            self._prune(connection)
+
+    def _prune(self, connection: sqlite3.Connection):
+        connection.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        connection.execute(
+            "DELETE FROM cache WHERE rowid IN "
+            "(SELECT rowid FROM cache ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._run(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        await self._run(self._set, key, value, ttl_seconds)
+
+    async def close(self):
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+
+class RedisCacheBackend(SharedCacheBackend):
+    """
+    Shared cache in Redis (or a compatible server such as Valkey), for
+    workers spread over several hosts. Eviction is left to the server's
+    maxmemory policy.
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError(
+                "SHARED_CACHE_BACKEND=redis requires redis: pip install redis"
+            ) from e
+
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None):
+        expire_ms = int(ttl_seconds * 1000) if ttl_seconds is not None else None
+        await self.client.set(key, value, px=expire_ms)
+
+    async def close(self):
+        await self.client.aclose()
@@ -61,6 +61,6 @@ Do not omit any applications.
 
 ### Publications Guidelines
 * If asked for publications, research papers, pubmed articles, etc. use the `fetch_publications` tool. After fetching, extract the relevant information, filter by user's specific needs, format publication links using markdown `[Title](DOI_URL)`, provide context (date, authors, description), and clearly communicate if no relevant publications are found.
-* When using the `fetch_publications` tool, the response contains the full list of VCell related publications with fields: `pubKey` (unique identifier), `title`, `authors` (array), `year`, `citation` (full citation string in journal format), `pubmedid` (PubMed ID), `doi` (DOI link to the publication), `biomodelReferences` (array of related biomodels), and `mathmodelReferences` (array of related mathematical models).
+* Pass the user's constraints to the `fetch_publications` tool as filters (`query` for topic terms, `author`, `year_from`/`year_to`, `biomodel_key`) rather than fetching everything. The response contains `total_matches` and `publications`, the best matching VCell related publications with fields: `pubKey` (unique identifier), `title`, `authors` (array), `year`, `citation` (full citation string in journal format), `pubmedid` (PubMed ID), `doi` (DOI link to the publication), `biomodelReferences` (array of related biomodels), and `mathmodelReferences` (array of related mathematical models).
 * When presenting publications, always provide elaborate, fact-based responses based solely on the available tool results.
 """
@@ -0,0 +1,40 @@
+import re
+from functools import lru_cache
+
+# Fallback when tiktoken or its encoding file is unavailable: words and punctuation marks each
+# count as one piece, and long words as several, which tracks cl100k_base
+# counts on English prose to within ~10-15%.
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+_CHARS_PER_WORD_TOKEN = 6
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        # Downloaded on first use unless already in TIKTOKEN_CACHE_DIR
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text, as the OpenAI cl100k_base tokenizer would.
+
+    Args:
+        text (str): The text to count.
+    Returns:
+        int: The number of tokens. Exact with tiktoken, estimated if it is unavailable.
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return sum(
+        1 + (len(piece) - 1) // _CHARS_PER_WORD_TOKEN
+        for piece in _PIECE_PATTERN.findall(text)
+    )
@@ -3,9 +3,9 @@ from app.services.vcelldb_service import (
     fetch_biomodels,
     fetch_simulation_details,
     get_vcml_file,
-    fetch_publications,
 )
-from app.services.knowledge_base_service import get_similar_chunks
+from app.services.knowledge_base_service import get_knowledge_base_context
+from app.services.publications_service import search_publications
 from app.schemas.vcelldb_schema import BiomodelRequestParams, SimulationRequestParams
 from app.schemas.tool_schema import (
     ToolDefinition,
@@ -14,6 +14,7 @@ from app.schemas.tool_schema import (
     ParameterSchema,
 )
 from app.core.logger import get_logger
+from app.core.metrics import track_tool
 
 logger = get_logger("tools_utils")
 
@@ -167,11 +168,44 @@ fetch_publications_tool = ToolDefinition(
     type="function",
     function=FunctionDefinition(
         name="fetch_publications",
-        description="Retrieves a list of publications from the VCell database. This function fetches all available publications including their metadata, status information, and associated data. Publications represent research papers, models, and other scientific content available in the VCell system. If asked for publications, research papers, pubmed articles, etc. use this tool. Retrieve publications then use what you need on the user's query.",
+        description="Searches the publications in the VCell database (research papers describing VCell models). Filter by free-text terms, author, year range or linked biomodel key; filters combine with AND. Returns the total number of matches and the best matching publications. If asked for publications, research papers, pubmed articles, etc. use this tool with the filters implied by the user's query.",
         parameters=ParameterSchema(
             type="object",
-            properties={},
-            required=[],
+            properties={
+                "query": {
+                    "type": "string",
+                    "default": "",
+                    "description": "Free-text terms matched against title, authors and citation (e.g. 'calcium signaling'). Empty string for no text filter.",
+                },
+                "author": {
+                    "type": "string",
+                    "default": "",
+                    "description": "Author name to filter by (e.g. 'Loew'). Empty string for any author.",
+                },
+                "year_from": {
+                    "type": "integer",
+                    "default": 0,
+                    "description": "Earliest publication year. 0 for no lower bound.",
+                },
+                "year_to": {
+                    "type": "integer",
+                    "default": 0,
+                    "description": "Latest publication year. 0 for no upper bound.",
+                },
+                "biomodel_key": {
+                    "type": "string",
+                    "default": "",
+                    "description": "Only publications linked to this biomodel key (bmKey). Empty string for any.",
+                },
+                "limit": {
+                    "type": "integer",
+                    "default": 20,
+                    "minimum": 1,
+                    "maximum": 100,
+                    "description": "The maximum number of publications to return. Default is 20.",
+                },
+            },
+            required=["query", "author", "year_from", "year_to", "biomodel_key", "limit"],
             additionalProperties=False,
         ),
         strict=True,
@@ -202,35 +236,44 @@ async def execute_tool(name, args, auth0_token: str | None = None):
         The result of the function call.
     """
     try:
-        if name == "fetch_biomodels":
-            logger.info(f"Executing tool: {name}")
-            # Handle empty fields and validate
-            # if args.get("savedLow") == "":
-            #     args["savedLow"] = None
-            # if args.get("savedHigh") == "":
-            #     args["savedHigh"] = None
-            args["maxRows"] = 1000
-            params = BiomodelRequestParams(**args)
-            return await fetch_biomodels(params, auth0_token)
+        with track_tool(name):
+            if name == "fetch_biomodels":
+                logger.info(f"Executing tool: {name}")
+                # Handle empty fields and validate
+                # if args.get("savedLow") == "":
+                #     args["savedLow"] = None
+                # if args.get("savedHigh") == "":
+                #     args["savedHigh"] = None
+                args["maxRows"] = 1000
+                params = BiomodelRequestParams(**args)
+                return await fetch_biomodels(params, auth0_token)
 
-        elif name == "fetch_simulation_details":
-            params = SimulationRequestParams(**args)
-            return await fetch_simulation_details(params)
+            elif name == "fetch_simulation_details":
+                params = SimulationRequestParams(**args)
+                return await fetch_simulation_details(params)
 
-        elif name == "get_vcml_file":
-            return await get_vcml_file(args["biomodel_id"])
+            elif name == "get_vcml_file":
+                return await get_vcml_file(args["biomodel_id"])
 
-        elif name == "search_vcell_knowledge_base":
-            query = args["query"]
-            limit = args.get("limit", 5)
-            logger.info(f"Executing tool: {name} with query {query}")
-            return get_similar_chunks(query=query, limit=limit)
+            elif name == "search_vcell_knowledge_base":
+                query = args["query"]
+                limit = args.get("limit", 5)
+                logger.info(f"Executing tool: {name} with query {query}")
+                return await get_knowledge_base_context(query=query, limit=limit)
 
-        elif name == "fetch_publications":
-            return await fetch_publications()
+            elif name == "fetch_publications":
+                logger.info(f"Executing tool: {name} with args {args}")
+                return await search_publications(
+                    query=args.get("query", ""),
+                    author=args.get("author", ""),
+                    year_from=args.get("year_from") or None,
+                    year_to=args.get("year_to") or None,
+                    biomodel_key=args.get("biomodel_key", ""),
+                    limit=args.get("limit", 20),
+                )
 
-        else:
-            return {}
+            else:
+                return {}
 
     except Exception as e:
         if name == "fetch_biomodels" or name == "fetch_simulation_details":
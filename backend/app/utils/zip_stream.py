@@ -0,0 +1,63 @@
+import time
+import zipfile
+from typing import List
+
+
+class _ChunkSink:
+    """
+    Write-only file object collecting what ZipFile writes. It has no seek
+    or tell, so ZipFile writes entries with data descriptors and never goes
+    back to patch headers, which is what makes streaming possible.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """
+    Builds a ZIP archive incrementally: each add() returns the bytes of
+    that entry, ready to send, so only one entry is held in memory at a
+    time. close() returns the central directory that ends the archive.
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """
+        Add a file to the archive.
+
+        Args:
+            name (str): Path of the file inside the archive.
+            data (bytes): The file content.
+        Returns:
+            bytes: The archive bytes produced for this entry.
+        """
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = self._zip.compression
+        self._zip.writestr(info, data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """
+        Finish the archive.
+
+        Returns:
+            bytes: The remaining archive bytes (central directory).
+        """
+        self._zip.close()
+        return self._sink.drain()
@@ -0,0 +1,39 @@
+import math
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of samples.
+
+    Args:
+        samples (List[float]): The measured values.
+        pct (float): The percentile to compute, between 0 and 100.
+    Returns:
+        float: The percentile value, or 0.0 for an empty list.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(samples_ms: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples (in milliseconds) as mean, p50, p95 and p99.
+    """
+    return {
+        "mean_ms": sum(samples_ms) / len(samples_ms) if samples_ms else 0.0,
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+    }
+
+
+def format_row(label: str, values: Dict[str, float]) -> str:
+    """
+    Format one labelled row of numeric results for terminal output.
+    """
+    cells = "  ".join(f"{key}={value:.3f}" for key, value in values.items())
+    return f"{label:<24} {cells}"
@@ -0,0 +1,121 @@
+"""
+Compare the "structured" and "recursive" knowledge base chunkers.
+
+Throughput: characters and chunks per second over the given documents, and
+the spread of chunk sizes in tokens.
+
+Retrieval quality: every document is chunked with each strategy and indexed
+into a throwaway in-memory Qdrant collection using the configured embedding
+backend. A query counts as a hit at k when one of its top k chunks contains
+the labeled answer text.
+
+    poetry run python -m benchmarks.chunking_benchmark \
+        --labels benchmarks/data/chunking_queries.example.json --k 1 3 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Dict, List
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from app.schemas.knowledge_base_schema import ChunkingOptions
+from app.services.knowledge_base_service import (
+    _embedding_input,
+    chunk_text,
+    embed_text,
+    embed_texts,
+)
+from benchmarks._stats import format_row
+
+STRATEGIES = ["structured", "recursive"]
+
+
+def throughput(texts: List[str], strategy: str, repeats: int) -> Dict[str, float]:
+    options = ChunkingOptions(strategy=strategy)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        chunks = [chunk for text in texts for chunk in chunk_text(text, options)]
+    elapsed = (time.perf_counter() - start) / repeats
+
+    sizes = [chunk["token_count"] for chunk in chunks]
+    return {
+        "chars_per_s": sum(len(text) for text in texts) / elapsed,
+        "chunks_per_s": len(chunks) / elapsed,
+        "chunks": len(chunks),
+        "tokens_mean": statistics.mean(sizes),
+        "tokens_stdev": statistics.pstdev(sizes),
+        "tokens_max": max(sizes),
+    }
+
+
+async def retrieval(texts: List[str], queries: List[dict], strategy: str, ks: List[int]):
+    options = ChunkingOptions(strategy=strategy)
+    chunks = [chunk for text in texts for chunk in chunk_text(text, options)]
+    vectors = await embed_texts([_embedding_input(chunk) for chunk in chunks])
+
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        "chunks", vectors_config=VectorParams(size=len(vectors[0]), distance=Distance.COSINE)
+    )
+    client.upsert(
+        "chunks",
+        points=[
+            PointStruct(id=i, vector=vector, payload={"chunk": chunk["text"]})
+            for i, (chunk, vector) in enumerate(zip(chunks, vectors))
+        ],
+    )
+
+    hits = {k: 0 for k in ks}
+    for item in queries:
+        points = client.query_points(
+            "chunks", query=await embed_text(item["query"]), limit=max(ks)
+        ).points
+        ranked = [point.payload["chunk"] for point in points]
+        for k in ks:
+            hits[k] += any(item["answer"] in chunk for chunk in ranked[:k])
+    return {f"hit@{k}": hits[k] / len(queries) for k in ks}
+
+
+async def retrieval_all(texts: List[str], queries: List[dict], ks: List[int]):
+    for strategy in STRATEGIES:
+        print(format_row(strategy, await retrieval(texts, queries, strategy, ks)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--labels", default="benchmarks/data/chunking_queries.example.json"
+    )
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--skip-retrieval", action="store_true", help="Only measure throughput"
+    )
+    args = parser.parse_args()
+
+    with open(args.labels, encoding="utf-8") as file:
+        labels = json.load(file)
+    # Document paths are relative to the backend directory
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    texts = []
+    for path in labels["documents"]:
+        with open(os.path.join(backend_dir, path), encoding="utf-8") as file:
+            texts.append(file.read())
+
+    print(f"{len(texts)} documents, {sum(len(t) for t in texts)} characters")
+    for strategy in STRATEGIES:
+        print(format_row(strategy, throughput(texts, strategy, args.repeats)))
+
+    if not args.skip_retrieval:
+        print(f"\n{len(labels['queries'])} labeled queries")
+        asyncio.run(retrieval_all(texts, labels["queries"], args.k))
+
+
+if __name__ == "__main__":
+    main()
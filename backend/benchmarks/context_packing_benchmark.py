@@ -0,0 +1,81 @@
+"""
+Measure how much context packing shrinks knowledge base prompts, and what
+it costs in coverage: for each labeled query, the tokens of the raw top-k
+chunks vs the packed passages (neighbors merged, overlap dropped, token
+budget applied), and recall of the relevant files in each.
+
+Uses the same query file as kb_retrieval_benchmark and the collection
+configured in .env:
+    poetry run python -m benchmarks.context_packing_benchmark \
+        --queries benchmarks/data/kb_queries.json --limit 10 --max-tokens 3000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+from app.services.knowledge_base_service import get_similar_chunks
+from app.utils.context_packing import pack_context
+from app.utils.tokens import count_tokens
+from benchmarks._stats import format_row
+from benchmarks.kb_retrieval_benchmark import recall_at_k
+
+
+async def run(queries: List[dict], limit: int, max_tokens: int):
+    raw_tokens, packed_tokens, pack_ms = [], [], []
+    raw_recall, packed_recall = [], []
+    for item in queries:
+        result = await get_similar_chunks(query=item["query"], limit=limit)
+        if result["status"] != "success":
+            raise RuntimeError(result["message"])
+        results = result["results"]
+
+        start = time.perf_counter()
+        passages = pack_context(results, max_tokens)
+        pack_ms.append((time.perf_counter() - start) * 1000)
+
+        raw_tokens.append(sum(count_tokens(r["chunk"]) for r in results))
+        packed_tokens.append(sum(p["token_count"] for p in passages))
+        raw_recall.append(
+            recall_at_k([r["file_name"] for r in results], item["relevant_files"], limit)
+        )
+        packed_recall.append(
+            recall_at_k([p["file_name"] for p in passages], item["relevant_files"], limit)
+        )
+
+    return {
+        "raw": {
+            "prompt_tokens": statistics.mean(raw_tokens),
+            "recall": statistics.mean(raw_recall),
+        },
+        "packed": {
+            "prompt_tokens": statistics.mean(packed_tokens),
+            "recall": statistics.mean(packed_recall),
+            "pack_ms": statistics.mean(pack_ms),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--queries", default="benchmarks/data/kb_queries.example.json"
+    )
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--max-tokens", type=int, default=3000)
+    args = parser.parse_args()
+
+    with open(args.queries, encoding="utf-8") as file:
+        queries = json.load(file)
+
+    report = asyncio.run(run(queries, args.limit, args.max_tokens))
+    print(f"{len(queries)} queries, limit={args.limit}, max_tokens={args.max_tokens}")
+    for mode, values in report.items():
+        print(format_row(mode, values))
+
+
+if __name__ == "__main__":
+    main()
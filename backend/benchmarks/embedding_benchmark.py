@@ -0,0 +1,53 @@
+"""
+Measure query-embedding latency and ingestion throughput of the embedding
+backend selected by EMBEDDING_BACKEND.
+
+    EMBEDDING_BACKEND=local poetry run python -m benchmarks.embedding_benchmark
+    EMBEDDING_BACKEND=azure poetry run python -m benchmarks.embedding_benchmark
+"""
+
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.singleton import get_embedding_backend
+from benchmarks._stats import format_row, latency_summary
+
+SAMPLE_QUERY = "How do I set up a spatial stochastic simulation with Smoldyn?"
+# Roughly the size of one knowledge base chunk
+SAMPLE_CHUNK = (
+    "VCell supports deterministic and stochastic solvers for compartmental and "
+    "spatial models, including CVODE, Smoldyn and the finite volume solver. "
+) * 14
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--chunks", type=int, default=512)
+    args = parser.parse_args()
+
+    backend = get_embedding_backend()
+    print(
+        f"backend={settings.EMBEDDING_BACKEND} dim={backend.dimension} "
+        f"batch_size={backend.batch_size} threads={settings.EMBEDDING_THREADS}"
+    )
+
+    # Warm-up: first call loads the model or opens the connection
+    backend.embed([SAMPLE_QUERY])
+
+    latencies = []
+    for _ in range(args.queries):
+        start = time.perf_counter()
+        backend.embed([SAMPLE_QUERY])
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(format_row("query embedding", latency_summary(latencies)))
+
+    start = time.perf_counter()
+    backend.embed([SAMPLE_CHUNK] * args.chunks)
+    elapsed = time.perf_counter() - start
+    print(format_row("chunk ingestion", {"chunks_per_s": args.chunks / elapsed}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Local stand-ins for the services the backend calls, used by the load
+benchmark: the VCell API, an OpenAI-compatible LiteLLM proxy (chat
+completions with tool calls and streaming, and embeddings) and Supabase's
+REST API. Each is a small FastAPI app with configurable latency, served by
+uvicorn on a background thread.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from PIL import Image, ImageDraw
+
+FAKE_VIRTUAL_KEY = "sk-benchmark"
+
+_WORDS = (
+    "the model couples calcium release to a diffusion reaction network in the "
+    "cytosol and endoplasmic reticulum compartments solved with a deterministic "
+    "finite volume solver"
+).split()
+
+
+def _biomodel(index: int) -> dict:
+    bm_key = str(100000 + index)
+    return {
+        "bmKey": bm_key,
+        "name": f"Calcium model {index}",
+        "ownerName": "ModelBrick" if index % 3 == 0 else "vcelluser",
+        "savedDate": 1700000000000 + index,
+        "annot": " ".join(_WORDS),
+        "applications": [
+            {"name": f"Application {n}", "mathKey": f"{bm_key}{n}"} for n in range(3)
+        ],
+        "simulations": [
+            {"key": f"{bm_key}{n}", "name": f"Simulation {n}", "solverName": "CVODE"}
+            for n in range(3)
+        ],
+    }
+
+
+def _vcml(biomodel_id: str, size_bytes: int) -> str:
+    species = '<Species Name="Ca{}" />\n'
+    body = "".join(species.format(n) for n in range(size_bytes // len(species)))
+    return f'<vcml Name="{biomodel_id}">\n<BioModel>\n{body}</BioModel>\n</vcml>\n'
+
+
+def _diagram_png(side: int = 800) -> bytes:
+    image = Image.new("RGB", (side, side * 3 // 4), "white")
+    draw = ImageDraw.Draw(image)
+    for n in range(12):
+        x, y = 40 + (n % 4) * 180, 40 + (n // 4) * 170
+        draw.ellipse((x, y, x + 90, y + 60), outline="black", width=3)
+        draw.line((x + 90, y + 30, x + 180, y + 30), fill="blue", width=2)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _add_latency(app: FastAPI, latency_ms: float):
+    @app.middleware("http")
+    async def delay(request: Request, call_next):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return await call_next(request)
+
+
+def build_vcell_app(latency_ms: float = 50, models: int = 200, vcml_bytes: int = 200_000) -> FastAPI:
+    """
+    Fake VCell API: biomodel search, simulations, VCML/SBML/BNGL files,
+    diagrams, publications and the legacy token exchange.
+    """
+    app = FastAPI()
+    _add_latency(app, latency_ms)
+    biomodels = [_biomodel(index) for index in range(models)]
+    diagram = _diagram_png()
+
+    @app.get("/api/v0/biomodel")
+    async def search_biomodels(request: Request):
+        params = request.query_params
+        results = biomodels
+        if params.get("bmId"):
+            results = [model for model in biomodels if model["bmKey"] == params["bmId"]]
+        elif params.get("bmName"):
+            name = params["bmName"].lower()
+            results = [model for model in biomodels if name in model["name"].lower()]
+        max_rows = int(params.get("maxRows") or 10)
+        return results[:max_rows]
+
+    @app.get("/api/v0/biomodel/{biomodel_id}/simulation/{simulation_id}")
+    async def get_simulation(biomodel_id: str, simulation_id: str):
+        return {"key": simulation_id, "bmKey": biomodel_id, "solverName": "CVODE"}
+
+    @app.get("/api/v0/biomodel/{biomodel_id}/biomodel.vcml")
+    async def get_vcml(biomodel_id: str):
+        return Response(_vcml(biomodel_id, vcml_bytes), media_type="application/xml")
+
+    @app.get("/api/v0/biomodel/{biomodel_id}/biomodel.sbml")
+    async def get_sbml(biomodel_id: str):
+        return Response(_vcml(biomodel_id, vcml_bytes // 2), media_type="application/xml")
+
+    @app.get("/api/v0/biomodel/{biomodel_id}/biomodel.bngl")
+    async def get_bngl(biomodel_id: str):
+        return Response("begin model\nend model\n" * 200, media_type="text/plain")
+
+    @app.get("/api/v0/biomodel/{biomodel_id}/diagram")
+    async def get_diagram(biomodel_id: str):
+        return Response(diagram, media_type="image/png")
+
+    @app.get("/api/v0/publication")
+    async def get_publications():
+        return [
+            {
+                "pubKey": str(index),
+                "title": f"Modeling calcium dynamics {index}",
+                "authors": ["Smith J", "&", "Doe A"],
+                "year": 2000 + index % 25,
+                "citation": "J Cell Biol",
+                "biomodelReferences": [{"bmKey": model["bmKey"]}],
+            }
+            for index, model in enumerate(biomodels)
+        ]
+
+    @app.post("/api/v1/users/bearerToken")
+    async def bearer_token():
+        return {"token": "legacy-token"}
+
+    return app
+
+
+def _embedding(text: str, dimension: int) -> List[float]:
+    # Deterministic pseudo-embedding: texts sharing words get similar vectors
+    vector = [0.0] * dimension
+    for word in text.lower().split():
+        digest = hashlib.md5(word.encode("utf-8")).digest()
+        vector[int.from_bytes(digest[:4], "little") % dimension] += 1.0
+    norm = sum(value * value for value in vector) ** 0.5 or 1.0
+    return [value / norm for value in vector]
+
+
+def _tool_call_for(prompt: str) -> dict:
+    if any(word in prompt.lower() for word in ("how", "knowledge", "what is")):
+        name, arguments = "search_vcell_knowledge_base", {"query": prompt, "limit": 5}
+    else:
+        name, arguments = "fetch_biomodels", {"bmName": "calcium"}
+    return {
+        "id": f"call_{uuid.uuid4().hex[:12]}",
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments)},
+    }
+
+
+def build_llm_app(
+    latency_ms: float = 200,
+    output_tokens: int = 60,
+    tokens_per_second: float = 300,
+    embedding_latency_ms: float = 20,
+    embedding_dimension: int = 64,
+) -> FastAPI:
+    """
+    Fake OpenAI-compatible LiteLLM proxy. The first completion of a turn
+    with tools answers with a tool call; other completions answer with
+    output_tokens words after latency_ms (time to first token) plus the
+    generation time at tokens_per_second. stream=True is served as SSE.
+    Embeddings are hashed bags of words of embedding_dimension.
+    """
+    app = FastAPI()
+
+    def completion(body: dict, message: dict, finish_reason: str, prompt_tokens: int) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "openai-model"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": prompt_tokens + output_tokens,
+            },
+        }
+
+    async def stream_words(body: dict, words: List[str]):
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "openai-model"),
+        }
+        for word in words:
+            await asyncio.sleep(1 / tokens_per_second)
+            chunk = {**base, "choices": [{"index": 0, "delta": {"content": word + " "}}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+        done = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        yield f"data: {json.dumps(done)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in messages)
+        await asyncio.sleep(latency_ms / 1000)
+
+        last = messages[-1] if messages else {}
+        if body.get("tools") and last.get("role") == "user":
+            message = {"role": "assistant", "content": None, "tool_calls": [_tool_call_for(str(last.get("content")))]}
+            return completion(body, message, "tool_calls", prompt_tokens)
+
+        words = [_WORDS[index % len(_WORDS)] for index in range(output_tokens)]
+        if body.get("stream"):
+            return StreamingResponse(stream_words(body, words), media_type="text/event-stream")
+        await asyncio.sleep(output_tokens / tokens_per_second)
+        message = {"role": "assistant", "content": " ".join(words)}
+        return completion(body, message, "stop", prompt_tokens)
+
+    @app.post("/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        await asyncio.sleep(embedding_latency_ms / 1000)
+        return {
+            "object": "list",
+            "model": body.get("model"),
+            "data": [
+                {"object": "embedding", "index": index, "embedding": _embedding(text, embedding_dimension)}
+                for index, text in enumerate(texts)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    @app.post("/user/new")
+    async def new_user():
+        return {"key": FAKE_VIRTUAL_KEY}
+
+    return app
+
+
+def build_supabase_app(latency_ms: float = 10) -> FastAPI:
+    """
+    Fake Supabase REST API: every user is an admin with a virtual key.
+    """
+    app = FastAPI()
+    _add_latency(app, latency_ms)
+
+    @app.get("/rest/v1/users")
+    async def get_users():
+        return [{"role": "admin", "litellm_virtual_key": FAKE_VIRTUAL_KEY}]
+
+    @app.api_route("/rest/v1/users", methods=["POST", "PATCH"])
+    async def write_users():
+        return JSONResponse([], status_code=201)
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ServerThread:
+    """
+    Serve ASGI apps with uvicorn on one background thread and event loop.
+    """
+
+    def __init__(self, apps: Dict[str, FastAPI]):
+        self.urls: Dict[str, str] = {}
+        self._servers = []
+        for name, app in apps.items():
+            port = free_port()
+            config = uvicorn.Config(
+                app, host="127.0.0.1", port=port, log_level="warning", access_log=False
+            )
+            self._servers.append(uvicorn.Server(config))
+            self.urls[name] = f"http://127.0.0.1:{port}"
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        async def serve():
+            await asyncio.gather(*(server.serve() for server in self._servers))
+
+        asyncio.run(serve())
+
+    def start(self, timeout: float = 30.0) -> Dict[str, str]:
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not all(server.started for server in self._servers):
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Servers failed to start")
+            time.sleep(0.05)
+        return self.urls
+
+    def stop(self):
+        for server in self._servers:
+            server.should_exit = True
+        self._thread.join(timeout=10)
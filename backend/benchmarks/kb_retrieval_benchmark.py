@@ -0,0 +1,127 @@
+"""
+Compare dense-only and hybrid (dense + BM25, RRF-fused) knowledge base
+retrieval on a labeled query set.
+
+Each query in the set lists the knowledge base files that should be
+retrieved for it. Recall@k is the share of those files found among the top
+k results, averaged over queries. Query embeddings are computed once up
+front, so the latencies compare the searches themselves. Finally the whole
+query set is retrieved end to end, once query by query and once as a batch
+(one embedding call, one Qdrant round trip).
+
+Runs against the Qdrant collection configured in .env:
+    poetry run python -m benchmarks.kb_retrieval_benchmark \
+        --queries benchmarks/data/kb_queries.json --k 1 3 5 10
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from app.services.knowledge_base_service import (
+    KB_COLLECTION_NAME,
+    KB_HYBRID_PREFETCH_FACTOR,
+    KB_SPARSE_VECTOR_NAME,
+    _supports_sparse,
+    embed_text,
+    get_similar_chunks,
+    get_similar_chunks_batch,
+)
+from app.services.qdrant_service import search_qdrant_points
+from app.utils import bm25
+from benchmarks._stats import format_row, latency_summary
+
+
+def recall_at_k(retrieved: List[str], relevant: List[str], k: int) -> float:
+    """
+    Share of the relevant files that appear in the first k retrieved files.
+    """
+    if not relevant:
+        return 0.0
+    return len(set(retrieved[:k]) & set(relevant)) / len(set(relevant))
+
+
+async def run(queries: List[dict], ks: List[int], repeats: int) -> Dict[str, dict]:
+    limit = max(ks)
+    embeddings = [await embed_text(item["query"]) for item in queries]
+
+    modes = {"dense": False}
+    if await _supports_sparse(KB_COLLECTION_NAME):
+        modes["hybrid"] = True
+    else:
+        print(f"{KB_COLLECTION_NAME} has no sparse vector; only dense is measured.")
+
+    report = {}
+    for mode, hybrid in modes.items():
+        latencies = []
+        recalls = {k: [] for k in ks}
+        for item, embedding in zip(queries, embeddings):
+            for _ in range(repeats):
+                start = time.perf_counter()
+                result = await search_qdrant_points(
+                    collection_name=KB_COLLECTION_NAME,
+                    vector=embedding,
+                    limit=limit,
+                    sparse_vector=bm25.encode_query(item["query"]) if hybrid else None,
+                    sparse_vector_name=KB_SPARSE_VECTOR_NAME,
+                    prefetch_limit=limit * KB_HYBRID_PREFETCH_FACTOR,
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            retrieved = [point.payload.get("file_name", "") for point in result["message"]]
+            for k in ks:
+                recalls[k].append(recall_at_k(retrieved, item["relevant_files"], k))
+
+        report[mode] = {
+            **{f"recall@{k}": sum(values) / len(values) for k, values in recalls.items()},
+            **latency_summary(latencies),
+        }
+    return report
+
+
+async def sequential_vs_batch(queries: List[dict], limit: int, repeats: int):
+    texts = [item["query"] for item in queries]
+    sequential, batched = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in texts:
+            await get_similar_chunks(query=text, limit=limit)
+        sequential.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await get_similar_chunks_batch(queries=texts, limit=limit)
+        batched.append((time.perf_counter() - start) * 1000)
+    return {"sequential": latency_summary(sequential), "batch": latency_summary(batched)}
+
+
+async def run_all(queries: List[dict], args):
+    report = await run(queries, args.k, args.repeats)
+    print(f"{len(queries)} queries, {args.repeats} runs each")
+    for mode, values in report.items():
+        print(format_row(mode, values))
+
+    print("\nWhole query set, end to end (embedding + search)")
+    report = await sequential_vs_batch(queries, max(args.k), args.repeats)
+    for mode, values in report.items():
+        print(format_row(mode, values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--queries", default="benchmarks/data/kb_queries.example.json"
+    )
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.queries, encoding="utf-8") as file:
+        queries = json.load(file)
+
+    asyncio.run(run_all(queries, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Load-test the API against local stand-ins for the VCell API, LiteLLM,
+Supabase and an in-memory Qdrant, and report latency percentiles and
+throughput per endpoint.
+
+    poetry run python -m benchmarks.load_benchmark --concurrency 16 --requests 200
+    poetry run python -m benchmarks.load_benchmark --save-baseline load_baseline.json
+    poetry run python -m benchmarks.load_benchmark --baseline load_baseline.json --max-regression 0.2
+
+Nothing outside this process is contacted. Auth0 verification is replaced
+by a fixed admin user; Supabase role and virtual key lookups still go
+through the fake REST API. With --baseline, the exit status is 1 if any
+endpoint's p95 latency grew, or its throughput dropped, by more than
+--max-regression, or its error rate exceeds --max-error-rate.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks._stats import format_row, latency_summary
+from benchmarks.fakes import (
+    ServerThread,
+    build_llm_app,
+    build_supabase_app,
+    build_vcell_app,
+)
+
+EMBEDDING_DIMENSION = 64
+BENCHMARK_USER = {"sub": "auth0|benchmark", "email": "benchmark@example.org"}
+FIRST_BIOMODEL_ID = 100000
+
+KB_DOCUMENTS = {
+    "create_account.txt": "How to create an account on VCell Software? Open the "
+    "VCell client, choose Register, fill in your user name, email and password, "
+    "then confirm the email to activate the account.",
+    "frap.txt": "FRAP binding models in VCell: fluorescence recovery after "
+    "photobleaching is modeled with a reaction diffusion system where the bleached "
+    "species binds to immobile sites.",
+    "moving_boundaries.txt": "Moving boundaries in VCell are simulated with the "
+    "moving boundary solver, which tracks the membrane as the cell shape changes.",
+}
+
+
+def _scenarios(biomodel_ids: List[str]) -> Dict[str, dict]:
+    """
+    Requests per endpoint. Biomodel IDs rotate so caches see a realistic
+    mix of hits and misses.
+    """
+
+    def chat(prompt: str) -> dict:
+        return {"conversation_history": [{"role": "user", "content": prompt}]}
+
+    return {
+        "biomodel": {"method": "GET", "path": lambda i: "/biomodel", "params": {"bmName": "calcium", "maxRows": 50}},
+        "kb_similar": {"method": "GET", "path": lambda i: "/kb/similar", "params": {"query": "How to model FRAP bindings?", "limit": 5}},
+        "query_tools": {"method": "POST", "path": lambda i: "/query", "json": chat("List calcium models")},
+        "query_kb": {"method": "POST", "path": lambda i: "/query", "json": chat("How do I create an account?")},
+        "faq_biomodels": {"method": "POST", "path": lambda i: "/query/faq/list-calcium-models"},
+        "faq_kb": {"method": "POST", "path": lambda i: "/query/faq/how-to-create-account"},
+        "analyse": {
+            "method": "POST",
+            "path": lambda i: f"/analyse/{biomodel_ids[i % len(biomodel_ids)]}",
+            "params": {"user_prompt": "Summarize this model"},
+        },
+        "analyse_vcml": {"method": "POST", "path": lambda i: f"/analyse/{biomodel_ids[i % len(biomodel_ids)]}/vcml"},
+        "analyse_diagram": {"method": "POST", "path": lambda i: f"/analyse/{biomodel_ids[i % len(biomodel_ids)]}/diagram"},
+    }
+
+
+def _configure_environment(urls: Dict[str, str], args):
+    """
+    Point the settings at the fakes. Must run before the app is imported.
+    """
+    overrides = {
+        "VCELL_API_URL": f"{urls['vcell']}/api",
+        "LITELLM_URL": urls["llm"],
+        "LITELLM_MASTER_KEY": "sk-benchmark-master",
+        "PROVIDER": "local",
+        "AZURE_ENDPOINT": urls["llm"],
+        "AZURE_API_KEY": "benchmark",
+        "EMBEDDING_BACKEND": "azure",
+        "EMBEDDING_DIMENSION": str(EMBEDDING_DIMENSION),
+        "KB_RERANK": "false",
+        "SUPABASE_URL": urls["supabase"],
+        "SUPABASE_SERVICE_ROLE_KEY": "benchmark.service.key",
+        "QDRANT_URL": "http://unused:6333",
+        "QDRANT_COLLECTION_NAME": "load_benchmark",
+        "AUTH0_DOMAIN": "",
+        "AUTH0_AUDIENCE": "",
+        "LANGFUSE_TRACING_ENABLED": "true" if args.tracing else "false",
+        "LOG_LEVEL": args.log_level,
+        "LOG_FILE": "",
+    }
+    os.environ.update(overrides)
+    for name in (
+        "FRONTEND_URL",
+        "AZURE_API_VERSION",
+        "AZURE_DEPLOYMENT_NAME",
+        "AZURE_EMBEDDING_DEPLOYMENT_NAME",
+        "LANGFUSE_SECRET_KEY",
+        "LANGFUSE_PUBLIC_KEY",
+        "LANGFUSE_HOST",
+    ):
+        os.environ.setdefault(name, "benchmark")
+
+
+def _build_app():
+    """
+    Import the app wired to an in-memory Qdrant, with Auth0 verification
+    replaced by a fixed user.
+    """
+    from qdrant_client import AsyncQdrantClient
+
+    from app.core import singleton
+
+    singleton.async_qdrant_client = AsyncQdrantClient(location=":memory:")
+
+    from app.core.auth import (
+        get_bearer_token,
+        get_optional_auth0_token,
+        verify_auth0_token,
+    )
+    from app.main import app
+
+    app.dependency_overrides[verify_auth0_token] = lambda: dict(BENCHMARK_USER)
+    app.dependency_overrides[get_bearer_token] = lambda: "benchmark-token"
+    app.dependency_overrides[get_optional_auth0_token] = lambda: None
+    return app
+
+
+async def _seed_knowledge_base(client: httpx.AsyncClient):
+    for file_name, text in KB_DOCUMENTS.items():
+        response = await client.post(
+            "/kb/upload-text",
+            files={"file": (file_name, text.encode("utf-8"), "text/plain")},
+        )
+        response.raise_for_status()
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient, scenario: dict, requests: int, concurrency: int
+) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    indexes = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for index in indexes:
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    scenario["method"],
+                    scenario["path"](index),
+                    params=scenario.get("params"),
+                    json=scenario.get("json"),
+                )
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        **latency_summary(latencies),
+        "rps": requests / elapsed,
+        "error_rate": errors / requests,
+    }
+
+
+def compare_to_baseline(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    max_regression: float,
+    max_error_rate: float,
+) -> List[str]:
+    """
+    List the endpoints that regressed against a saved baseline.
+
+    Args:
+        results (Dict[str, dict]): This run's summary per endpoint.
+        baseline (Dict[str, dict]): A previous run's summary per endpoint.
+        max_regression (float): Allowed relative p95 growth / RPS drop.
+        max_error_rate (float): Allowed fraction of failed requests.
+    Returns:
+        List[str]: One message per regression; empty if none.
+    """
+    failures = []
+    for name, result in results.items():
+        if result["error_rate"] > max_error_rate:
+            failures.append(f"{name}: error rate {result['error_rate']:.1%}")
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result["p95_ms"] > previous["p95_ms"] * (1 + max_regression):
+            failures.append(
+                f"{name}: p95 {result['p95_ms']:.1f} ms vs baseline {previous['p95_ms']:.1f} ms"
+            )
+        if result["rps"] < previous["rps"] * (1 - max_regression):
+            failures.append(
+                f"{name}: {result['rps']:.1f} req/s vs baseline {previous['rps']:.1f} req/s"
+            )
+    return failures
+
+
+async def _run(app_url: str, scenarios: Dict[str, dict], args) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=app_url,
+        headers={"Authorization": "Bearer benchmark-token"},
+        timeout=120.0,
+        limits=limits,
+    ) as client:
+        await _seed_knowledge_base(client)
+        results = {}
+        for name, scenario in scenarios.items():
+            # Warm-up: connections, first-use imports, per-model caches
+            await _run_scenario(client, scenario, min(args.concurrency, args.requests), args.concurrency)
+            results[name] = await _run_scenario(client, scenario, args.requests, args.concurrency)
+            print(format_row(name, results[name]), flush=True)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--endpoints", nargs="+", help="Scenarios to run (default: all)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint")
+    parser.add_argument("--models", type=int, default=20, help="Distinct biomodels the analyse endpoints rotate through")
+    parser.add_argument("--vcell-latency-ms", type=float, default=50)
+    parser.add_argument("--llm-latency-ms", type=float, default=200, help="Time to first token")
+    parser.add_argument("--llm-output-tokens", type=int, default=60)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=300)
+    parser.add_argument("--supabase-latency-ms", type=float, default=10)
+    parser.add_argument("--tracing", action="store_true", help="Keep Langfuse tracing on")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this JSON file")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--max-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fakes = ServerThread(
+        {
+            "vcell": build_vcell_app(args.vcell_latency_ms),
+            "llm": build_llm_app(
+                args.llm_latency_ms,
+                args.llm_output_tokens,
+                args.llm_tokens_per_second,
+                embedding_dimension=EMBEDDING_DIMENSION,
+            ),
+            "supabase": build_supabase_app(args.supabase_latency_ms),
+        }
+    )
+    urls = fakes.start()
+    _configure_environment(urls, args)
+
+    server = ServerThread({"app": _build_app()})
+    app_url = server.start()["app"]
+
+    biomodel_ids = [str(FIRST_BIOMODEL_ID + index) for index in range(args.models)]
+    scenarios = _scenarios(biomodel_ids)
+    if args.endpoints:
+        unknown = set(args.endpoints) - set(scenarios)
+        if unknown:
+            parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+        scenarios = {name: scenarios[name] for name in args.endpoints}
+
+    print(
+        f"concurrency={args.concurrency} requests={args.requests} "
+        f"vcell_latency_ms={args.vcell_latency_ms} llm_latency_ms={args.llm_latency_ms}"
+    )
+    try:
+        results = asyncio.run(_run(app_url, scenarios, args))
+    finally:
+        server.stop()
+        fakes.stop()
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = compare_to_baseline(results, baseline, args.max_regression, args.max_error_rate)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
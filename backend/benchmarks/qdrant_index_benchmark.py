@@ -0,0 +1,165 @@
+"""
+Measure how knowledge base collection storage settings scale: estimated RAM
+footprint, p50/p99 search latency and recall@k against exact search, for
+float32, scalar-quantized and binary-quantized collections as the number of
+points grows.
+
+Points are synthetic clustered unit vectors with the knowledge base's
+dimensionality, so results are comparable between runs. Each configuration
+gets a throwaway collection on the Qdrant server configured in .env (local
+in-memory mode ignores HNSW and quantization settings):
+    poetry run python -m benchmarks.qdrant_index_benchmark \
+        --sizes 1000 10000 50000 --configs float32 scalar binary
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import numpy as np
+from qdrant_client.models import PointStruct, SearchParams
+
+from app.services.qdrant_service import (
+    client,
+    create_qdrant_collection,
+    search_qdrant_points,
+)
+from benchmarks._stats import format_row, latency_summary
+
+# name -> keyword arguments for create_qdrant_collection
+CONFIGS = {
+    "float32": {},
+    "float32-on-disk": {"on_disk": True},
+    "scalar": {"quantization": "scalar"},
+    "scalar-on-disk": {"quantization": "scalar", "on_disk": True},
+    "binary": {"quantization": "binary"},
+    "binary-on-disk": {"quantization": "binary", "on_disk": True},
+}
+
+UPLOAD_BATCH_SIZE = 512
+
+
+def synthetic_vectors(count: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Unit vectors drawn around a few hundred centroids, which approximates
+    the topical clustering of real document embeddings better than uniform noise.
+    """
+    centroids = rng.standard_normal((max(1, min(256, count // 20)), dim))
+    vectors = centroids[rng.integers(0, len(centroids), count)]
+    vectors = vectors + 0.35 * rng.standard_normal((count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def estimated_ram_mb(count: int, dim: int, config: dict, hnsw_m: int) -> float:
+    """
+    Rough resident size of a collection: original vectors (unless on disk),
+    the quantized copy, and the level-0 HNSW links (2 * m 4-byte IDs per point).
+    """
+    total = 0 if config.get("on_disk") else count * dim * 4
+    if config.get("quantization") == "scalar":
+        total += count * dim
+    elif config.get("quantization") == "binary":
+        total += count * dim / 8
+    total += count * 2 * hnsw_m * 4
+    return total / 1024 / 1024
+
+
+async def run_config(name, config, vectors, queries, args):
+    collection_name = f"bench_{name}_{uuid.uuid4().hex[:8]}"
+    await create_qdrant_collection(
+        collection_name=collection_name,
+        vector_size=vectors.shape[1],
+        distance="cosine",
+        hnsw_m=args.hnsw_m,
+        hnsw_ef_construct=args.hnsw_ef_construct,
+        **config,
+    )
+    try:
+        for start in range(0, len(vectors), UPLOAD_BATCH_SIZE):
+            batch = vectors[start : start + UPLOAD_BATCH_SIZE]
+            await client.upsert(
+                collection_name=collection_name,
+                wait=True,
+                points=[
+                    PointStruct(id=start + i, vector=vector.tolist())
+                    for i, vector in enumerate(batch)
+                ],
+            )
+
+        # Let the optimizer build the HNSW index before timing searches
+        while (await client.get_collection(collection_name)).status != "green":
+            await asyncio.sleep(0.5)
+
+        oversampling = args.oversampling if config.get("quantization") else None
+        latencies, recalls = [], []
+        for query in queries:
+            query = query.tolist()
+            exact = (
+                await client.query_points(
+                    collection_name=collection_name,
+                    query=query,
+                    limit=args.k,
+                    search_params=SearchParams(exact=True),
+                )
+            ).points
+
+            start = time.perf_counter()
+            result = await search_qdrant_points(
+                collection_name=collection_name,
+                vector=query,
+                limit=args.k,
+                hnsw_ef=args.hnsw_ef,
+                oversampling=oversampling,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            expected = {point.id for point in exact}
+            found = {point.id for point in result["message"]}
+            recalls.append(len(expected & found) / len(expected))
+
+        summary = latency_summary(latencies)
+        return {
+            "est_ram_mb": estimated_ram_mb(
+                len(vectors), vectors.shape[1], config, args.hnsw_m or 16
+            ),
+            "p50_ms": summary["p50_ms"],
+            "p99_ms": summary["p99_ms"],
+            f"recall@{args.k}": sum(recalls) / len(recalls),
+        }
+    finally:
+        await client.delete_collection(collection_name)
+
+
+async def run_all(args):
+    rng = np.random.default_rng(args.seed)
+    for size in args.sizes:
+        vectors = synthetic_vectors(size + args.queries, args.dim, rng)
+        points, queries = vectors[: size], vectors[size:]
+        print(f"\n{size} points, {args.queries} queries, dim {args.dim}")
+        for name in args.configs:
+            report = await run_config(name, CONFIGS[name], points, queries, args)
+            print(format_row(name, report))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument(
+        "--configs", nargs="+", choices=sorted(CONFIGS), default=["float32", "scalar", "binary"]
+    )
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--hnsw-m", type=int, default=None)
+    parser.add_argument("--hnsw-ef-construct", type=int, default=None)
+    parser.add_argument("--hnsw-ef", type=int, default=None)
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(run_all(args))
+
+
+if __name__ == "__main__":
+    main()
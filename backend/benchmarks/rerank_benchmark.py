@@ -0,0 +1,84 @@
+"""
+Measure what cross-encoder reranking costs and buys on a labeled query set:
+recall@k, end-to-end get_similar_chunks latency, and the number and token
+size of the chunks that would be handed to the LLM.
+
+Uses the same query file as kb_retrieval_benchmark and the collection and
+KB_RERANK_* settings configured in .env:
+    poetry run python -m benchmarks.rerank_benchmark \
+        --queries benchmarks/data/kb_queries.json --limit 10
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+from app.core.config import settings
+from app.core.singleton import get_reranker
+from app.services.knowledge_base_service import get_similar_chunks
+from app.utils.tokens import count_tokens
+from benchmarks._stats import format_row, latency_summary
+from benchmarks.kb_retrieval_benchmark import recall_at_k
+
+
+async def run(queries: List[dict], rerank: bool, limit: int, ks: List[int], repeats: int):
+    latencies, counts, tokens = [], [], []
+    recalls = {k: [] for k in ks}
+    for item in queries:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = await get_similar_chunks(query=item["query"], limit=limit, rerank=rerank)
+            latencies.append((time.perf_counter() - start) * 1000)
+        if result["status"] != "success":
+            raise RuntimeError(result["message"])
+
+        results = result["results"]
+        counts.append(len(results))
+        tokens.append(sum(count_tokens(r["chunk"]) for r in results))
+        retrieved = [r["file_name"] for r in results]
+        for k in ks:
+            recalls[k].append(recall_at_k(retrieved, item["relevant_files"], k))
+
+    return {
+        **{f"recall@{k}": sum(values) / len(values) for k, values in recalls.items()},
+        "chunks": statistics.mean(counts),
+        "prompt_tokens": statistics.mean(tokens),
+        **latency_summary(latencies),
+    }
+
+
+async def run_all(queries: List[dict], args):
+    for name, rerank in (("retrieval", False), ("reranked", True)):
+        report = await run(queries, rerank, args.limit, args.k, args.repeats)
+        print(format_row(name, report))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--queries", default="benchmarks/data/kb_queries.example.json"
+    )
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.queries, encoding="utf-8") as file:
+        queries = json.load(file)
+
+    # Load the cross-encoder before timing
+    get_reranker().score("warm-up", ["warm-up"])
+
+    print(
+        f"{len(queries)} queries, limit={args.limit}, "
+        f"candidates={settings.KB_RERANK_CANDIDATES}, "
+        f"threshold={settings.KB_RERANK_THRESHOLD}, model={settings.KB_RERANK_MODEL}"
+    )
+    asyncio.run(run_all(queries, args))
+
+
+if __name__ == "__main__":
+    main()
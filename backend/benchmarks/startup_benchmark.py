@@ -0,0 +1,183 @@
+"""
+Measure cold start: the time to import app.main, broken down per
+top-level package with `python -X importtime`, and optionally the time
+until a fresh uvicorn process answers its first request.
+
+    poetry run python -m benchmarks.startup_benchmark --runs 5
+    poetry run python -m benchmarks.startup_benchmark --serve
+    poetry run python -m benchmarks.startup_benchmark --save-baseline startup_baseline.json
+    poetry run python -m benchmarks.startup_benchmark --baseline startup_baseline.json --max-regression 0.2
+
+Each run is a new interpreter, so nothing is served from a warm module
+cache. Settings come from .env as usual; --serve starts the app's
+lifespan too, which connects to the configured Qdrant. With --baseline,
+the exit status is 1 if the median import time, or a package that took at
+least --min-package-ms, grew by more than --max-regression.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.fakes import free_port
+
+IMPORT_TARGET = "app.main"
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Parse `python -X importtime` output.
+
+    Args:
+        stderr (str): The interpreter's stderr.
+    Returns:
+        Tuple[float, Dict[str, float]]: The total import time in ms, and the
+            self time in ms summed per top-level package.
+    """
+    total_us = 0
+    packages: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not name.startswith("  "):
+            # Imported at the top level; its cumulative time includes its children
+            total_us += int(cumulative_us)
+        packages[name.strip().split(".")[0]] += int(self_us) / 1000
+    return total_us / 1000, dict(packages)
+
+
+def _measure_import(target: str) -> Tuple[float, Dict[str, float]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def _measure_first_response(timeout: float) -> float:
+    """
+    Seconds from spawning uvicorn until GET /openapi.json succeeds.
+    """
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{IMPORT_TARGET}:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1.0).is_success:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+        raise RuntimeError(f"no response within {timeout} s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def compare_to_baseline(
+    results: dict, baseline: dict, max_regression: float, min_package_ms: float
+) -> List[str]:
+    """
+    List the startup measurements that regressed against a saved baseline.
+
+    Args:
+        results (dict): This run's summary.
+        baseline (dict): A previous run's summary.
+        max_regression (float): Allowed relative growth.
+        min_package_ms (float): Packages faster than this in both runs are
+            ignored, as their timings are mostly noise.
+    Returns:
+        List[str]: One message per regression; empty if none.
+    """
+    failures = []
+    for key in ("import_ms", "first_response_ms"):
+        if key in results and key in baseline:
+            if results[key] > baseline[key] * (1 + max_regression):
+                failures.append(f"{key}: {results[key]:.0f} vs baseline {baseline[key]:.0f}")
+    previous_packages = baseline.get("packages_ms", {})
+    for package, elapsed in results["packages_ms"].items():
+        previous = previous_packages.get(package, 0.0)
+        if max(elapsed, previous) < min_package_ms:
+            continue
+        if elapsed > previous * (1 + max_regression):
+            failures.append(f"{package}: {elapsed:.0f} ms vs baseline {previous:.0f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--target", default=IMPORT_TARGET, help="Module to import")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    parser.add_argument("--serve", action="store_true", help="Also measure time to first response")
+    parser.add_argument("--serve-timeout", type=float, default=60.0)
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this JSON file")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--min-package-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    totals: List[float] = []
+    package_runs: Dict[str, List[float]] = defaultdict(list)
+    for _ in range(args.runs):
+        total, packages = _measure_import(args.target)
+        totals.append(total)
+        for package, elapsed in packages.items():
+            package_runs[package].append(elapsed)
+
+    results = {
+        "import_ms": statistics.median(totals),
+        "packages_ms": {
+            package: statistics.median(samples) for package, samples in package_runs.items()
+        },
+    }
+    print(
+        f"import {args.target}: median {results['import_ms']:.0f} ms "
+        f"(min {min(totals):.0f}, max {max(totals):.0f}) over {args.runs} runs"
+    )
+    ranked = sorted(results["packages_ms"].items(), key=lambda item: item[1], reverse=True)
+    for package, elapsed in ranked[: args.top]:
+        print(f"  {package:<32} {elapsed:8.1f} ms")
+
+    if args.serve:
+        samples = [_measure_first_response(args.serve_timeout) for _ in range(args.runs)]
+        results["first_response_ms"] = statistics.median(samples) * 1000
+        print(f"first response: median {results['first_response_ms']:.0f} ms")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = compare_to_baseline(
+            results, baseline, args.max_regression, args.min_package_ms
+        )
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
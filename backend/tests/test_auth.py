@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from app.core import auth
+from app.utils.cache import AsyncLRUCache, configure_shared_cache
+from app.utils.shared_cache import SQLiteCacheBackend
+
+pytestmark = pytest.mark.asyncio
+
+DOMAIN = "vcell.example.auth0.com"
+AUDIENCE = "https://vcell-ai.example/api"
+
+
+class _FakeJWKSManager:
+    def __init__(self, public_key):
+        self.public_key = public_key
+        self.calls = 0
+
+    async def get_signing_key(self, kid):
+        self.calls += 1
+        return self.public_key
+
+
+@pytest.fixture
+def signer(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    client = _FakeJWKSManager(private_key.public_key())
+    monkeypatch.setattr(auth.settings, "AUTH0_DOMAIN", DOMAIN)
+    monkeypatch.setattr(auth.settings, "AUTH0_AUDIENCE", AUDIENCE)
+    monkeypatch.setattr(auth, "_jwks_manager", client)
+    auth._verified_tokens.clear()
+
+    def sign(expires_in=3600, **claims):
+        payload = {
+            "sub": "auth0|user",
+            "iss": f"https://{DOMAIN}/",
+            "aud": AUDIENCE,
+            "exp": int(time.time()) + expires_in,
+            **claims,
+        }
+        return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": "key-1"})
+
+    return sign, client
+
+
+class TestVerifiedTokenCache:
+    """Test class for caching verified access tokens."""
+
+    async def test_repeated_token_is_verified_once(self, signer):
+        """Test that a second verification of a token is served from the cache."""
+        sign, client = signer
+        token = sign()
+
+        first = await auth._decode_and_verify(token)
+        first["sub"] = "mutated"
+        second = await auth._decode_and_verify(token)
+
+        assert client.calls == 1
+        assert second["sub"] == "auth0|user"
+
+    async def test_invalid_and_expired_tokens_are_not_cached(self, signer):
+        """Test that rejected tokens are rejected again on every call."""
+        sign, client = signer
+        expired = sign(expires_in=-10)
+        wrong_audience = sign(aud="https://other.example")
+
+        for token in (expired, expired, wrong_audience, wrong_audience):
+            with pytest.raises(HTTPException) as error:
+                await auth._decode_and_verify(token)
+            assert error.value.status_code == 401
+
+        assert client.calls == 4
+        assert len(auth._verified_tokens) == 0
+
+    async def test_claims_are_never_read_from_the_shared_cache(self, signer, tmp_path):
+        """Test that claims planted in the shared tier do not authenticate a token."""
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+        configure_shared_cache(backend)
+        try:
+            forged = "not-a-jwt"
+            attacker = AsyncLRUCache(max_entries=10, name="auth_token", shared=True)
+            await attacker.aset(
+                hashlib.sha256(forged.encode("utf-8")).hexdigest(),
+                {"sub": "auth0|attacker", "role": "admin"},
+                ttl_seconds=3600,
+            )
+            await asyncio.sleep(0.05)  # the shared write runs in the background
+
+            with pytest.raises(HTTPException) as error:
+                await auth._decode_and_verify(forged)
+            assert error.value.status_code == 401
+        finally:
+            configure_shared_cache(None)
+            await backend.close()
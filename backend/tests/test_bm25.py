@@ -0,0 +1,33 @@
+from app.utils.bm25 import encode_document, encode_query, token_index, tokenize
+
+
+class TestBM25:
+    """Test class for the BM25 sparse encoder."""
+
+    def test_tokenize_keeps_identifiers_and_drops_stopwords(self):
+        """Test that domain terms and model IDs survive tokenization."""
+        tokens = tokenize("How is FRAP used with Smoldyn in model 273924831?")
+
+        assert tokens == ["frap", "used", "smoldyn", "model", "273924831"]
+
+    def test_token_index_is_stable(self):
+        """Test that token indices do not depend on the process hash seed."""
+        assert token_index("smoldyn") == token_index("smoldyn")
+        assert token_index("smoldyn") != token_index("cvode")
+        assert 0 <= token_index("smoldyn") < 2**31
+
+    def test_encode_document_saturates_term_frequency(self):
+        """Test that repeated terms gain weight sub-linearly."""
+        indices, values = encode_document("cvode cvode cvode cvode solver")
+        weights = dict(zip(indices, values))
+
+        cvode = weights[token_index("cvode")]
+        solver = weights[token_index("solver")]
+        assert solver < cvode < 4 * solver
+
+    def test_encode_query_uses_unit_weights(self):
+        """Test that query terms are deduplicated with weight 1."""
+        indices, values = encode_query("Smoldyn smoldyn solver")
+
+        assert sorted(indices) == sorted([token_index("smoldyn"), token_index("solver")])
+        assert values == [1.0, 1.0]
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.utils.cache import AsyncLRUCache, configure_shared_cache
+from app.utils.shared_cache import SQLiteCacheBackend
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestAsyncLRUCache:
+    """Test class for the async LRU cache."""
+
+    async def test_concurrent_misses_share_one_load(self):
+        """Test that concurrent requests for one key call the loader once."""
+        cache = AsyncLRUCache(max_entries=10)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert calls == 1
+        assert await cache.get_or_load("key", loader) == "value"
+        assert calls == 1
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache keeps at most max_entries entries."""
+        cache = AsyncLRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    async def test_failed_loads_and_expired_entries_are_not_served(self):
+        """Test that errors are not cached and entries expire after their TTL."""
+        cache = AsyncLRUCache(max_entries=10, ttl_seconds=60)
+
+        async def failing():
+            raise ValueError("upstream error")
+
+        with pytest.raises(ValueError):
+            await cache.get_or_load("key", failing)
+        assert cache.get("key") is None
+
+        cache.set("short", "value", ttl_seconds=0)
+        assert cache.get("short") is None
+
+
+class TestSharedCache:
+    """Test class for the cache tier shared by worker processes."""
+
+    @pytest_asyncio.fixture
+    async def backend(self, tmp_path):
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+        configure_shared_cache(backend)
+        yield backend
+        configure_shared_cache(None)
+        await backend.close()
+
+    async def test_loaded_values_are_reused_by_other_workers(self, backend):
+        """Test that a value loaded by one worker's cache is served to another's."""
+        worker_a = AsyncLRUCache(max_entries=10, name="test_shared", shared=True)
+        worker_b = AsyncLRUCache(max_entries=10, name="test_shared", shared=True)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return {"bmKey": "123", "applications": ["a", "b"]}
+
+        value = await worker_a.get_or_load(("vcml", "123"), loader)
+        await asyncio.sleep(0.05)  # the shared write runs in the background
+
+        assert await worker_b.get_or_load(("vcml", "123"), loader) == value
+        assert calls == 1
+        assert worker_b.shared_hits == 1
+
+    async def test_shared_entries_keep_their_expiry(self, backend):
+        """Test that entries copied from the shared tier expire with the original."""
+        worker_a = AsyncLRUCache(max_entries=10, name="test_expiry", shared=True)
+        worker_b = AsyncLRUCache(max_entries=10, name="test_expiry", shared=True)
+
+        await worker_a.aset("token", {"sub": "user"}, ttl_seconds=0.1)
+        await asyncio.sleep(0.05)
+        assert await worker_b.aget("token") == {"sub": "user"}
+
+        await asyncio.sleep(0.1)
+        assert worker_b.get("token") is None
+        assert await worker_b.aget("token") is None
+
+    async def test_unshared_caches_stay_in_process(self, backend):
+        """Test that caches without shared=True never reach the backend."""
+        cache = AsyncLRUCache(max_entries=10, name="test_local")
+        await cache.aset("key", "value")
+        await asyncio.sleep(0.05)
+
+        assert await backend.get(cache._shared_key("key")) is None
+
+    async def test_store_is_private_to_the_user(self, tmp_path):
+        """Test that the SQLite file is created 0600 and a planted one is refused."""
+        backend = SQLiteCacheBackend(str(tmp_path / "private.sqlite3"))
+        await backend.close()
+        assert (tmp_path / "private.sqlite3").stat().st_mode & 0o777 == 0o600
+
+        planted = tmp_path / "planted.sqlite3"
+        planted.touch(mode=0o666)
+        planted.chmod(0o666)
+        with pytest.raises(PermissionError):
+            SQLiteCacheBackend(str(planted))
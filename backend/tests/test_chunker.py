@@ -0,0 +1,109 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.knowledge_base_schema import ChunkingOptions
+from app.utils.chunker import PARALLEL_MIN_CHARS, chunk_markdown
+from app.utils.tokens import count_tokens
+
+
+class TestChunker:
+    """Test class for the structure-aware markdown chunker."""
+
+    def test_chunks_respect_token_budget(self):
+        """Test that no chunk exceeds max_tokens."""
+        text = "\n\n".join(
+            f"## Section {i}\n\n" + "VCell runs CVODE for ODE models. " * 40
+            for i in range(5)
+        )
+
+        chunks = chunk_markdown(text, max_tokens=128, overlap_tokens=16, min_tokens=32)
+
+        assert len(chunks) > 5
+        assert all(count_tokens(chunk["text"]) <= 128 for chunk in chunks)
+
+    def test_chunks_carry_section_path(self):
+        """Test that chunks are tagged with their heading path."""
+        intro = "VCell offers deterministic and stochastic solvers. " * 20
+        text = f"# Solvers\n\n{intro}\n\n## Smoldyn\n\nSpatial stochastic simulation.\n"
+
+        chunks = chunk_markdown(text, min_tokens=32)
+
+        assert [chunk["section_path"] for chunk in chunks] == [
+            ["Solvers"],
+            ["Solvers", "Smoldyn"],
+        ]
+
+    def test_large_table_repeats_header(self):
+        """Test that a table split across chunks repeats its header row."""
+        rows = "\n".join(f"| species{i} | {i} uM |" for i in range(200))
+        text = f"| Species | Concentration |\n| --- | --- |\n{rows}\n"
+
+        chunks = chunk_markdown(text, max_tokens=128, overlap_tokens=0)
+
+        assert len(chunks) > 1
+        assert all(chunk["text"].startswith("| Species |") for chunk in chunks)
+
+    def test_code_fence_is_not_parsed_as_headings(self):
+        """Test that '#' lines inside code fences are kept as code."""
+        text = "# Setup\n\n```bash\n# install\npip install vcell\n```\n"
+
+        chunks = chunk_markdown(text)
+
+        assert len(chunks) == 1
+        assert chunks[0]["section_path"] == ["Setup"]
+        assert "# install" in chunks[0]["text"]
+
+    def test_long_whitespace_free_runs_are_split(self):
+        """Test that a run with no whitespace is split by characters, not recursed on."""
+        url = "https://vcell.org/data/" + "a1B2c3D4" * 500
+        text = "x" * 20000 + "\n\nModels are linked at " + url + " for download."
+
+        chunks = chunk_markdown(text, max_tokens=512, overlap_tokens=0, min_tokens=32)
+
+        assert all(count_tokens(chunk["text"]) <= 512 for chunk in chunks)
+        joined = "".join(chunk["text"] for chunk in chunks)
+        assert joined.count("x") >= 20000
+        assert "a1B2c3D4" * 50 in joined.replace("\n", "").replace(" ", "")
+
+    def test_pool_chunking_matches_in_thread_chunking(self):
+        """Test that a large document chunked on a spawn pool gives the same chunks."""
+        text = "\n\n".join(
+            f"# Chapter {i}\n\n" + "Compartments exchange species by flux. " * 60
+            for i in range(PARALLEL_MIN_CHARS // 2000)
+        )
+        assert len(text) >= PARALLEL_MIN_CHARS
+
+        with ProcessPoolExecutor(
+            max_workers=2, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            parallel = chunk_markdown(text, pool=pool)
+
+        assert parallel == chunk_markdown(text)
+
+
+class TestChunkingOptions:
+    """Test class for validating per-upload chunking options."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"max_tokens": 64, "overlap_tokens": 200},
+            {"max_tokens": 64, "overlap_tokens": 64},
+            {"max_tokens": 64, "min_tokens": 100},
+        ],
+    )
+    def test_inconsistent_budgets_are_rejected(self, options):
+        """Test that an overlap or minimum that cannot fit max_tokens is rejected."""
+        with pytest.raises(ValidationError):
+            ChunkingOptions(**options)
+
+    def test_defaults_are_capped_to_a_small_budget(self):
+        """Test that settings defaults never exceed an explicitly small max_tokens."""
+        max_tokens, overlap_tokens, min_tokens = ChunkingOptions(max_tokens=32).resolve()
+
+        assert max_tokens == 32
+        assert overlap_tokens < max_tokens
+        assert min_tokens <= max_tokens
@@ -0,0 +1,66 @@
+from app.utils.context_packing import merge_neighbor_chunks, pack_context
+
+
+def _hit(file_name, chunk_index, chunk, score, section_path=None):
+    return {
+        "score": score,
+        "file_name": file_name,
+        "chunk_index": chunk_index,
+        "section_path": section_path or [],
+        "chunk": chunk,
+    }
+
+
+class TestContextPacking:
+    """Test class for merging and packing knowledge base context."""
+
+    def test_neighbors_merge_without_repeated_overlap(self):
+        """Test that consecutive chunks merge and their overlap appears once."""
+        first = "Smoldyn runs particle-based spatial simulations. It tracks each molecule."
+        second = "It tracks each molecule. Reactions fire on collision."
+        hits = [_hit("a.pdf", 4, second, 0.7), _hit("a.pdf", 3, first, 0.9)]
+
+        passages = merge_neighbor_chunks(hits)
+
+        assert len(passages) == 1
+        assert passages[0]["chunk_indices"] == [3, 4]
+        assert passages[0]["score"] == 0.9
+        assert passages[0]["chunk"].count("It tracks each molecule.") == 1
+        assert passages[0]["chunk"].endswith("Reactions fire on collision.")
+
+    def test_non_adjacent_and_other_files_stay_separate(self):
+        """Test that gaps and different files are not merged."""
+        hits = [
+            _hit("a.pdf", 1, "one", 0.5),
+            _hit("a.pdf", 3, "three", 0.6),
+            _hit("b.pdf", 2, "two", 0.4),
+        ]
+
+        passages = merge_neighbor_chunks(hits)
+
+        assert [(p["file_name"], p["chunk_indices"]) for p in passages] == [
+            ("a.pdf", [1]),
+            ("a.pdf", [3]),
+            ("b.pdf", [2]),
+        ]
+
+    def test_pack_orders_by_score_and_respects_budget(self):
+        """Test that packing keeps the best passages that fit the budget."""
+        hits = [
+            _hit("a.pdf", 0, "word " * 80, 0.9),
+            _hit("b.pdf", 0, "word " * 200, 0.8),
+            _hit("c.pdf", 0, "word " * 50, 0.7),
+        ]
+
+        packed = pack_context(hits, max_tokens=150)
+
+        assert [p["file_name"] for p in packed] == ["a.pdf", "c.pdf"]
+        assert sum(p["token_count"] for p in packed) <= 150
+
+    def test_pack_trims_long_neighbor_run_to_best_chunks(self):
+        """Test that a run of neighbors over budget keeps its best chunks."""
+        hits = [_hit("a.pdf", i, f"section {i} " + "word " * 60, 0.1 * i) for i in range(5)]
+
+        packed = pack_context(hits, max_tokens=150)
+
+        assert [p["chunk_indices"] for p in packed] == [[3, 4]]
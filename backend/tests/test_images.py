@@ -0,0 +1,58 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from app.utils.images import etag_matches, image_etag, resize_image
+
+
+def _diagram_png(width=1600, height=1000) -> bytes:
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(0, width, 200):
+        draw.rectangle([i + 20, 100, i + 160, 300], outline="black", fill=(200, 230, 255))
+        draw.line([i + 160, 200, i + 220, 200], fill="red", width=3)
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+class TestImages:
+    """Test class for diagram image resizing."""
+
+    def test_resize_fits_and_shrinks(self):
+        """Test that variants fit in max_side and are smaller than the original."""
+        original = _diagram_png()
+
+        for image_format, media_type in (("png", "image/png"), ("webp", "image/webp")):
+            content, result_type = resize_image(original, 256, image_format)
+
+            assert result_type == media_type
+            assert len(content) < len(original)
+            with Image.open(io.BytesIO(content)) as image:
+                assert max(image.size) == 256
+
+    def test_small_image_keeps_its_size(self):
+        """Test that images already within max_side are not upscaled."""
+        original = _diagram_png(200, 100)
+
+        content, _ = resize_image(original, 1024)
+
+        with Image.open(io.BytesIO(content)) as image:
+            assert image.size == (200, 100)
+
+    def test_etag_depends_on_content(self):
+        """Test that ETags are stable for equal bytes and differ otherwise."""
+        assert image_etag(b"abc") == image_etag(b"abc")
+        assert image_etag(b"abc") != image_etag(b"abd")
+        assert image_etag(b"abc").startswith('"')
+
+    def test_if_none_match_uses_weak_comparison(self):
+        """Test that weak validators, lists and "*" match the current ETag."""
+        etag = image_etag(b"abc")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(image_etag(b"abd"), etag)
+        assert not etag_matches(etag.strip('"'), etag)
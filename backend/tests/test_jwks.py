@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from jwt.exceptions import PyJWKClientError
+
+from app.core.jwks import JWKSManager
+
+pytestmark = pytest.mark.asyncio
+
+
+def _jwk(kid):
+    public_key = rsa.generate_private_key(public_exponent=65537, key_size=2048).public_key()
+    return {**RSAAlgorithm.to_jwk(public_key, as_dict=True), "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+def _manager(key_sets, min_refetch_seconds=30):
+    manager = JWKSManager(
+        "https://example.auth0.com/.well-known/jwks.json",
+        refresh_seconds=600,
+        min_refetch_seconds=min_refetch_seconds,
+        timeout=5,
+    )
+    manager.downloads = 0
+
+    async def download():
+        manager.downloads += 1
+        await asyncio.sleep(0.01)
+        return {"keys": key_sets[min(manager.downloads, len(key_sets)) - 1]}
+
+    manager._download = download
+    return manager
+
+
+class TestJWKSManager:
+    """Test class for the async signing key store."""
+
+    async def test_concurrent_misses_share_one_download(self):
+        """Test that a burst of requests on a cold store downloads the keys once."""
+        manager = _manager([[_jwk("a")]])
+
+        keys = await asyncio.gather(*(manager.get_signing_key("a") for _ in range(10)))
+
+        assert manager.downloads == 1
+        assert all(key is keys[0] for key in keys)
+
+    async def test_rotated_key_is_picked_up(self):
+        """Test that an unknown kid refetches the key set after the cooldown."""
+        manager = _manager([[_jwk("old")], [_jwk("old"), _jwk("new")]], min_refetch_seconds=0)
+        await manager.refresh()
+
+        assert await manager.get_signing_key("new") is not None
+        assert manager.downloads == 2
+
+    async def test_unknown_kids_are_rate_limited(self):
+        """Test that repeated unknown kids do not refetch within the cooldown."""
+        manager = _manager([[_jwk("a")]])
+        await manager.refresh()
+
+        for kid in ("forged-1", "forged-2", "forged-3"):
+            with pytest.raises(PyJWKClientError):
+                await manager.get_signing_key(kid)
+
+        assert manager.downloads == 1
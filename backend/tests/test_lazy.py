@@ -0,0 +1,16 @@
+import sys
+
+from app.utils.lazy import lazy_import
+
+
+class TestLazyImport:
+    """Test class for deferred module imports."""
+
+    def test_module_imported_on_first_attribute_access(self):
+        """Test that the module is only imported when first used."""
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_import("colorsys")
+        assert "colorsys" not in sys.modules
+
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert "colorsys" in sys.modules
@@ -0,0 +1,78 @@
+import json
+import logging
+
+from app.core.logger import JSONFormatter, _parse_levels, log_payload, truncate
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _test_logger(name: str, level: int) -> tuple:
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+    handler = _ListHandler()
+    logger.handlers = [handler]
+    return logger, handler
+
+
+class TestPayloadLogging:
+    """Test class for payload truncation and level checks."""
+
+    def test_truncate_reports_the_cut_length(self):
+        """Test that long payloads are cut and short ones kept."""
+        assert truncate("short", 10) == "short"
+        assert truncate("x" * 25, 10) == "xxxxxxxxxx... [15 more chars]"
+
+    def test_disabled_level_does_not_render_the_payload(self):
+        """Test that the payload is not converted to text below the level."""
+
+        class Exploding:
+            def __str__(self):
+                raise AssertionError("payload was rendered")
+
+        logger, handler = _test_logger("test_logger.disabled", logging.INFO)
+
+        log_payload(logger, "Payload", Exploding())
+
+        assert handler.messages == []
+
+    def test_enabled_level_logs_the_payload(self):
+        """Test that the payload is logged with its message."""
+        logger, handler = _test_logger("test_logger.enabled", logging.DEBUG)
+
+        log_payload(logger, "Payload", {"a": 1})
+
+        assert handler.messages == ["Payload: {'a': 1}"]
+
+
+class TestLoggingConfig:
+    """Test class for log formatting and level parsing."""
+
+    def test_parse_levels(self):
+        """Test parsing of per-logger level overrides."""
+        assert _parse_levels("vcelldb_service=debug, llm_service=WARNING,") == {
+            "vcelldb_service": "DEBUG",
+            "llm_service": "WARNING",
+        }
+        assert _parse_levels("") == {}
+
+    def test_json_formatter_includes_extra_fields(self):
+        """Test that JSON lines carry the message and extra fields."""
+        record = logging.LogRecord(
+            "vcelldb_service", logging.INFO, __file__, 1, "Fetched %s", ("model",), None
+        )
+        record.biomodel_id = "123"
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "vcelldb_service"
+        assert entry["message"] == "Fetched model"
+        assert entry["biomodel_id"] == "123"
@@ -0,0 +1,91 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import MetricsMiddleware, clear_multiprocess_dir, timed_upstream
+from app.utils.cache import AsyncLRUCache
+
+
+def _sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsMiddleware:
+    """Test class for the request latency middleware."""
+
+    def test_requests_are_labeled_by_route_template(self):
+        """Test that path parameters do not leak into the route label."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/things/{thing_id}")
+        async def get_thing(thing_id: str):
+            return {"id": thing_id}
+
+        labels = {"method": "GET", "route": "/things/{thing_id}", "status": "200"}
+        before = _sample("vcell_ai_http_request_duration_seconds_count", labels)
+
+        client = TestClient(app)
+        client.get("/things/1")
+        client.get("/things/2")
+        client.get("/nowhere")
+
+        assert _sample("vcell_ai_http_request_duration_seconds_count", labels) == before + 2
+        assert _sample(
+            "vcell_ai_http_request_duration_seconds_count",
+            {"method": "GET", "route": "unmatched", "status": "404"},
+        ) >= 1
+
+
+class TestUpstreamMetrics:
+    """Test class for upstream call timing."""
+
+    @pytest.mark.asyncio
+    async def test_error_results_are_recorded_as_errors(self):
+        """Test that {"status": "error"} results count as failed calls."""
+
+        @timed_upstream("test", "op")
+        async def call(status):
+            return {"status": status}
+
+        labels = {"service": "test", "endpoint": "op", "outcome": "error"}
+        before = _sample("vcell_ai_upstream_request_duration_seconds_count", labels)
+
+        await call("success")
+        await call("error")
+
+        assert _sample("vcell_ai_upstream_request_duration_seconds_count", labels) == before + 1
+
+
+class TestCacheMetrics:
+    """Test class for the cache collector."""
+
+    @pytest.mark.asyncio
+    async def test_named_caches_are_exported(self):
+        """Test that hits, misses and entries of named caches are reported."""
+        cache = AsyncLRUCache(max_entries=10, name="test_metrics")
+
+        async def loader():
+            return "value"
+
+        await cache.get_or_load("key", loader)
+        await cache.get_or_load("key", loader)
+
+        labels = {"cache": "test_metrics"}
+        assert _sample("vcell_ai_cache_hits_total", labels) == 1
+        assert _sample("vcell_ai_cache_misses_total", labels) == 1
+        assert _sample("vcell_ai_cache_entries", labels) == 1
+
+
+class TestMultiprocessDir:
+    """Test class for preparing the multiprocess metrics directory."""
+
+    def test_leftover_metric_files_are_cleared(self, tmp_path):
+        """Test that metric files of earlier runs are deleted and others kept."""
+        for name in ("counter_123.db", "gauge_livesum_456.db", "notes.txt"):
+            (tmp_path / name).write_bytes(b"x")
+
+        clear_multiprocess_dir(str(tmp_path))
+
+        assert [path.name for path in tmp_path.iterdir()] == ["notes.txt"]
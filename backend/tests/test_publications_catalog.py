@@ -0,0 +1,62 @@
+from app.services.publications_service import PublicationCatalog
+
+
+def _publication(pub_key, title, authors, year, bm_keys=()):
+    return {
+        "pubKey": pub_key,
+        "title": title,
+        "authors": authors,
+        "year": year,
+        "citation": f"J Biol. {year}",
+        "biomodelReferences": [{"bmKey": key} for key in bm_keys],
+    }
+
+
+def _catalog():
+    catalog = PublicationCatalog()
+    catalog._index(
+        [
+            _publication(1, "Calcium waves in neurons", ["Loew LM", "Smith J"], 2010, ["101"]),
+            _publication(2, "Actin dynamics at the leading edge", ["Smith J"], 2015),
+            _publication(3, "Calcium release in cardiac myocytes", ["Doe A"], 2020, ["202"]),
+        ]
+    )
+    return catalog
+
+
+class TestPublicationCatalog:
+    """Test class for the indexed publications catalog."""
+
+    def test_no_filters_returns_everything_newest_first(self):
+        """Test that an empty search returns all publications, newest first."""
+        result = _catalog().search()
+
+        assert result["total_matches"] == 3
+        assert [p["pubKey"] for p in result["publications"]] == [3, 2, 1]
+
+    def test_filters_combine(self):
+        """Test that author, year and biomodel filters combine with AND."""
+        catalog = _catalog()
+
+        assert [p["pubKey"] for p in catalog.search(author="smith")["publications"]] == [2, 1]
+        assert [
+            p["pubKey"] for p in catalog.search(author="Smith", year_to=2012)["publications"]
+        ] == [1]
+        assert [p["pubKey"] for p in catalog.search(biomodel_key="202")["publications"]] == [3]
+        assert catalog.search(author="Doe", year_from=2021)["total_matches"] == 0
+
+    def test_query_ranks_and_drops_non_matches(self):
+        """Test that text queries rank by matched terms and respect the limit."""
+        catalog = _catalog()
+
+        result = catalog.search(query="calcium neurons", limit=1)
+
+        assert result["total_matches"] == 2
+        assert [p["pubKey"] for p in result["publications"]] == [1]
+
+    def test_stopword_only_query_matches_nothing(self):
+        """Test that a query with no searchable terms does not return the whole catalog."""
+        catalog = _catalog()
+
+        assert catalog.search(query="the of and")["total_matches"] == 0
+        assert catalog.search(query="the calcium")["total_matches"] == 2
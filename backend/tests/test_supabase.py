@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core import supabase
+
+pytestmark = pytest.mark.asyncio
+
+
+class _SlowClient:
+    def __init__(self, delay):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def query(self):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return "row"
+
+
+class TestRunSupabase:
+    """Test class for running blocking Supabase queries off the event loop."""
+
+    async def test_slow_queries_do_not_block_the_event_loop(self, monkeypatch):
+        """Test that other coroutines keep running while a query blocks."""
+        client = _SlowClient(delay=0.2)
+        monkeypatch.setattr(supabase, "get_supabase_client", lambda: client)
+        finished = []
+
+        async def query():
+            await supabase.run_supabase("test", lambda c: c.query())
+            finished.append("query")
+
+        async def ticker():
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            finished.append("ticker")
+
+        await asyncio.gather(query(), ticker())
+
+        assert finished == ["ticker", "query"]
+
+    async def test_concurrent_queries_are_bounded(self, monkeypatch):
+        """Test that no more than SUPABASE_MAX_CONCURRENCY queries run at once."""
+        client = _SlowClient(delay=0.02)
+        monkeypatch.setattr(supabase, "get_supabase_client", lambda: client)
+        limit = supabase.settings.SUPABASE_MAX_CONCURRENCY
+
+        await asyncio.gather(
+            *(supabase.run_supabase("test", lambda c: c.query()) for _ in range(limit * 3))
+        )
+
+        assert client.max_running == limit
@@ -0,0 +1,52 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.timing import (
+    ServerTimingMiddleware,
+    current_timings,
+    format_server_timing,
+    record_timing,
+    timed,
+)
+
+
+class TestServerTiming:
+    """Test class for the request-scoped latency breakdown."""
+
+    def test_header_includes_steps_from_child_tasks(self):
+        """Test that timings recorded by concurrent tasks reach the header."""
+        app = FastAPI()
+        app.add_middleware(ServerTimingMiddleware)
+
+        async def tool_call():
+            with timed("vcell.biomodel"):
+                await asyncio.sleep(0.01)
+
+        @app.get("/query")
+        async def query():
+            with timed("llm.tools"):
+                await asyncio.sleep(0.01)
+            await asyncio.gather(tool_call(), tool_call())
+            return current_timings()
+
+        response = TestClient(app).get("/query")
+
+        header = response.headers["server-timing"]
+        assert header.startswith("llm.tools;dur=")
+        assert 'vcell.biomodel;dur=' in header and 'desc="2 calls"' in header
+        assert ", total;dur=" in header
+        assert response.json()["vcell.biomodel"]["calls"] == 2
+
+    def test_recording_outside_a_request_is_ignored(self):
+        """Test that timings outside a request are dropped."""
+        record_timing("supabase.user_role", 0.5)
+
+        assert current_timings() == {}
+
+    def test_names_are_made_valid_tokens(self):
+        """Test that characters not allowed in metric names are replaced."""
+        header = format_server_timing({"vcell.users/bearerToken": [0.0123, 1]}, 0.02)
+
+        assert header == "vcell.users_bearerToken;dur=12.3, total;dur=20.0"
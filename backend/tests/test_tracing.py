@@ -0,0 +1,27 @@
+from app.core.config import settings
+from app.core.tracing import _shrink
+
+
+class TestSpanPayloads:
+    """Test class for the Langfuse span input/output caps."""
+
+    def test_large_fields_are_capped(self):
+        """Test that long strings, long lists and bytes are shrunk."""
+        payload = {
+            "vcml": "x" * (settings.LANGFUSE_MAX_FIELD_CHARS + 10),
+            "ids": list(range(settings.LANGFUSE_MAX_LIST_ITEMS + 5)),
+            "image": b"\x89PNG" * 1000,
+        }
+
+        shrunk = _shrink(payload)
+
+        assert shrunk["vcml"].endswith("... [10 more chars]")
+        assert len(shrunk["ids"]) == settings.LANGFUSE_MAX_LIST_ITEMS + 1
+        assert shrunk["ids"][-1] == "... [5 more items]"
+        assert shrunk["image"] == "<4000 bytes>"
+
+    def test_secrets_are_redacted(self):
+        """Test that tokens passed as keyword arguments are not recorded."""
+        shrunk = _shrink({"args": ["123"], "kwargs": {"auth0_token": "eyJ..."}})
+
+        assert shrunk == {"args": ["123"], "kwargs": {"auth0_token": "***"}}
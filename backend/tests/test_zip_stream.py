@@ -0,0 +1,35 @@
+import io
+import zipfile
+
+from app.utils.zip_stream import ZipStreamWriter
+
+
+class TestZipStreamWriter:
+    """Test class for the streaming ZIP writer."""
+
+    def test_streamed_pieces_form_a_valid_archive(self):
+        """Test that concatenated add()/close() output is a readable ZIP."""
+        writer = ZipStreamWriter()
+        vcml = b"<vcml>" + b"<Species/>" * 1000 + b"</vcml>"
+
+        pieces = [
+            writer.add("1/biomodel.vcml", vcml),
+            writer.add("manifest.json", b"[]"),
+            writer.close(),
+        ]
+
+        assert all(pieces)
+        with zipfile.ZipFile(io.BytesIO(b"".join(pieces))) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist() == ["1/biomodel.vcml", "manifest.json"]
+            assert archive.read("1/biomodel.vcml") == vcml
+
+    def test_entries_are_emitted_as_they_are_added(self):
+        """Test that each entry's bytes are returned by its own add() call."""
+        writer = ZipStreamWriter()
+
+        first = writer.add("a.txt", b"a" * 5000)
+
+        # Compressed entry with its local header and data descriptor
+        assert first.startswith(b"PK\x03\x04")
+        assert len(first) < 5000
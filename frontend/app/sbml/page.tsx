@@ -25,8 +25,20 @@ interface Application {
   mathKey: string;
   bngl_url: string;
   sbml_url: string;
+  // Present when requested with check_files; null means the check failed
+  bngl_available?: boolean | null;
+  bngl_size_bytes?: number | null;
+  sbml_available?: boolean | null;
+  sbml_size_bytes?: number | null;
 }
 
+const formatSize = (bytes?: number | null) => {
+  if (!bytes) return "";
+  if (bytes < 1024) return ` (${bytes} B)`;
+  if (bytes < 1024 * 1024) return ` (${(bytes / 1024).toFixed(1)} KB)`;
+  return ` (${(bytes / (1024 * 1024)).toFixed(1)} MB)`;
+};
+
 interface ApplicationsResponse {
   biomodel_id: string;
   applications: Application[];
@@ -50,7 +62,7 @@ export default function SBMLPage() {
     try {
       const apiUrl = process.env.NEXT_PUBLIC_API_URL;
       const res = await fetch(
-        `${apiUrl}/biomodel/${biomodelId}/applications/files`,
+        `${apiUrl}/biomodel/${biomodelId}/applications/files?check_files=true`,
       );
       if (!res.ok) {
         setError(`Failed to fetch applications data.`);
@@ -232,19 +244,31 @@ export default function SBMLPage() {
                       <div className="flex gap-3 pt-2">
                         <Button
                           onClick={() => handleOpenInNewTab(app.sbml_url)}
+                          disabled={app.sbml_available === false}
+                          title={
+                            app.sbml_available === false
+                              ? "SBML export is not available for this application"
+                              : undefined
+                          }
                           className="flex-1 bg-green-600 hover:bg-green-700 text-white"
                           size="sm"
                         >
                           <Download className="h-4 w-4 mr-2" />
-                          Download SBML
+                          Download SBML{formatSize(app.sbml_size_bytes)}
                         </Button>
                         <Button
                           onClick={() => handleOpenInNewTab(app.bngl_url)}
+                          disabled={app.bngl_available === false}
+                          title={
+                            app.bngl_available === false
+                              ? "BNGL export is not available for this application"
+                              : undefined
+                          }
                           className="flex-1 bg-blue-600 hover:bg-blue-700 text-white"
                           size="sm"
                         >
                           <Download className="h-4 w-4 mr-2" />
-                          Download BNGL
+                          Download BNGL{formatSize(app.bngl_size_bytes)}
                         </Button>
                       </div>
                     </div>